@@ -9,6 +9,9 @@ set -euo pipefail
 #     AGENTS    : space or comma separated subset of: claude gemini copilot cursor (default: all)
 #     SCRIPTS   : space or comma separated subset of: sh ps (default: both)
 #     LANGUAGES : space or comma separated subset of: en zh (default: both)
+#   spec-kit-template-universal-<version>.zip holds the unrendered sources (memory, scripts, templates)
+#   plus render.json; the CLI renders any variant from it locally (see src/specify_cli/tools/render.py,
+#   which must stay in step with build_variant/generate_commands below).
 #   Examples:
 #     AGENTS=claude SCRIPTS=sh LANGUAGES=zh $0 v0.2.0
 #     AGENTS="copilot,gemini" LANGUAGES=en $0 v0.2.0
@@ -166,6 +169,18 @@ build_variant() {
   echo "Created spec-kit-template-${agent}-${script}-${language}-${NEW_VERSION}.zip"
 }
 
+build_universal() {
+  # Unrendered sources for client-side rendering; bump "format" when the layout rules change
+  local base_dir="sdd-universal-package-src" output="spec-kit-template-universal-${NEW_VERSION}.zip"
+  mkdir -p "$base_dir"
+  for dir in memory scripts templates agent_templates; do
+    [[ -d $dir ]] && cp -r "$dir" "$base_dir/"
+  done
+  printf '{"format": 1, "release": "%s"}\n' "$NEW_VERSION" > "$base_dir/render.json"
+  ( cd "$base_dir" && zip -rq "../$output" . )
+  echo "Created $output"
+}
+
 # Determine agent list
 ALL_AGENTS=(claude gemini copilot cursor)
 ALL_SCRIPTS=(sh ps)
@@ -231,6 +246,7 @@ for agent in "${AGENT_LIST[@]}"; do
     done
   done
 done
+build_universal
 
 echo "Archives:"
 ls -1 spec-kit-template-*-${NEW_VERSION}.zip
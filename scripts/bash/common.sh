@@ -15,12 +15,44 @@ check_feature_branch() {
 
 get_feature_dir() { echo "$1/specs/$2"; }
 
+# Git directory shared by the main checkout and all linked worktrees (absolute)
+get_git_common_dir() { (cd "$(git rev-parse --git-common-dir)" && pwd); }
+
+# Worktree that has branch $1 checked out (empty when none)
+find_feature_worktree() {
+    git worktree list --porcelain | awk -v ref="refs/heads/$1" '/^worktree /{path=substr($0,10)} $0=="branch "ref{print path; exit}'
+}
+
+# Highest NNN used by an NNN-* branch or specs/NNN-* directory in any worktree (other names are ignored)
+get_highest_feature_num() {
+    local highest=0 name number
+    while IFS= read -r name; do
+        [[ "$name" =~ ^([0-9]{3})- ]] || continue
+        number=$((10#${BASH_REMATCH[1]}))
+        if [ "$number" -gt "$highest" ]; then highest=$number; fi
+    done < <(
+        git for-each-ref --format='%(refname:short)' refs/heads
+        git worktree list --porcelain | sed -n 's/^worktree //p' | while IFS= read -r tree; do
+            for dir in "$tree"/specs/*/; do [ -d "$dir" ] && basename "$dir"; done
+        done
+    )
+    echo "$highest"
+}
+
 get_feature_paths() {
     local repo_root=$(get_repo_root)
     local current_branch=$(get_current_branch)
+    local main_repo_root=$(dirname "$(get_git_common_dir)")
+    # SPECIFY_FEATURE selects another feature; the worktree it is checked out in becomes REPO_ROOT
+    if [[ -n "$SPECIFY_FEATURE" && "$SPECIFY_FEATURE" != "$current_branch" ]]; then
+        current_branch="$SPECIFY_FEATURE"
+        local tree=$(find_feature_worktree "$current_branch")
+        [[ -n "$tree" ]] && repo_root="$tree"
+    fi
     local feature_dir=$(get_feature_dir "$repo_root" "$current_branch")
     cat <<EOF
 REPO_ROOT='$repo_root'
+MAIN_REPO_ROOT='$main_repo_root'
 CURRENT_BRANCH='$current_branch'
 FEATURE_DIR='$feature_dir'
 FEATURE_SPEC='$feature_dir/spec.md'
@@ -3,46 +3,72 @@
 set -e
 
 JSON_MODE=false
+WORKTREE=false
 ARGS=()
 for arg in "$@"; do
     case "$arg" in
         --json) JSON_MODE=true ;;
-        --help|-h) echo "Usage: $0 [--json] <feature_description>"; exit 0 ;;
+        --worktree) WORKTREE=true ;;
+        --help|-h) echo "Usage: $0 [--json] [--worktree] <feature_description>"; exit 0 ;;
         *) ARGS+=("$arg") ;;
     esac
 done
 
 FEATURE_DESCRIPTION="${ARGS[*]}"
 if [ -z "$FEATURE_DESCRIPTION" ]; then
-    echo "Usage: $0 [--json] <feature_description>" >&2
+    echo "Usage: $0 [--json] [--worktree] <feature_description>" >&2
     exit 1
 fi
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+source "$SCRIPT_DIR/common.sh"
+
 REPO_ROOT=$(git rev-parse --show-toplevel)
-SPECS_DIR="$REPO_ROOT/specs"
-mkdir -p "$SPECS_DIR"
-
-HIGHEST=0
-if [ -d "$SPECS_DIR" ]; then
-    for dir in "$SPECS_DIR"/*; do
-        [ -d "$dir" ] || continue
-        dirname=$(basename "$dir")
-        number=$(echo "$dirname" | grep -o '^[0-9]\+' || echo "0")
-        number=$((10#$number))
-        if [ "$number" -gt "$HIGHEST" ]; then HIGHEST=$number; fi
-    done
-fi
+MAIN_REPO_ROOT=$(dirname "$(get_git_common_dir)")
+
+# Numbers are shared by every worktree: claim one under a lock in the common git dir
+# (the same lock specify feature new takes). Only a lock older than 15s, left by a
+# killed run, is broken; after 20s of waiting we give up instead of taking it over.
+LOCK_DIR="$(get_git_common_dir)/specify-feature.lock"
+LOCK_TOKEN="$$-$RANDOM$RANDOM"
+release_lock() { [ "$(cat "$LOCK_DIR/owner" 2>/dev/null)" = "$LOCK_TOKEN" ] && rm -rf "$LOCK_DIR"; trap - EXIT; }
+WAITED=0
+until mkdir "$LOCK_DIR" 2>/dev/null; do
+    LOCK_MTIME=$(stat -c %Y "$LOCK_DIR" 2>/dev/null || stat -f %m "$LOCK_DIR" 2>/dev/null || echo "")
+    if [ -n "$LOCK_MTIME" ] && [ $(( $(date +%s) - LOCK_MTIME )) -gt 15 ]; then
+        STALE="$LOCK_DIR.stale-$LOCK_TOKEN"
+        mv "$LOCK_DIR" "$STALE" 2>/dev/null && rm -rf "$STALE"
+        continue
+    fi
+    if [ "$WAITED" -ge 200 ]; then
+        echo "ERROR: Timed out waiting for $LOCK_DIR; remove it if no feature is being created" >&2
+        exit 1
+    fi
+    sleep 0.1; WAITED=$((WAITED + 1))
+done
+echo "$LOCK_TOKEN" > "$LOCK_DIR/owner"
+trap release_lock EXIT
 
-NEXT=$((HIGHEST + 1))
+NEXT=$(( $(get_highest_feature_num) + 1 ))
 FEATURE_NUM=$(printf "%03d" "$NEXT")
 
 BRANCH_NAME=$(echo "$FEATURE_DESCRIPTION" | tr '[:upper:]' '[:lower:]' | sed 's/[^a-z0-9]/-/g' | sed 's/-\+/-/g' | sed 's/^-//' | sed 's/-$//')
 WORDS=$(echo "$BRANCH_NAME" | tr '-' '\n' | grep -v '^$' | head -3 | tr '\n' '-' | sed 's/-$//')
 BRANCH_NAME="${FEATURE_NUM}-${WORDS}"
 
-git checkout -b "$BRANCH_NAME"
+if $WORKTREE; then
+    # The branch marks the number as taken; the checkout can run after the lock is released
+    git branch "$BRANCH_NAME"
+    release_lock
+    FEATURE_ROOT="$(dirname "$MAIN_REPO_ROOT")/$(basename "$MAIN_REPO_ROOT").worktrees/$BRANCH_NAME"
+    git worktree add "$FEATURE_ROOT" "$BRANCH_NAME" >&2 || { git branch -D "$BRANCH_NAME" >/dev/null; exit 1; }
+else
+    git checkout -b "$BRANCH_NAME"
+    release_lock
+    FEATURE_ROOT="$REPO_ROOT"
+fi
 
-FEATURE_DIR="$SPECS_DIR/$BRANCH_NAME"
+FEATURE_DIR="$FEATURE_ROOT/specs/$BRANCH_NAME"
 mkdir -p "$FEATURE_DIR"
 
 TEMPLATE="$REPO_ROOT/templates/spec-template.md"
@@ -50,9 +76,14 @@ SPEC_FILE="$FEATURE_DIR/spec.md"
 if [ -f "$TEMPLATE" ]; then cp "$TEMPLATE" "$SPEC_FILE"; else touch "$SPEC_FILE"; fi
 
 if $JSON_MODE; then
-    printf '{"BRANCH_NAME":"%s","SPEC_FILE":"%s","FEATURE_NUM":"%s"}\n' "$BRANCH_NAME" "$SPEC_FILE" "$FEATURE_NUM"
+    if $WORKTREE; then
+        printf '{"BRANCH_NAME":"%s","SPEC_FILE":"%s","FEATURE_NUM":"%s","WORKTREE":"%s"}\n' "$BRANCH_NAME" "$SPEC_FILE" "$FEATURE_NUM" "$FEATURE_ROOT"
+    else
+        printf '{"BRANCH_NAME":"%s","SPEC_FILE":"%s","FEATURE_NUM":"%s"}\n' "$BRANCH_NAME" "$SPEC_FILE" "$FEATURE_NUM"
+    fi
 else
     echo "BRANCH_NAME: $BRANCH_NAME"
     echo "SPEC_FILE: $SPEC_FILE"
     echo "FEATURE_NUM: $FEATURE_NUM"
+    if $WORKTREE; then echo "WORKTREE: $FEATURE_ROOT"; fi
 fi
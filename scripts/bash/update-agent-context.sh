@@ -5,19 +5,67 @@ CURRENT_BRANCH=$(git rev-parse --abbrev-ref HEAD)
 FEATURE_DIR="$REPO_ROOT/specs/$CURRENT_BRANCH"
 NEW_PLAN="$FEATURE_DIR/plan.md"
 CLAUDE_FILE="$REPO_ROOT/CLAUDE.md"; GEMINI_FILE="$REPO_ROOT/GEMINI.md"; COPILOT_FILE="$REPO_ROOT/.github/copilot-instructions.md"; CURSOR_FILE="$REPO_ROOT/.cursor/rules/specify-rules.mdc"
-AGENT_TYPE="$1"
+# Layout: "stable" moves dates and recent changes after a <!-- STABLE PREFIX END --> marker so the
+# leading bytes stay identical between updates (prompt-prefix caching); files with the marker stay stable
+AGENT_TYPE=""; LAYOUT="${SPECIFY_AGENT_CONTEXT_LAYOUT:-classic}"
+while [ $# -gt 0 ]; do case "$1" in --layout) LAYOUT="$2"; shift 2 ;; --layout=*) LAYOUT="${1#--layout=}"; shift ;; *) AGENT_TYPE="$1"; shift ;; esac; done
+case "$LAYOUT" in stable|classic) ;; *) echo "ERROR: Unknown layout '$LAYOUT' (expected stable|classic)"; exit 1 ;; esac
+STABLE_MARKER="<!-- STABLE PREFIX END -->"
 [ -f "$NEW_PLAN" ] || { echo "ERROR: No plan.md found at $NEW_PLAN"; exit 1; }
 echo "=== Updating agent context files for feature $CURRENT_BRANCH ==="
-NEW_LANG=$(grep "^**Language/Version**: " "$NEW_PLAN" 2>/dev/null | head -1 | sed 's/^**Language\/Version**: //' | grep -v "NEEDS CLARIFICATION" || echo "")
-NEW_FRAMEWORK=$(grep "^**Primary Dependencies**: " "$NEW_PLAN" 2>/dev/null | head -1 | sed 's/^**Primary Dependencies**: //' | grep -v "NEEDS CLARIFICATION" || echo "")
-NEW_DB=$(grep "^**Storage**: " "$NEW_PLAN" 2>/dev/null | head -1 | sed 's/^**Storage**: //' | grep -v "N/A" | grep -v "NEEDS CLARIFICATION" || echo "")
-NEW_PROJECT_TYPE=$(grep "^**Project Type**: " "$NEW_PLAN" 2>/dev/null | head -1 | sed 's/^**Project Type**: //' || echo "")
+NEW_LANG=$(grep "^\*\*Language/Version\*\*: " "$NEW_PLAN" 2>/dev/null | head -1 | sed 's/^\*\*Language\/Version\*\*: //' | grep -v "NEEDS CLARIFICATION" || echo "")
+NEW_FRAMEWORK=$(grep "^\*\*Primary Dependencies\*\*: " "$NEW_PLAN" 2>/dev/null | head -1 | sed 's/^\*\*Primary Dependencies\*\*: //' | grep -v "NEEDS CLARIFICATION" || echo "")
+NEW_DB=$(grep "^\*\*Storage\*\*: " "$NEW_PLAN" 2>/dev/null | head -1 | sed 's/^\*\*Storage\*\*: //' | grep -v "N/A" | grep -v "NEEDS CLARIFICATION" || echo "")
+NEW_PROJECT_TYPE=$(grep "^\*\*Project Type\*\*: " "$NEW_PLAN" 2>/dev/null | head -1 | sed 's/^\*\*Project Type\*\*: //' || echo "")
+# Stable layout: add this feature to Active Technologies and Recent Changes, keeping the prefix bytes
+update_stable_file() {
+  local target_file="$1"
+  python3 - "$target_file" "$STABLE_MARKER" "$CURRENT_BRANCH" "$NEW_LANG" "$NEW_FRAMEWORK" "$NEW_DB" <<'EOF'
+import re,sys,datetime
+target,marker,branch,lang,framework,db=sys.argv[1:7]
+with open(target,encoding='utf-8') as f: original=f.read()
+content=original
+date_re=re.compile(r'(Last updated: |最后更新：)(\d{4}-\d{2}-\d{2})')
+heading_re=re.compile(r'^## (Recent Changes|最近更改)\n((?:- .*\n?)*)',re.M)
+if marker not in content:
+  # Convert a classic file: lift recent changes and the date out of the prefix
+  m=heading_re.search(content); heading=m.group(1) if m else 'Recent Changes'; recent=m.group(2) if m else ''
+  if m: content=content[:m.start()]+content[m.end():].lstrip('\n')
+  d=date_re.search(content); label,date=(d.group(1),d.group(2)) if d else ('Last updated: ',datetime.date.today().isoformat())
+  content=re.sub(r'[ \t]*(Last updated: |最后更新：)\d{4}-\d{2}-\d{2}','',content).rstrip('\n')+'\n'
+  content=f"{content}\n{marker}\n## {heading}\n{recent.rstrip(chr(10))}\n\n{label}{date}\n"
+stable,volatile=content.split(marker,1)
+m=re.search(r'## (Active Technologies|活跃技术)\n(.*?)\n\n',stable,re.S)
+if m:
+  additions=[]
+  if lang and lang not in m.group(2): additions.append(f"- {lang} + {framework} ({branch})")
+  if db and db!='N/A' and db not in m.group(2): additions.append(f"- {db} ({branch})")
+  if additions: stable=stable[:m.end(2)]+"\n"+"\n".join(additions)+stable[m.end(2):]
+m=heading_re.search(volatile); heading=m.group(1) if m else 'Recent Changes'
+lines=[l for l in (m.group(2) if m else '').splitlines() if l.strip()]
+entry=f"- {branch}: Added {lang} + {framework}"
+lines=([entry]+[l for l in lines if not l.startswith(f"- {branch}:")])[:3]
+d=date_re.search(volatile); label,date=(d.group(1),d.group(2)) if d else ('Last updated: ','')
+body=f"{stable}{marker}\n## {heading}\n"+"\n".join(lines)+"\n\n"
+# Keep the previous date (and so identical bytes) unless something else changed
+if not date or body!=original.split(label)[0]: date=datetime.date.today().isoformat()
+content=f"{body}{label}{date}\n"
+if content!=original:
+  with open(target+'.tmp','w',encoding='utf-8') as f: f.write(content)
+EOF
+  if [ -f "$target_file.tmp" ]; then mv "$target_file.tmp" "$target_file"; else echo "No changes (file is byte-identical)"; fi
+}
 update_agent_file() { local target_file="$1" agent_name="$2"; echo "Updating $agent_name context file: $target_file"; local temp_file=$(mktemp); if [ ! -f "$target_file" ]; then
-  echo "Creating new $agent_name context file..."; if [ -f "$REPO_ROOT/.specify/templates/agent-file-template.md" ]; then cp "$REPO_ROOT/templates/agent-file-template.md" "$temp_file"; else echo "ERROR: Template not found"; return 1; fi;
-  sed -i.bak "s/\[PROJECT NAME\]/$(basename $REPO_ROOT)/" "$temp_file"; sed -i.bak "s/\[DATE\]/$(date +%Y-%m-%d)/" "$temp_file"; sed -i.bak "s/\[EXTRACTED FROM ALL PLAN.MD FILES\]/- $NEW_LANG + $NEW_FRAMEWORK ($CURRENT_BRANCH)/" "$temp_file";
+  echo "Creating new $agent_name context file..."; if [ -f "$REPO_ROOT/.specify/templates/agent-file-template.md" ]; then cp "$REPO_ROOT/.specify/templates/agent-file-template.md" "$temp_file"; else echo "ERROR: Template not found"; return 1; fi;
+  sed -i.bak "s/\[PROJECT NAME\]/$(basename $REPO_ROOT)/" "$temp_file"; sed -i.bak "s/\[DATE\]/$(date +%Y-%m-%d)/; s/\[日期\]/$(date +%Y-%m-%d)/" "$temp_file"; sed -i.bak "s/\[EXTRACTED FROM ALL PLAN.MD FILES\]/- $NEW_LANG + $NEW_FRAMEWORK ($CURRENT_BRANCH)/" "$temp_file";
   if [[ "$NEW_PROJECT_TYPE" == *"web"* ]]; then sed -i.bak "s|\[ACTUAL STRUCTURE FROM PLANS\]|backend/\nfrontend/\ntests/|" "$temp_file"; else sed -i.bak "s|\[ACTUAL STRUCTURE FROM PLANS\]|src/\ntests/|" "$temp_file"; fi;
-  if [[ "$NEW_LANG" == *"Python"* ]]; then COMMANDS="cd src && pytest && ruff check ."; elif [[ "$NEW_LANG" == *"Rust"* ]]; then COMMANDS="cargo test && cargo clippy"; elif [[ "$NEW_LANG" == *"JavaScript"* ]] || [[ "$NEW_LANG" == *"TypeScript"* ]]; then COMMANDS="npm test && npm run lint"; else COMMANDS="# Add commands for $NEW_LANG"; fi; sed -i.bak "s|\[ONLY COMMANDS FOR ACTIVE TECHNOLOGIES\]|$COMMANDS|" "$temp_file";
+  if [[ "$NEW_LANG" == *"Python"* ]]; then COMMANDS="cd src && pytest && ruff check ."; elif [[ "$NEW_LANG" == *"Rust"* ]]; then COMMANDS="cargo test && cargo clippy"; elif [[ "$NEW_LANG" == *"JavaScript"* ]] || [[ "$NEW_LANG" == *"TypeScript"* ]]; then COMMANDS="npm test && npm run lint"; else COMMANDS="# Add commands for $NEW_LANG"; fi; sed -i.bak "s|\[ONLY COMMANDS FOR ACTIVE TECHNOLOGIES\]|${COMMANDS//&/\\&}|" "$temp_file";
   sed -i.bak "s|\[LANGUAGE-SPECIFIC, ONLY FOR LANGUAGES IN USE\]|$NEW_LANG: Follow standard conventions|" "$temp_file"; sed -i.bak "s|\[LAST 3 FEATURES AND WHAT THEY ADDED\]|- $CURRENT_BRANCH: Added $NEW_LANG + $NEW_FRAMEWORK|" "$temp_file"; rm "$temp_file.bak";
+  # Run the new file through the stable update too, so the next run on unchanged input is byte-identical
+  mv "$temp_file" "$target_file"; if grep -qF "$STABLE_MARKER" "$target_file"; then update_stable_file "$target_file" >/dev/null; fi;
+elif [ "$LAYOUT" = "stable" ] || grep -qF "$STABLE_MARKER" "$target_file"; then
+  echo "Updating existing $agent_name context file (stable layout)..."
+  update_stable_file "$target_file"
 else
   echo "Updating existing $agent_name context file..."; manual_start=$(grep -n "<!-- MANUAL ADDITIONS START -->" "$target_file" | cut -d: -f1); manual_end=$(grep -n "<!-- MANUAL ADDITIONS END -->" "$target_file" | cut -d: -f1); if [ -n "$manual_start" ] && [ -n "$manual_end" ]; then sed -n "${manual_start},${manual_end}p" "$target_file" > /tmp/manual_additions.txt; fi;
   python3 - "$target_file" <<'EOF'
@@ -46,7 +94,10 @@ content=re.sub(r'Last updated: \d{4}-\d{2}-\d{2}', 'Last updated: '+datetime.dat
 open(target+'.tmp','w').write(content)
 EOF
   mv "$target_file.tmp" "$target_file"; if [ -f /tmp/manual_additions.txt ]; then sed -i.bak '/<!-- MANUAL ADDITIONS START -->/,/<!-- MANUAL ADDITIONS END -->/d' "$target_file"; cat /tmp/manual_additions.txt >> "$target_file"; rm /tmp/manual_additions.txt "$target_file.bak"; fi;
-fi; mv "$temp_file" "$target_file" 2>/dev/null || true; echo "✅ $agent_name context file updated successfully"; }
+fi; [ -s "$temp_file" ] && mv "$temp_file" "$target_file"; rm -f "$temp_file"; report_stable_prefix "$target_file"; record_provenance "$target_file"; echo "✅ $agent_name context file updated successfully"; }
+# Let `specify stale` know which plans this agent file now reflects (optional; needs the specify CLI)
+record_provenance() { if command -v specify >/dev/null 2>&1; then (cd "$REPO_ROOT" && specify stale --record "$1" >/dev/null 2>&1) || true; fi; }
+report_stable_prefix() { local file="$1" offset; offset=$(grep -b -m1 -F "$STABLE_MARKER" "$file" 2>/dev/null | cut -d: -f1); if [ -n "$offset" ]; then echo "Stable prefix: $offset of $(wc -c < "$file" | tr -d ' ') bytes"; else echo "Stable prefix: none (classic layout; rerun with --layout stable)"; fi; }
 case "$AGENT_TYPE" in
   claude) update_agent_file "$CLAUDE_FILE" "Claude Code" ;;
   gemini) update_agent_file "$GEMINI_FILE" "Gemini CLI" ;;
@@ -59,4 +110,4 @@ case "$AGENT_TYPE" in
        if [ ! -f "$CLAUDE_FILE" ] && [ ! -f "$GEMINI_FILE" ] && [ ! -f "$COPILOT_FILE" ] && [ ! -f "$CURSOR_FILE" ]; then update_agent_file "$CLAUDE_FILE" "Claude Code"; fi ;;
   *) echo "ERROR: Unknown agent type '$AGENT_TYPE' (expected claude|gemini|copilot|cursor)"; exit 1 ;;
 esac
-echo; echo "Summary of changes:"; [ -n "$NEW_LANG" ] && echo "- Added language: $NEW_LANG"; [ -n "$NEW_FRAMEWORK" ] && echo "- Added framework: $NEW_FRAMEWORK"; [ -n "$NEW_DB" ] && [ "$NEW_DB" != "N/A" ] && echo "- Added database: $NEW_DB"; echo; echo "Usage: $0 [claude|gemini|copilot|cursor]"
+echo; echo "Summary of changes:"; [ -n "$NEW_LANG" ] && echo "- Added language: $NEW_LANG"; [ -n "$NEW_FRAMEWORK" ] && echo "- Added framework: $NEW_FRAMEWORK"; [ -n "$NEW_DB" ] && [ "$NEW_DB" != "N/A" ] && echo "- Added database: $NEW_DB"; echo; echo "Usage: $0 [claude|gemini|copilot|cursor] [--layout stable|classic]"
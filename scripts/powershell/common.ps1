@@ -24,12 +24,57 @@ function Get-FeatureDir {
     Join-Path $RepoRoot "specs/$Branch"
 }
 
+# Git directory shared by the main checkout and all linked worktrees (absolute)
+function Get-GitCommonDir {
+    (Resolve-Path (git rev-parse --git-common-dir)).Path
+}
+
+# Worktree that has the branch checked out ($null when none)
+function Find-FeatureWorktree {
+    param([string]$Branch)
+    $path = $null
+    foreach ($line in (git worktree list --porcelain)) {
+        if ($line -like 'worktree *') { $path = $line.Substring(9) }
+        elseif ($line -eq "branch refs/heads/$Branch") { return $path }
+    }
+    return $null
+}
+
+# Highest NNN used by an NNN-* branch or specs/NNN-* directory in any worktree (other names are ignored)
+function Get-HighestFeatureNumber {
+    $names = @(git for-each-ref --format='%(refname:short)' refs/heads)
+    foreach ($line in (git worktree list --porcelain)) {
+        if ($line -like 'worktree *') {
+            $specs = Join-Path $line.Substring(9) 'specs'
+            if (Test-Path $specs -PathType Container) {
+                $names += Get-ChildItem -Path $specs -Directory | ForEach-Object { $_.Name }
+            }
+        }
+    }
+    $highest = 0
+    foreach ($name in $names) {
+        if ($name -match '^(\d{3})-') {
+            $num = [int]$matches[1]
+            if ($num -gt $highest) { $highest = $num }
+        }
+    }
+    return $highest
+}
+
 function Get-FeaturePathsEnv {
     $repoRoot = Get-RepoRoot
     $currentBranch = Get-CurrentBranch
+    $mainRepoRoot = Split-Path (Get-GitCommonDir) -Parent
+    # SPECIFY_FEATURE selects another feature; the worktree it is checked out in becomes REPO_ROOT
+    if ($env:SPECIFY_FEATURE -and $env:SPECIFY_FEATURE -ne $currentBranch) {
+        $currentBranch = $env:SPECIFY_FEATURE
+        $tree = Find-FeatureWorktree -Branch $currentBranch
+        if ($tree) { $repoRoot = $tree }
+    }
     $featureDir = Get-FeatureDir -RepoRoot $repoRoot -Branch $currentBranch
     [PSCustomObject]@{
         REPO_ROOT    = $repoRoot
+        MAIN_REPO_ROOT = $mainRepoRoot
         CURRENT_BRANCH = $currentBranch
         FEATURE_DIR  = $featureDir
         FEATURE_SPEC = Join-Path $featureDir 'spec.md'
@@ -3,39 +3,71 @@
 [CmdletBinding()]
 param(
     [switch]$Json,
+    [switch]$Worktree,
     [Parameter(ValueFromRemainingArguments = $true)]
     [string[]]$FeatureDescription
 )
 $ErrorActionPreference = 'Stop'
 
 if (-not $FeatureDescription -or $FeatureDescription.Count -eq 0) {
-    Write-Error "Usage: ./create-new-feature.ps1 [-Json] <feature description>"; exit 1
+    Write-Error "Usage: ./create-new-feature.ps1 [-Json] [-Worktree] <feature description>"; exit 1
 }
 $featureDesc = ($FeatureDescription -join ' ').Trim()
 
+. "$PSScriptRoot/common.ps1"
+
 $repoRoot = git rev-parse --show-toplevel
-$specsDir = Join-Path $repoRoot 'specs'
-New-Item -ItemType Directory -Path $specsDir -Force | Out-Null
-
-$highest = 0
-if (Test-Path $specsDir) {
-    Get-ChildItem -Path $specsDir -Directory | ForEach-Object {
-        if ($_.Name -match '^(\d{3})') {
-            $num = [int]$matches[1]
-            if ($num -gt $highest) { $highest = $num }
+$mainRepoRoot = Split-Path (Get-GitCommonDir) -Parent
+
+# Numbers are shared by every worktree: claim one under a lock in the common git dir
+# (the same lock specify feature new takes). Only a lock older than 15s, left by a
+# killed run, is broken; after 20s of waiting we give up instead of taking it over.
+$lockDir = Join-Path (Get-GitCommonDir) 'specify-feature.lock'
+$lockOwner = Join-Path $lockDir 'owner'
+$lockToken = "$PID-$([guid]::NewGuid().ToString('N'))"
+$waited = 0
+while ($true) {
+    try { New-Item -ItemType Directory -Path $lockDir -ErrorAction Stop | Out-Null; break }
+    catch {
+        $lock = Get-Item $lockDir -ErrorAction SilentlyContinue
+        if ($lock -and ((Get-Date) - $lock.LastWriteTime).TotalSeconds -gt 15) {
+            $stale = "$lockDir.stale-$lockToken"
+            try { Rename-Item $lockDir $stale -ErrorAction Stop; Remove-Item $stale -Recurse -Force -ErrorAction SilentlyContinue } catch { }
+            continue
         }
+        if ($waited -ge 200) { Write-Error "Timed out waiting for $lockDir; remove it if no feature is being created"; exit 1 }
+        Start-Sleep -Milliseconds 100; $waited++
     }
 }
-$next = $highest + 1
-$featureNum = ('{0:000}' -f $next)
+Set-Content -Path $lockOwner -Value $lockToken -NoNewline
+
+try {
+    $next = (Get-HighestFeatureNumber) + 1
+    $featureNum = ('{0:000}' -f $next)
+
+    $branchName = $featureDesc.ToLower() -replace '[^a-z0-9]', '-' -replace '-{2,}', '-' -replace '^-', '' -replace '-$', ''
+    $words = ($branchName -split '-') | Where-Object { $_ } | Select-Object -First 3
+    $branchName = "$featureNum-$([string]::Join('-', $words))"
 
-$branchName = $featureDesc.ToLower() -replace '[^a-z0-9]', '-' -replace '-{2,}', '-' -replace '^-', '' -replace '-$', ''
-$words = ($branchName -split '-') | Where-Object { $_ } | Select-Object -First 3
-$branchName = "$featureNum-$([string]::Join('-', $words))"
+    # With -Worktree the branch marks the number as taken; the checkout runs after the lock is released
+    if ($Worktree) { git branch $branchName | Out-Null } else { git checkout -b $branchName | Out-Null }
+    if ($LASTEXITCODE -ne 0) { Write-Error "Could not create branch $branchName"; exit 1 }
+} finally {
+    # Only remove the lock if it is still ours
+    if ((Get-Content $lockOwner -Raw -ErrorAction SilentlyContinue) -eq $lockToken) {
+        Remove-Item $lockDir -Recurse -Force -ErrorAction SilentlyContinue
+    }
+}
 
-git checkout -b $branchName | Out-Null
+if ($Worktree) {
+    $featureRoot = Join-Path "$mainRepoRoot.worktrees" $branchName
+    git worktree add $featureRoot $branchName | Out-Null
+    if ($LASTEXITCODE -ne 0) { git branch -D $branchName | Out-Null; Write-Error "Could not create worktree $featureRoot"; exit 1 }
+} else {
+    $featureRoot = $repoRoot
+}
 
-$featureDir = Join-Path $specsDir $branchName
+$featureDir = Join-Path $featureRoot "specs/$branchName"
 New-Item -ItemType Directory -Path $featureDir -Force | Out-Null
 
 $template = Join-Path $repoRoot 'templates/spec-template.md'
@@ -44,9 +76,11 @@ if (Test-Path $template) { Copy-Item $template $specFile -Force } else { New-Ite
 
 if ($Json) {
     $obj = [PSCustomObject]@{ BRANCH_NAME = $branchName; SPEC_FILE = $specFile; FEATURE_NUM = $featureNum }
+    if ($Worktree) { $obj | Add-Member -NotePropertyName WORKTREE -NotePropertyValue $featureRoot }
     $obj | ConvertTo-Json -Compress
 } else {
     Write-Output "BRANCH_NAME: $branchName"
     Write-Output "SPEC_FILE: $specFile"
     Write-Output "FEATURE_NUM: $featureNum"
+    if ($Worktree) { Write-Output "WORKTREE: $featureRoot" }
 }
@@ -8,6 +8,7 @@ $paths = Get-FeaturePathsEnv
 if (-not (Test-FeatureBranch -Branch $paths.CURRENT_BRANCH)) { exit 1 }
 
 Write-Output "REPO_ROOT: $($paths.REPO_ROOT)"
+Write-Output "MAIN_REPO_ROOT: $($paths.MAIN_REPO_ROOT)"
 Write-Output "BRANCH: $($paths.CURRENT_BRANCH)"
 Write-Output "FEATURE_DIR: $($paths.FEATURE_DIR)"
 Write-Output "FEATURE_SPEC: $($paths.FEATURE_SPEC)"
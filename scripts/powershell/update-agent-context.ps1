@@ -1,7 +1,14 @@
 #!/usr/bin/env pwsh
 [CmdletBinding()]
-param([string]$AgentType)
+param(
+    [string]$AgentType,
+    # 'stable' moves dates and recent changes after a <!-- STABLE PREFIX END --> marker so the leading
+    # bytes stay identical between updates (prompt-prefix caching); files with the marker stay stable
+    [ValidateSet('stable', 'classic')]
+    [string]$Layout = $(if ($env:SPECIFY_AGENT_CONTEXT_LAYOUT) { $env:SPECIFY_AGENT_CONTEXT_LAYOUT } else { 'classic' })
+)
 $ErrorActionPreference = 'Stop'
+$stableMarker = '<!-- STABLE PREFIX END -->'
 
 $repoRoot = git rev-parse --show-toplevel
 $currentBranch = git rev-parse --abbrev-ref HEAD
@@ -35,7 +42,7 @@ function Initialize-AgentFile($targetFile, $agentName) {
     if (-not (Test-Path $template)) { Write-Error "Template not found: $template"; return }
     $content = Get-Content $template -Raw
     $content = $content.Replace('[PROJECT NAME]', (Split-Path $repoRoot -Leaf))
-    $content = $content.Replace('[DATE]', (Get-Date -Format 'yyyy-MM-dd'))
+    $content = $content.Replace('[DATE]', (Get-Date -Format 'yyyy-MM-dd')).Replace('[日期]', (Get-Date -Format 'yyyy-MM-dd'))
     $content = $content.Replace('[EXTRACTED FROM ALL PLAN.MD FILES]', "- $newLang + $newFramework ($currentBranch)")
     if ($newProjectType -match 'web') { $structure = "backend/`nfrontend/`ntests/" } else { $structure = "src/`ntests/" }
     $content = $content.Replace('[ACTUAL STRUCTURE FROM PLANS]', $structure)
@@ -49,8 +56,91 @@ function Initialize-AgentFile($targetFile, $agentName) {
     $content | Set-Content $targetFile -Encoding UTF8
 }
 
+function Write-StablePrefix($targetFile) {
+    $content = [IO.File]::ReadAllText($targetFile)
+    $index = $content.IndexOf($stableMarker)
+    if ($index -ge 0) {
+        $prefixBytes = [Text.Encoding]::UTF8.GetByteCount($content.Substring(0, $index))
+        Write-Output "Stable prefix: $prefixBytes of $([Text.Encoding]::UTF8.GetByteCount($content)) bytes"
+    } else {
+        Write-Output 'Stable prefix: none (classic layout; rerun with -Layout stable)'
+    }
+}
+
+function Save-Provenance($targetFile) {
+    # Let `specify stale` know which plans this agent file now reflects (optional; needs the specify CLI)
+    if (Get-Command specify -ErrorAction SilentlyContinue) {
+        Push-Location $repoRoot
+        try { specify stale --record $targetFile *> $null } catch { } finally { Pop-Location }
+    }
+}
+
+function Update-AgentFileStable($targetFile, $agentName) {
+    $original = [IO.File]::ReadAllText($targetFile) -replace "`r`n", "`n"
+    $content = $original
+    $datePattern = '(Last updated: |最后更新：)(\d{4}-\d{2}-\d{2})'
+    $recentPattern = '(?m)^## (Recent Changes|最近更改)\n((?:- .*\n?)*)'
+    if (-not $content.Contains($stableMarker)) {
+        # Convert a classic file: lift recent changes and the date out of the prefix
+        $heading = 'Recent Changes'; $recent = ''
+        $m = [regex]::Match($content, $recentPattern)
+        if ($m.Success) {
+            $heading = $m.Groups[1].Value; $recent = $m.Groups[2].Value
+            $content = $content.Substring(0, $m.Index) + $content.Substring($m.Index + $m.Length).TrimStart("`n")
+        }
+        $d = [regex]::Match($content, $datePattern)
+        if ($d.Success) { $label = $d.Groups[1].Value; $date = $d.Groups[2].Value } else { $label = 'Last updated: '; $date = Get-Date -Format 'yyyy-MM-dd' }
+        $content = ([regex]::Replace($content, '[ \t]*(Last updated: |最后更新：)\d{4}-\d{2}-\d{2}', '')).TrimEnd("`n") + "`n"
+        $content = "$content`n$stableMarker`n## $heading`n$($recent.TrimEnd("`n"))`n`n$label$date`n"
+    }
+    $split = $content.IndexOf($stableMarker)
+    $stable = $content.Substring(0, $split)
+    $volatile = $content.Substring($split + $stableMarker.Length)
+    $m = [regex]::Match($stable, '(?s)## (Active Technologies|活跃技术)\n(.*?)\n\n')
+    if ($m.Success) {
+        $additions = @()
+        if ($newLang -and -not $m.Groups[2].Value.Contains($newLang)) { $additions += "- $newLang + $newFramework ($currentBranch)" }
+        if ($newDb -and $newDb -ne 'N/A' -and -not $m.Groups[2].Value.Contains($newDb)) { $additions += "- $newDb ($currentBranch)" }
+        if ($additions.Count -gt 0) {
+            $end = $m.Groups[2].Index + $m.Groups[2].Length
+            $stable = $stable.Substring(0, $end) + "`n" + ($additions -join "`n") + $stable.Substring($end)
+        }
+    }
+    $m = [regex]::Match($volatile, $recentPattern)
+    $heading = if ($m.Success) { $m.Groups[1].Value } else { 'Recent Changes' }
+    $lines = @()
+    if ($m.Success) { $lines = $m.Groups[2].Value.Split("`n") | Where-Object { $_.Trim() -and -not $_.StartsWith("- ${currentBranch}:") } }
+    $lines = @("- ${currentBranch}: Added ${newLang} + ${newFramework}") + @($lines) | Select-Object -First 3
+    $d = [regex]::Match($volatile, $datePattern)
+    if ($d.Success) { $label = $d.Groups[1].Value; $date = $d.Groups[2].Value } else { $label = 'Last updated: '; $date = '' }
+    $body = "$stable$stableMarker`n## $heading`n$($lines -join "`n")`n`n"
+    # Keep the previous date (and so identical bytes) unless something else changed
+    $labelIndex = $original.IndexOf($label)
+    if (-not $date -or $labelIndex -lt 0 -or $body -ne $original.Substring(0, $labelIndex)) { $date = Get-Date -Format 'yyyy-MM-dd' }
+    $content = "$body$label$date`n"
+    if ($content -ne $original) {
+        [IO.File]::WriteAllText($targetFile, $content, (New-Object Text.UTF8Encoding $false))
+    } else {
+        Write-Output 'No changes (file is byte-identical)'
+    }
+}
+
 function Update-AgentFile($targetFile, $agentName) {
-    if (-not (Test-Path $targetFile)) { Initialize-AgentFile $targetFile $agentName; return }
+    if (-not (Test-Path $targetFile)) {
+        Initialize-AgentFile $targetFile $agentName
+        # Run the new file through the stable update too, so the next run on unchanged input is byte-identical
+        if ((Test-Path $targetFile) -and (Get-Content $targetFile -Raw).Contains($stableMarker)) { Update-AgentFileStable $targetFile $agentName | Out-Null }
+        Write-StablePrefix $targetFile
+        Save-Provenance $targetFile
+        return
+    }
+    if ($Layout -eq 'stable' -or (Get-Content $targetFile -Raw).Contains($stableMarker)) {
+        Update-AgentFileStable $targetFile $agentName
+        Write-StablePrefix $targetFile
+        Save-Provenance $targetFile
+        Write-Output "✅ $agentName context file updated successfully"
+        return
+    }
     $content = Get-Content $targetFile -Raw
     if ($newLang -and ($content -notmatch [regex]::Escape($newLang))) { $content = $content -replace '(## Active Technologies\n)', "`$1- $newLang + $newFramework ($currentBranch)`n" }
     if ($newDb -and $newDb -ne 'N/A' -and ($content -notmatch [regex]::Escape($newDb))) { $content = $content -replace '(## Active Technologies\n)', "`$1- $newDb ($currentBranch)`n" }
@@ -63,6 +153,8 @@ function Update-AgentFile($targetFile, $agentName) {
     }
     $content = [regex]::Replace($content, 'Last updated: \d{4}-\d{2}-\d{2}', "Last updated: $(Get-Date -Format 'yyyy-MM-dd')")
     $content | Set-Content $targetFile -Encoding UTF8
+    Write-StablePrefix $targetFile
+    Save-Provenance $targetFile
     Write-Output "✅ $agentName context file updated successfully"
 }
 
@@ -95,4 +187,4 @@ if ($newFramework) { Write-Output "- Added framework: $newFramework" }
 if ($newDb -and $newDb -ne 'N/A') { Write-Output "- Added database: $newDb" }
 
 Write-Output ''
-Write-Output 'Usage: ./update-agent-context.ps1 [claude|gemini|copilot|cursor]'
+Write-Output 'Usage: ./update-agent-context.ps1 [claude|gemini|copilot|cursor] [-Layout stable|classic]'
@@ -26,6 +26,7 @@ Or install globally:
 
 import sys
 from pathlib import Path
+from typing import List
 
 import typer
 
@@ -37,7 +38,25 @@ from .i18n import t
 # Import command implementations
 from .commands import (
     init_command,
-    check_command
+    check_command,
+    serve_command,
+    query_command,
+    bundle_export_command,
+    bundle_info_command,
+    cache_warm_command,
+    cache_info_command,
+    cache_clear_command,
+    context_pack_command,
+    context_prefix_command,
+    trace_command,
+    stale_command,
+    search_command,
+    stats_command,
+    doctor_net_command,
+    fleet_command,
+    sync_command,
+    feature_new_command,
+    feature_list_command,
 )
 
 # Create the main Typer app
@@ -63,7 +82,7 @@ def callback(ctx: typer.Context):
 @app.command()
 def init(
     project_name: str = typer.Argument(None, help="Name for your new project directory (optional if using --here)"),
-    ai_assistant: str = typer.Option(None, "--ai", help="AI assistant to use: claude, gemini, copilot, or cursor"),
+    ai_assistant: str = typer.Option(None, "--ai", help="AI assistant to use: claude, gemini, copilot, or cursor (comma separated to set up several, e.g. claude,gemini)"),
     script_type: str = typer.Option(None, "--script", help="Script type to use: sh or ps"),
     language: str = typer.Option(None, "--lang", help="Template language to use: en (English) or zh (Chinese)"),
     ignore_agent_tools: bool = typer.Option(False, "--ignore-agent-tools", help="Skip checks for AI agent tools like Claude Code"),
@@ -71,6 +90,13 @@ def init(
     here: bool = typer.Option(False, "--here", help="Initialize project in the current directory instead of creating a new one"),
     skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification (not recommended)"),
     debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network and extraction failures"),
+    bundle: Path = typer.Option(None, "--bundle", help="Initialize from an offline bundle created by 'specify bundle export'"),
+    materialize: str = typer.Option(None, "--materialize", help="Write files through the shared blob store: auto, reflink, hardlink, or copy"),
+    ci: bool = typer.Option(False, "--ci", "--quiet", "-q", help="Plain one-line-per-step output without banner or live progress (default when stdout is not a terminal)"),
+    resume: bool = typer.Option(False, "--resume", help="Continue an interrupted init of this directory from its last completed step"),
+    profile: str = typer.Option(None, "--profile", help="Profile each setup step: cpu (cProfile, flamegraph stacks) or mem (tracemalloc allocation sites)"),
+    profile_dir: Path = typer.Option(None, "--profile-dir", help="Directory for --profile reports (default: a new directory under the cache)"),
+    template_dir: Path = typer.Option(None, "--template-dir", help="Render from a local spec-kit checkout (templates/, scripts/, memory/) instead of a release"),
 ):
     """
     Initialize a new Specify project from the latest template.
@@ -80,6 +106,12 @@ def init(
         specify init my-project --ai claude
         specify init my-project --ai gemini --lang zh
         specify init --here --ai claude
+        specify init my-project --ai claude --bundle spec-kit.bundle
+        specify init my-project --ai claude --script sh --ci
+        specify init my-project --ai claude,gemini,cursor
+        specify init my-project --resume
+        specify init my-project --ai claude --profile cpu --profile-dir ./profile
+        specify init test-project --ai claude --template-dir ~/src/spec-kit
     """
     init_command(
         project_name=project_name,
@@ -91,14 +123,338 @@ def init(
         here=here,
         skip_tls=skip_tls,
         debug=debug,
+        bundle=bundle,
+        materialize=materialize,
+        ci=ci,
+        resume=resume,
+        profile=profile,
+        profile_dir=profile_dir,
+        template_dir=template_dir,
     )
 
 
 @app.command()
-def check():
+def check(
+    profile: str = typer.Option(None, "--profile", help="Profile each tool probe: cpu or mem"),
+    profile_dir: Path = typer.Option(None, "--profile-dir", help="Directory for --profile reports (default: a new directory under the cache)"),
+):
     """Check that all required tools are installed."""
-    check_command()
+    check_command(profile=profile, profile_dir=profile_dir)
+
+
+@app.command()
+def serve(
+    repo: Path = typer.Option(None, "--repo", help="Repository to serve (defaults to the current directory)"),
+    idle_timeout: float = typer.Option(600, "--idle-timeout", help="Exit after this many seconds without requests (0 = never)"),
+    detach: bool = typer.Option(False, "--detach", help="Start the daemon in the background and return"),
+    stop: bool = typer.Option(False, "--stop", help="Stop the daemon for this repository"),
+):
+    """
+    Run a per-repository daemon that answers agent queries over a Unix socket.
+
+    Examples:
+        specify serve --detach
+        specify query paths
+        specify serve --stop
+    """
+    serve_command(repo=repo, idle_timeout=idle_timeout, detach=detach, stop=stop)
+
+
+@app.command()
+def query(
+    method: str = typer.Argument(..., help="Query to answer: paths, prereqs, status, context, sections, section, or stats"),
+    repo: Path = typer.Option(None, "--repo", help="Repository to query (defaults to the current directory)"),
+    no_daemon: bool = typer.Option(False, "--no-daemon", help="Answer directly without contacting the daemon"),
+    doc: str = typer.Option(None, "--doc", help="sections/section: feature document to read (e.g. research.md)"),
+    heading: str = typer.Option(None, "--heading", help="section: heading (or heading path) of the section to return"),
+):
+    """
+    Answer a repository query as JSON, using the daemon when it is running.
+
+    Examples:
+        specify query paths
+        specify query sections --doc research.md
+        specify query section --doc research.md --heading "Decision"
+    """
+    query_command(method, repo=repo, no_daemon=no_daemon, doc=doc, heading=heading)
+
+
+@app.command()
+def trace(
+    feature: str = typer.Argument(None, help="Feature directory name under specs/ (defaults to the current feature branch)"),
+    all_features: bool = typer.Option(False, "--all", help="Report every feature in the repository"),
+    repo: Path = typer.Option(None, "--repo", help="Repository root (defaults to the current directory)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the full cross-reference as JSON"),
+    strict: bool = typer.Option(False, "--strict", help="Exit with status 1 when requirements are uncovered or tasks are orphaned"),
+):
+    """
+    Cross-reference spec requirements (FR-###) with tasks (T###).
+
+    Examples:
+        specify trace
+        specify trace --all --strict
+    """
+    trace_command(feature=feature, all_features=all_features, repo=repo, as_json=as_json, strict=strict)
+
+
+@app.command()
+def stale(
+    feature: str = typer.Argument(None, help="Only check this feature's plan and tasks (defaults to the whole repository)"),
+    repo: Path = typer.Option(None, "--repo", help="Repository root (defaults to the current directory)"),
+    record: List[Path] = typer.Option(None, "--record", help="Record current input hashes for a regenerated document (repeatable)"),
+    record_all: bool = typer.Option(False, "--record-all", help="Record current input hashes for every derived document (baseline)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the status of every derived document as JSON"),
+    strict: bool = typer.Option(False, "--strict", help="Exit with status 1 when any document is stale"),
+):
+    """
+    List plans, tasks, agent files and templates whose inputs changed since they were generated.
+
+    Examples:
+        specify stale
+        specify stale --record specs/001-auth/plan.md
+        specify stale --record-all
+    """
+    stale_command(feature=feature, repo=repo, record=record, record_all=record_all, as_json=as_json, strict=strict)
+
+
+@app.command()
+def search(
+    query: str = typer.Argument(..., help="Search terms (English words or Chinese text)"),
+    limit: int = typer.Option(10, "--limit", "-n", help="Maximum number of results"),
+    section: str = typer.Option(None, "--section", help="Only match sections whose heading contains this text (e.g. 'Technical Context')"),
+    feature: str = typer.Option(None, "--feature", help="Only search this feature directory under specs/"),
+    repo: Path = typer.Option(None, "--repo", help="Repository root (defaults to the current directory)"),
+    reindex: bool = typer.Option(False, "--reindex", help="Rebuild the index from scratch"),
+    no_refresh: bool = typer.Option(False, "--no-refresh", help="Query the index as it is, without checking files for changes"),
+    as_json: bool = typer.Option(False, "--json", help="Print results as JSON"),
+):
+    """
+    Ranked full-text search across specs/ (spec, plan, research, data model, quickstart, tasks).
+
+    Examples:
+        specify search "postgres migration"
+        specify search "用户认证" --section "Key Entities"
+        specify search "retry backoff" --no-refresh
+    """
+    search_command(query=query, limit=limit, section=section, feature=feature, repo=repo, reindex=reindex,
+                   refresh=not no_refresh, as_json=as_json)
+
+
+@app.command()
+def stats(
+    recent: int = typer.Option(5, "--recent", help="Number of latest runs compared with the baseline"),
+    baseline: int = typer.Option(20, "--baseline", help="Number of runs before those that form the rolling baseline"),
+    threshold: float = typer.Option(1.25, "--threshold", help="Flag a step whose recent median exceeds the baseline median by this factor"),
+    days: float = typer.Option(None, "--days", help="Only use runs from the last N days"),
+    as_json: bool = typer.Option(False, "--json", help="Print the statistics as JSON"),
+    strict: bool = typer.Option(False, "--strict", help="Exit with status 1 when a step regressed"),
+    clear: bool = typer.Option(False, "--clear", help="Delete every recorded run"),
+):
+    """
+    Show per-step timing percentiles of recorded init runs and flag regressions.
 
+    Examples:
+        specify stats
+        specify stats --recent 3 --baseline 30 --threshold 1.5
+        specify stats --json --strict
+    """
+    stats_command(recent=recent, baseline=baseline, threshold=threshold, days=days, as_json=as_json, strict=strict, clear=clear)
+
+
+@app.command()
+def fleet(
+    op: str = typer.Argument(..., help="Operation: upgrade, verify, context or lint"),
+    repos: List[str] = typer.Option(..., "--repos", help="Repository glob, or a file listing one path or glob per line (repeatable)"),
+    jobs: int = typer.Option(None, "--jobs", "-j", help="Maximum repositories processed at once (default: CPU count, at most 8)"),
+    tag: str = typer.Option(None, "--tag", help="upgrade: release tag to upgrade to (defaults to the latest release)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="upgrade: report what would change without writing"),
+    force: bool = typer.Option(False, "--force", help="upgrade: also overwrite locally edited template files"),
+    as_json: bool = typer.Option(False, "--json", help="Print the per-repository results as JSON"),
+    strict: bool = typer.Option(False, "--strict", help="Also exit with status 1 when verify or lint finds issues"),
+    skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification (not recommended)"),
+    debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network failures"),
+):
+    """
+    Run a maintenance operation across many Spec Kit repositories.
+
+    Examples:
+        specify fleet verify --repos '~/src/*'
+        specify fleet upgrade --repos repos.txt --dry-run
+        specify fleet lint --repos 'services/*' --jobs 16 --strict
+    """
+    fleet_command(op, repos, jobs=jobs, tag=tag, dry_run=dry_run, force=force, as_json=as_json,
+                  strict=strict, skip_tls=skip_tls, debug=debug)
+
+
+@app.command()
+def sync(
+    repo: Path = typer.Option(None, "--repo", help="Project to update (defaults to the current directory)"),
+    template_dir: Path = typer.Option(None, "--template-dir", help="Template checkout to render from (defaults to the one recorded by init --template-dir)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Report what would change without writing"),
+    force: bool = typer.Option(False, "--force", help="Re-render even if the checkout looks unchanged and overwrite locally edited files"),
+):
+    """
+    Push template edits from a local checkout into a project made with init --template-dir.
+
+    Examples:
+        specify sync
+        specify sync --repo ../test-project --dry-run
+        specify sync --template-dir ~/src/spec-kit --force
+    """
+    sync_command(repo=repo, template_dir=template_dir, dry_run=dry_run, force=force)
+
+
+feature_app = typer.Typer(name="feature", help="Create and list feature branches")
+app.add_typer(feature_app)
+
+
+@feature_app.command("new")
+def feature_new(
+    description: List[str] = typer.Argument(..., help="Feature description (the first three words name the branch)"),
+    worktree: bool = typer.Option(False, "--worktree", help="Check the branch out in its own git worktree instead of switching this one"),
+    path: Path = typer.Option(None, "--path", help="Worktree location (default: <repo>.worktrees/<branch> next to the main checkout)"),
+    repo: Path = typer.Option(None, "--repo", help="Repository (defaults to the current directory)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the result as JSON"),
+):
+    """
+    Create the next numbered feature branch and its spec.md.
+
+    Examples:
+        specify feature new "photo album sharing"
+        specify feature new --worktree "offline sync for mobile" --json
+        specify feature new --worktree --path /tmp/agent-2 "audit log export"
+    """
+    feature_new_command(description, worktree=worktree, path=path, repo=repo, as_json=as_json)
+
+
+@feature_app.command("list")
+def feature_list(
+    repo: Path = typer.Option(None, "--repo", help="Repository (defaults to the current directory)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the features as JSON"),
+):
+    """List feature branches and the worktree each is checked out in."""
+    feature_list_command(repo=repo, as_json=as_json)
+
+
+bundle_app = typer.Typer(name="bundle", help="Export and inspect offline template bundles")
+app.add_typer(bundle_app)
+
+
+@bundle_app.command("export")
+def bundle_export(
+    output: Path = typer.Argument(..., help="Bundle file to write"),
+    tag: str = typer.Option(None, "--tag", help="Release tag to export (defaults to the latest release)"),
+    ai: str = typer.Option(None, "--ai", help="Comma separated AI assistants to include (default: all)"),
+    script: str = typer.Option(None, "--script", help="Comma separated script types to include (default: all)"),
+    lang: str = typer.Option(None, "--lang", help="Comma separated languages to include (default: all)"),
+    skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification (not recommended)"),
+    debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network failures"),
+):
+    """
+    Pack a release's template variants into one indexed bundle file.
+
+    Examples:
+        specify bundle export spec-kit.bundle
+        specify bundle export claude-only.bundle --ai claude --tag v0.0.4
+    """
+    bundle_export_command(output, tag=tag, ai=ai, script=script, lang=lang, skip_tls=skip_tls, debug=debug)
+
+
+@bundle_app.command("info")
+def bundle_info(bundle: Path = typer.Argument(..., help="Bundle file to inspect")):
+    """Show the release and variants contained in a bundle."""
+    bundle_info_command(bundle)
+
+cache_app = typer.Typer(name="cache", help="Manage the local template asset cache")
+app.add_typer(cache_app)
+
+
+@cache_app.command("warm")
+def cache_warm(
+    ai: str = typer.Option(None, "--ai", help="Comma separated AI assistants to fetch (default: all)"),
+    script: str = typer.Option(None, "--script", help="Comma separated script types to fetch (default: all)"),
+    lang: str = typer.Option(None, "--lang", help="Comma separated languages to fetch (default: all)"),
+    tag: str = typer.Option(None, "--tag", help="Release tag to fetch (defaults to the latest release)"),
+    concurrency: int = typer.Option(4, "--concurrency", "-j", help="Maximum concurrent downloads"),
+    force: bool = typer.Option(False, "--force", help="Re-download assets that are already cached"),
+    skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification (not recommended)"),
+    debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network failures"),
+):
+    """
+    Prefetch template variants into the local cache.
+
+    Examples:
+        specify cache warm
+        specify cache warm --ai claude,copilot --lang en -j 8
+    """
+    cache_warm_command(ai=ai, script=script, lang=lang, tag=tag, concurrency=concurrency, force=force, skip_tls=skip_tls, debug=debug)
+
+
+@cache_app.command("info")
+def cache_info():
+    """List cached template assets."""
+    cache_info_command()
+
+
+@cache_app.command("clear")
+def cache_clear():
+    """Remove all cached template assets."""
+    cache_clear_command()
+
+
+doctor_app = typer.Typer(name="doctor", help="Diagnose the environment Specify runs in")
+app.add_typer(doctor_app)
+
+
+@doctor_app.command("net")
+def doctor_net(
+    url: List[str] = typer.Option(None, "--url", help="Also measure this URL (repeatable)"),
+    sources: str = typer.Option(None, "--sources", help="Template sources to check instead of SPECIFY_TEMPLATE_SOURCES"),
+    max_bytes: int = typer.Option(4 * 1024 * 1024, "--max-bytes", help="Stop each throughput measurement after this many bytes"),
+    skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification for the HTTP requests (handshakes are still checked)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the measurements as JSON"),
+):
+    """
+    Measure DNS, TCP, TLS, time to first byte and throughput of the template download path.
+
+    Examples:
+        specify doctor net
+        specify doctor net --sources https://mirror.example.com/spec-kit
+        specify doctor net --url https://objects.githubusercontent.com --json
+    """
+    doctor_net_command(urls=url, sources=sources, max_bytes=max_bytes, skip_tls=skip_tls, as_json=as_json)
+
+
+context_app = typer.Typer(name="context", help="Build token-budgeted context for AI agents")
+app.add_typer(context_app)
+
+
+@context_app.command("pack")
+def context_pack(
+    budget: int = typer.Option(8000, "--budget", "-b", help="Maximum estimated tokens in the pack"),
+    stage: str = typer.Option("tasks", "--for", help="Command the pack is for: plan, tasks, or implement"),
+    query: str = typer.Option(None, "--query", help="Free text used to rank sections (e.g. the slash command arguments)"),
+    feature_dir: Path = typer.Option(None, "--feature-dir", help="Feature directory (defaults to specs/<current branch>)"),
+    output: Path = typer.Option(None, "--output", "-o", help="Pack file to write (defaults to FEATURE_DIR/context-pack.md)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the manifest as JSON"),
+):
+    """
+    Pack the current feature's artifacts into a ranked, token-budgeted bundle.
+
+    Examples:
+        specify context pack --budget 8000
+        specify context pack --for implement --query "auth middleware" --json
+    """
+    context_pack_command(budget=budget, stage=stage, query=query, feature_dir=feature_dir, output=output, as_json=as_json)
+
+
+@context_app.command("prefix")
+def context_prefix(
+    files: List[Path] = typer.Argument(None, help="Agent context files (defaults to CLAUDE.md, GEMINI.md, ... in the repository)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the report as JSON"),
+):
+    """Show how many leading bytes of each agent context file stay stable between updates."""
+    context_prefix_command(files=files, as_json=as_json)
 
 
 def main():
@@ -0,0 +1,6 @@
+"""Allow running the CLI with ``python -m specify_cli``."""
+
+from . import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Programmatic API for Specify CLI.
+
+:func:`init_project` sets up a project the way ``specify init`` does, for
+callers that embed Specify instead of running it as a subprocess (an
+orchestration service creating many projects, say). Unlike the command:
+
+- nothing is printed and nothing prompts; progress is recorded per step
+  and returned with the result
+- no process-wide state is touched: no working directory (paths must be
+  absolute and are used as given), no ``os.chdir``, no i18n language switch
+- failures raise :class:`InitError` naming the failed step, never ``typer.Exit``
+- calls are safe from many threads at once and share one HTTP connection
+  pool (``httpx.Client`` is thread-safe) unless a client is passed
+
+:func:`ainit_project` is the asyncio variant; it runs :func:`init_project`
+on a worker thread so the event loop is never blocked.
+
+Example::
+
+    from specify_cli.api import init_project, InitError
+
+    try:
+        result = init_project("/srv/projects/photo-app", ai="claude", script_type="sh")
+    except InitError as e:
+        log.error("init failed at %s: %s", e.step, e.message)
+    else:
+        log.info("release %s, %d steps", result["release"], len(result["steps"]))
+"""
+
+import asyncio
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import httpx
+
+from .config import AI_ASSISTANT_KEYS, LANGUAGE_KEYS, SCRIPT_TYPE_KEYS
+from .project.manifest import read_manifest
+from .tools.downloader import (
+    TemplateSetupError,
+    get_default_client,
+    download_and_extract_template,
+    ensure_executable_scripts,
+)
+from .tools.git import init_git_repo, is_git_repo
+from .tools.sources import TemplateSource, parse_source
+from .ui.tracker import StepTracker
+
+__all__ = ["InitError", "init_project", "ainit_project"]
+
+
+class InitError(Exception):
+    """``init_project`` failed; ``step`` is ``validate`` or a setup step (``fetch``, ``download``, ``extract``, ...)."""
+
+    def __init__(self, step: str, message: str, project_path: Optional[Path] = None):
+        super().__init__(message)
+        self.step = step
+        self.message = message
+        self.project_path = project_path
+
+    def to_dict(self) -> Dict:
+        return {
+            "step": self.step,
+            "message": self.message,
+            "project_path": str(self.project_path) if self.project_path else None,
+        }
+
+
+def _validate(project_path: Path, agents: List[str], script_type: str, language: str, here: bool) -> None:
+    def fail(message: str):
+        raise InitError("validate", message, project_path)
+
+    if not project_path.is_absolute():
+        fail(f"project_path must be absolute (got {project_path})")
+    unknown = [a for a in agents if a not in AI_ASSISTANT_KEYS]
+    if unknown or not agents:
+        fail(f"Invalid AI assistant {', '.join(unknown) or '(none)'}; choose from {', '.join(AI_ASSISTANT_KEYS)}")
+    if script_type not in SCRIPT_TYPE_KEYS:
+        fail(f"Invalid script type {script_type!r}; choose from {', '.join(SCRIPT_TYPE_KEYS)}")
+    if language not in LANGUAGE_KEYS:
+        fail(f"Invalid language {language!r}; choose from {', '.join(LANGUAGE_KEYS)}")
+    if here and not project_path.is_dir():
+        fail(f"Directory not found: {project_path}")
+    if not here and project_path.exists():
+        fail(f"Directory already exists: {project_path}")
+
+
+def init_project(
+    project_path: Union[str, Path],
+    ai: str = "claude",
+    script_type: str = "sh",
+    language: str = "en",
+    *,
+    extra_agents: Optional[List[str]] = None,
+    here: bool = False,
+    git: bool = False,
+    materialize: Optional[str] = None,
+    bundle: Optional[Union[str, Path]] = None,
+    sources: Optional[List[Union[str, TemplateSource]]] = None,
+    client: Optional[httpx.Client] = None,
+) -> Dict:
+    """Create a Specify project at ``project_path`` and describe the result.
+
+    ``here`` sets up an existing directory (merging into it) instead of
+    creating a new one. ``sources`` takes ``SPECIFY_TEMPLATE_SOURCES``-style
+    strings or source objects; ``bundle`` initializes from an offline bundle.
+    The other options match ``specify init``.
+
+    Returns a dict with ``project_path``, ``agents``, ``script_type``,
+    ``language``, ``release``, ``method``, ``git`` (``initialized``,
+    ``existing``, ``failed`` or ``skipped``), ``steps`` (``key``/``status``/
+    ``detail`` per step) and ``elapsed`` seconds.
+
+    Raises InitError. A directory created by this call is removed again on failure.
+    """
+    started = time.monotonic()
+    project_path = Path(project_path)
+    agents = list(dict.fromkeys([ai] + list(extra_agents or [])))
+    _validate(project_path, agents, script_type, language, here)
+    resolved_sources = [parse_source(s) if isinstance(s, str) else s for s in sources] if sources else None
+
+    # A tracker with no refresh callback or writer records steps silently
+    tracker = StepTracker("init")
+    try:
+        download_and_extract_template(
+            project_path, ai, script_type, language, here,
+            verbose=False, tracker=tracker, client=client or get_default_client(),
+            bundle=Path(bundle) if bundle else None, materialize=materialize,
+            extra_agents=agents[1:], sources=resolved_sources,
+        )
+        ensure_executable_scripts(project_path, tracker=tracker)
+    except Exception as e:
+        if not here and project_path.exists():
+            shutil.rmtree(project_path, ignore_errors=True)
+        if isinstance(e, TemplateSetupError):
+            raise InitError(e.step, str(e), project_path) from e
+        failed = next((s for s in tracker.steps if s["status"] == "error"), None)
+        raise InitError(failed["key"] if failed else "setup", str(e), project_path) from e
+
+    if not git:
+        git_status = "skipped"
+    elif is_git_repo(project_path):
+        git_status = "existing"
+    else:
+        git_status = "initialized" if init_git_repo(project_path, quiet=True) else "failed"
+
+    manifest = read_manifest(project_path) or {}
+    return {
+        "project_path": str(project_path),
+        "agents": agents,
+        "script_type": script_type,
+        "language": language,
+        "release": manifest.get("release"),
+        "method": manifest.get("method"),
+        "git": git_status,
+        "steps": [{"key": s["key"], "status": s["status"], "detail": s["detail"]} for s in tracker.steps],
+        "elapsed": round(time.monotonic() - started, 3),
+    }
+
+
+async def ainit_project(
+    project_path: Union[str, Path],
+    ai: str = "claude",
+    script_type: str = "sh",
+    language: str = "en",
+    **options,
+) -> Dict:
+    """``init_project`` without blocking the event loop (runs on the loop's default executor)."""
+    return await asyncio.to_thread(init_project, project_path, ai, script_type, language, **options)
@@ -6,8 +6,38 @@ This module contains all command implementations for the CLI application.
 
 from .init import init_command
 from .check import check_command
+from .serve import serve_command, query_command
+from .bundle import bundle_export_command, bundle_info_command
+from .cache import cache_warm_command, cache_info_command, cache_clear_command
+from .context import context_pack_command, context_prefix_command
+from .trace import trace_command
+from .stale import stale_command
+from .search import search_command
+from .stats import stats_command
+from .doctor import doctor_net_command
+from .fleet import fleet_command
+from .sync import sync_command
+from .feature import feature_new_command, feature_list_command
 
 __all__ = [
     "init_command",
     "check_command", 
+    "serve_command",
+    "query_command",
+    "bundle_export_command",
+    "bundle_info_command",
+    "cache_warm_command",
+    "cache_info_command",
+    "cache_clear_command",
+    "context_pack_command",
+    "context_prefix_command",
+    "trace_command",
+    "stale_command",
+    "search_command",
+    "stats_command",
+    "doctor_net_command",
+    "fleet_command",
+    "sync_command",
+    "feature_new_command",
+    "feature_list_command",
 ]
@@ -0,0 +1,105 @@
+"""
+Bundle command implementations for Specify CLI.
+
+This module contains the logic for exporting a release's template variants
+into a single offline bundle and for inspecting existing bundles.
+"""
+
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+from rich.panel import Panel
+from rich.table import Table
+
+from ..config import AI_ASSISTANT_KEYS, SCRIPT_TYPE_KEYS, LANGUAGE_KEYS
+from ..ui import console
+from ..tools.bundle import BundleReader, BundleWriter, iter_zip_members, variant_key
+from ..tools.downloader import find_variant_asset
+from ..tools.http import create_client
+from ..tools.sources import configured_sources, download_from_sources, resolve_release
+
+
+def parse_key_list(value: Optional[str], allowed: List[str], kind: str) -> List[str]:
+    """Parse a comma separated subset of ``allowed`` (all of them when empty)."""
+    if not value:
+        return list(allowed)
+    items = [v.strip() for v in value.split(",") if v.strip()]
+    unknown = [v for v in items if v not in allowed]
+    if unknown:
+        console.print(f"[red]Error:[/red] Unknown {kind} {', '.join(unknown)} (allowed: {', '.join(allowed)})")
+        raise typer.Exit(1)
+    return items
+
+
+def bundle_export_command(
+    output: Path,
+    tag: Optional[str] = None,
+    ai: Optional[str] = None,
+    script: Optional[str] = None,
+    lang: Optional[str] = None,
+    skip_tls: bool = False,
+    debug: bool = False,
+) -> None:
+    """Download the selected variants of a release and pack them into one bundle."""
+    agents = parse_key_list(ai, AI_ASSISTANT_KEYS, "AI assistant")
+    scripts = parse_key_list(script, SCRIPT_TYPE_KEYS, "script type")
+    languages = parse_key_list(lang, LANGUAGE_KEYS, "language")
+
+    sources = configured_sources()
+    with create_client(skip_tls) as client:
+        try:
+            source, release = resolve_release(client, sources, tag=tag, debug=debug)
+        except Exception as e:
+            console.print(Panel(str(e), title="Fetch Error", border_style="red"))
+            raise typer.Exit(1)
+        tag_name = release["tag_name"]
+        console.print(f"[cyan]Exporting release {tag_name} from {source.name} to {output}[/cyan]")
+
+        wanted = [(a, s, l) for a in agents for s in scripts for l in languages]
+        missing = []
+        with tempfile.TemporaryDirectory() as tmp, BundleWriter(output, tag_name) as writer:
+            for agent, script_type, language in wanted:
+                key = variant_key(agent, script_type, language)
+                asset = find_variant_asset(release, agent, script_type, language)
+                if asset is None:
+                    missing.append(key)
+                    console.print(f"[yellow]  skip {key}: no release asset[/yellow]")
+                    continue
+                zip_path = Path(tmp) / asset["name"]
+                try:
+                    download_from_sources(client, source, release, asset, zip_path, fallbacks=sources)
+                except Exception as e:
+                    console.print(Panel(str(e), title=f"Download Error ({asset['name']})", border_style="red"))
+                    raise typer.Exit(1)
+                count = writer.add_variant(key, iter_zip_members(zip_path), asset=asset["name"])
+                zip_path.unlink()
+                console.print(f"  [green]✓[/green] {key} ({count} files)")
+
+    if missing and len(missing) == len(wanted):
+        output.unlink(missing_ok=True)
+        console.print("[red]Error:[/red] No matching assets found in the release")
+        raise typer.Exit(1)
+    bundle_info_command(output)
+
+
+def bundle_info_command(bundle: Path) -> None:
+    """Print the release, variants and deduplication summary of a bundle."""
+    try:
+        reader = BundleReader(bundle)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    with reader:
+        stats = reader.stats()
+        table = Table(title=bundle.name, caption=f"release {reader.release}", show_header=True)
+        table.add_column("Variant", style="cyan")
+        table.add_column("Files", justify="right")
+        for key in reader.variants():
+            table.add_row(key, str(len(reader.index["variants"][key]["files"])))
+        console.print(table)
+        console.print(
+            f"[dim]{stats['files']} members, {stats['unique_blobs']} unique blobs, "
+            f"{stats['size']:,} bytes on disk[/dim]"
+        )
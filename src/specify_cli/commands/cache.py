@@ -0,0 +1,123 @@
+"""
+Cache command implementations for Specify CLI.
+
+This module contains the logic for warming, listing and clearing the local
+template asset cache.
+"""
+
+import time
+from typing import Optional
+
+import typer
+from rich.panel import Panel
+from rich.table import Table
+
+from ..config import AI_ASSISTANT_KEYS, SCRIPT_TYPE_KEYS, LANGUAGE_KEYS
+from ..ui import console
+from ..tools.cache import TemplateCache
+from ..tools.downloader import find_variant_asset, variant_asset_pattern
+from ..tools.http import create_client
+from ..tools.ratelimit import GitHubApiState, describe_budget
+from ..tools.render import find_universal_asset, render_enabled
+from ..tools.sources import resolve_release
+from ..tools.warm import warm_cache
+from .bundle import parse_key_list
+
+
+def cache_warm_command(
+    ai: Optional[str] = None,
+    script: Optional[str] = None,
+    lang: Optional[str] = None,
+    tag: Optional[str] = None,
+    concurrency: int = 4,
+    force: bool = False,
+    skip_tls: bool = False,
+    debug: bool = False,
+) -> None:
+    """Resolve the release once and fetch every selected variant into the cache concurrently."""
+    agents = parse_key_list(ai, AI_ASSISTANT_KEYS, "AI assistant")
+    scripts = parse_key_list(script, SCRIPT_TYPE_KEYS, "script type")
+    languages = parse_key_list(lang, LANGUAGE_KEYS, "language")
+    if concurrency < 1:
+        console.print("[red]Error:[/red] --concurrency must be at least 1")
+        raise typer.Exit(1)
+
+    with create_client(skip_tls) as client:
+        try:
+            source, release = resolve_release(client, tag=tag, debug=debug)
+        except Exception as e:
+            console.print(Panel(str(e), title="Fetch Error", border_style="red"))
+            raise typer.Exit(1)
+
+    assets, missing = [], []
+    # One universal asset renders every variant locally
+    universal = find_universal_asset(release) if render_enabled() else None
+    if universal is not None:
+        assets, agents = [universal], []
+    for agent in agents:
+        for script_type in scripts:
+            for language in languages:
+                asset = find_variant_asset(release, agent, script_type, language)
+                if asset is None:
+                    missing.append(variant_asset_pattern(agent, script_type, language))
+                else:
+                    assets.append(asset)
+
+    console.print(
+        f"[cyan]Warming {len(assets)} asset(s) of release {release['tag_name']} "
+        f"from {source.name} ({concurrency} concurrent)[/cyan]"
+    )
+    started = time.perf_counter()
+    results = warm_cache(source, release, assets, concurrency=concurrency, skip_tls=skip_tls, force=force)
+    elapsed = time.perf_counter() - started
+
+    table = Table(show_header=True)
+    table.add_column("Asset", style="cyan")
+    table.add_column("Status")
+    table.add_column("Bytes", justify="right")
+    table.add_column("Time", justify="right")
+    table.add_column("MB/s", justify="right")
+    styles = {"downloaded": "green", "cached": "dim", "error": "red"}
+    downloaded_bytes = 0
+    for r in results:
+        rate = f"{r['bytes'] / r['seconds'] / 1e6:.2f}" if r["status"] == "downloaded" and r["seconds"] else "-"
+        seconds = f"{r['seconds']:.2f}s" if r["status"] != "cached" else "-"
+        status = r["status"] if not r["error"] else f"error: {r['error']}"
+        table.add_row(r["name"], f"[{styles[r['status']]}]{status}[/{styles[r['status']]}]", f"{r['bytes']:,}", seconds, rate)
+        if r["status"] == "downloaded":
+            downloaded_bytes += r["bytes"]
+    console.print(table)
+    if missing:
+        console.print(f"[yellow]No release asset for {len(missing)} variant(s):[/yellow] {', '.join(missing)}")
+    console.print(
+        f"[dim]{downloaded_bytes:,} bytes downloaded in {elapsed:.2f}s "
+        f"({downloaded_bytes / elapsed / 1e6 if elapsed else 0:.2f} MB/s aggregate)[/dim]"
+    )
+    if any(r["status"] == "error" for r in results):
+        raise typer.Exit(1)
+
+
+def cache_info_command() -> None:
+    """List cached template assets."""
+    cache = TemplateCache()
+    entries = cache.entries()
+    budget = describe_budget(GitHubApiState().budget())
+    if budget:
+        console.print(f"[cyan]GitHub API budget:[/cyan] {budget}")
+    if not entries:
+        console.print(f"[dim]Template cache is empty ({cache.root})[/dim]")
+        return
+    table = Table(title=str(cache.root), show_header=True)
+    table.add_column("Release", style="cyan")
+    table.add_column("Asset")
+    table.add_column("Bytes", justify="right")
+    for entry in entries:
+        table.add_row(entry["tag"], entry["name"], f"{entry['size']:,}")
+    console.print(table)
+
+
+def cache_clear_command() -> None:
+    """Remove all cached template assets and GitHub API responses."""
+    removed = TemplateCache().clear()
+    responses = GitHubApiState().clear_responses()
+    console.print(f"[green]Removed {removed} cached asset(s) and {responses} API response(s)[/green]")
@@ -4,13 +4,31 @@ Check command implementation for Specify CLI.
 This module contains the logic for checking tool availability.
 """
 
+from pathlib import Path
+from typing import Optional
+
+import typer
+
 from ..i18n import t
 from ..ui import show_banner, StepTracker, console
 from ..tools import check_tool_for_tracker
 
+CHECKED_TOOLS = ("git", "claude", "gemini", "code", "code-insiders", "cursor-agent")
+
+
+def check_command(profile: Optional[str] = None, profile_dir: Optional[Path] = None) -> None:
+    """Check that all required tools are installed.
+
+    ``profile`` (``cpu`` or ``mem``) profiles each tool probe separately (see ``tools.profiling``).
+    """
+    profiler = None
+    if profile:
+        from ..tools.profiling import PROFILE_MODES, PhaseProfiler, default_profile_dir, report_profile
+        if profile not in PROFILE_MODES:
+            console.print(f"[red]Error:[/red] {t('errors.invalid_profile', mode=profile, choices=', '.join(PROFILE_MODES))}")
+            raise typer.Exit(1)
+        profiler = PhaseProfiler(profile, profile_dir or default_profile_dir("check"), CHECKED_TOOLS, command="check")
 
-def check_command() -> None:
-    """Check that all required tools are installed."""
     show_banner()
     console.print("[bold]Checking for installed tools...[/bold]\n")
 
@@ -23,6 +41,9 @@ def check_command() -> None:
     tracker.add("gemini", t("tools.gemini"))
     tracker.add("code", t("tools.code"))
     tracker.add("cursor-agent", t("tools.cursor_agent"))
+    if profiler is not None:
+        tracker.attach_observer(profiler.observe)
+        profiler.start()
     
     # Check each tool
     git_ok = check_tool_for_tracker("git", "https://git-scm.com/downloads", tracker)
@@ -33,6 +54,8 @@ def check_command() -> None:
     if not code_ok:
         code_ok = check_tool_for_tracker("code-insiders", "https://code.visualstudio.com/insiders/", tracker)
     cursor_ok = check_tool_for_tracker("cursor-agent", "https://cursor.sh/", tracker)
+    if profiler is not None:
+        report_profile(profiler)
     
     # Render the final tree
     console.print(tracker.render())
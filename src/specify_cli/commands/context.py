@@ -0,0 +1,126 @@
+"""
+Context command implementations for Specify CLI.
+
+This module contains the logic for building token-budgeted context packs
+from a feature's design artifacts and for inspecting agent context files.
+"""
+
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+from rich.table import Table
+
+from ..ui import console
+from ..project.agent_context import describe_agent_file, find_agent_files
+from ..project.context import STAGES, pack_context
+from ..project.paths import find_repo_root, get_feature_paths, is_feature_branch, read_current_branch
+
+
+def resolve_feature_dir(feature_dir: Optional[Path]) -> Path:
+    """Explicit ``--feature-dir`` or ``specs/<current branch>`` of the enclosing repository."""
+    if feature_dir is not None:
+        if not feature_dir.is_dir():
+            console.print(f"[red]Error:[/red] Feature directory not found: {feature_dir}")
+            raise typer.Exit(1)
+        return feature_dir.resolve()
+    repo_root = find_repo_root()
+    if repo_root is None:
+        console.print(f"[red]Error:[/red] Not inside a git repository: {Path.cwd()}")
+        raise typer.Exit(1)
+    branch = read_current_branch(repo_root)
+    if not is_feature_branch(branch):
+        console.print(f"[red]Error:[/red] Not on a feature branch. Current branch: {branch}")
+        console.print("Feature branches should be named like: 001-feature-name (or pass --feature-dir)")
+        raise typer.Exit(1)
+    path = Path(get_feature_paths(repo_root, branch)["FEATURE_DIR"])
+    if not path.is_dir():
+        console.print(f"[red]Error:[/red] Feature directory not found: {path}")
+        raise typer.Exit(1)
+    return path
+
+
+def context_pack_command(
+    budget: int = 8000,
+    stage: str = "tasks",
+    query: Optional[str] = None,
+    feature_dir: Optional[Path] = None,
+    output: Optional[Path] = None,
+    as_json: bool = False,
+) -> None:
+    """Write ``context-pack.md`` and ``context-pack.json`` (the manifest) for a feature."""
+    if stage not in STAGES:
+        console.print(f"[red]Error:[/red] Invalid stage '{stage}'. Choose from: {', '.join(STAGES)}")
+        raise typer.Exit(1)
+    if budget < 100:
+        console.print("[red]Error:[/red] --budget must be at least 100 tokens")
+        raise typer.Exit(1)
+
+    directory = resolve_feature_dir(feature_dir)
+    pack, manifest = pack_context(directory, budget, stage=stage, query=query)
+
+    output = output or directory / "context-pack.md"
+    # The manifest sits next to the pack; a pack that is itself .json gets <stem>.manifest.json
+    manifest_path = output.with_suffix(".manifest.json" if output.suffix == ".json" else ".json")
+    output.write_text(pack, encoding="utf-8")
+    manifest["pack"] = str(output)
+    manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    if as_json:
+        print(json.dumps(manifest, ensure_ascii=False))
+        return
+
+    table = Table(title=f"Cut sections ({len(manifest['cut'])})", show_header=True)
+    table.add_column("File", style="cyan")
+    table.add_column("Section")
+    table.add_column("Tokens", justify="right")
+    table.add_column("Score", justify="right")
+    for entry in manifest["cut"]:
+        table.add_row(entry["file"], entry["heading"], f"{entry['tokens']:,}", f"{entry['score']:.2f}")
+    if manifest["cut"]:
+        console.print(table)
+    console.print(
+        f"[green]Packed {len(manifest['included'])} section(s), ~{manifest['used_tokens']:,} of "
+        f"{budget:,} tokens[/green] [dim](all artifacts ~{manifest['total_tokens']:,}; "
+        f"cache {manifest['cache']['hits']} hit / {manifest['cache']['misses']} miss)[/dim]"
+    )
+    console.print(f"Pack: {output}")
+    console.print(f"Manifest: {manifest_path}")
+
+
+def context_prefix_command(files: Optional[List[Path]] = None, as_json: bool = False) -> None:
+    """Report the stable (prompt-cacheable) prefix of agent context files."""
+    if not files:
+        repo_root = find_repo_root()
+        if repo_root is None:
+            console.print(f"[red]Error:[/red] Not inside a git repository: {Path.cwd()}")
+            raise typer.Exit(1)
+        files = [path.relative_to(repo_root) if repo_root == Path.cwd().resolve() else path for path in find_agent_files(repo_root)]
+        if not files:
+            console.print("[yellow]No agent context files found (CLAUDE.md, GEMINI.md, ...)[/yellow]")
+            return
+    missing = [f for f in files if not f.is_file()]
+    if missing:
+        console.print(f"[red]Error:[/red] File not found: {missing[0]}")
+        raise typer.Exit(1)
+
+    reports = [describe_agent_file(f) for f in files]
+    if as_json:
+        print(json.dumps(reports, ensure_ascii=False))
+        return
+
+    table = Table(show_header=True)
+    table.add_column("File", style="cyan")
+    table.add_column("Layout")
+    table.add_column("Bytes", justify="right")
+    table.add_column("Stable prefix", justify="right")
+    table.add_column("~Tokens", justify="right")
+    table.add_column("Prefix SHA-256", style="dim")
+    for r in reports:
+        share = r["stable_bytes"] / r["bytes"] * 100 if r["bytes"] else 0
+        layout = r["layout"] if r["layout"] == "stable" else "[yellow]classic[/yellow]"
+        table.add_row(r["file"], layout, f"{r['bytes']:,}", f"{r['stable_bytes']:,} ({share:.0f}%)", f"{r['stable_tokens']:,}", r["stable_sha256"])
+    console.print(table)
+    if any(r["layout"] == "classic" for r in reports):
+        console.print("[dim]Classic files change near the top on every update; convert with: update-agent-context.sh --layout stable[/dim]")
@@ -0,0 +1,135 @@
+"""
+Doctor command implementations for Specify CLI.
+
+This module contains the logic for diagnosing the environment Specify runs
+in, starting with the network path of template downloads.
+"""
+
+import json
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+import typer
+from rich.markup import escape
+from rich.table import Table
+
+from ..ui import console
+from ..tools.netdiag import DEFAULT_MAX_BYTES, diagnose_sources
+from ..tools.sources import configured_sources
+
+
+def _ms(measurement: Optional[dict]) -> str:
+    if not measurement:
+        return "[dim]-[/dim]"
+    if measurement.get("error"):
+        return "[red]failed[/red]"
+    return f"{measurement['seconds'] * 1000:.1f} ms"
+
+
+def doctor_net_command(
+    urls: Optional[List[str]] = None,
+    sources: Optional[str] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    skip_tls: bool = False,
+    as_json: bool = False,
+) -> None:
+    """Measure DNS, TCP, TLS, time to first byte and throughput for the template sources and ``urls``."""
+    if max_bytes < 1:
+        console.print("[red]Error:[/red] --max-bytes must be positive")
+        raise typer.Exit(1)
+    try:
+        selected = configured_sources(sources)
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+    if not as_json:
+        console.print(f"[cyan]Checking {', '.join(s.name for s in selected)}"
+                      f"{' and ' + ', '.join(urls) if urls else ''}...[/cyan]")
+    report = diagnose_sources(selected, skip_tls=skip_tls, max_bytes=max_bytes, extra_urls=urls)
+
+    if as_json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        _print_report(report)
+
+    failed = any(t.get("http") and (t["http"]["error"] or (t["http"]["status"] or 0) >= 400) for t in report["targets"])
+    if failed:
+        raise typer.Exit(1)
+
+
+def _print_report(report: dict) -> None:
+    proxy = report["proxy"]
+    if proxy["settings"]:
+        settings = ", ".join(f"{name}={escape(value)}" for name, value in proxy["settings"].items())
+        console.print(f"[bold]Proxy:[/bold] {settings}")
+    else:
+        console.print("[bold]Proxy:[/bold] none configured (direct connections)")
+    console.print(f"[bold]SOCKS support:[/bold] {'yes (socksio installed)' if proxy['socks_support'] else 'no (socksio not installed)'}")
+    for warning in proxy["warnings"]:
+        console.print(f"[yellow]Warning:[/yellow] {escape(warning)}")
+
+    hosts, seen = [], set()
+    for target in report["targets"]:
+        for host in [target.get("proxy_host")] + target.get("hosts", []):
+            if host and (host["host"], host["port"]) not in seen:
+                seen.add((host["host"], host["port"]))
+                hosts.append(host)
+
+    table = Table(title="Hosts", show_header=True)
+    table.add_column("Host", style="cyan")
+    table.add_column("Address")
+    table.add_column("DNS", justify="right")
+    table.add_column("TCP connect", justify="right")
+    table.add_column("TLS (truststore)", justify="right")
+    table.add_column("TLS (certifi)", justify="right")
+    for host in hosts:
+        tls = host["tls"]
+        trust = tls.get("truststore")
+        version = f" {trust['version']}" if trust and not trust.get("error") else ""
+        table.add_row(
+            f"{host['host']}:{host['port']}",
+            host.get("address") or "[red]unresolved[/red]",
+            _ms(host["dns"]),
+            _ms(host["tcp"]),
+            (_ms(trust) + version) if trust else "[dim]n/a[/dim]",
+            _ms(tls.get("certifi")) if tls else "[dim]n/a[/dim]",
+        )
+    console.print(table)
+
+    table = Table(title="Requests", show_header=True)
+    table.add_column("Target", style="cyan")
+    table.add_column("Status")
+    table.add_column("Via")
+    table.add_column("TTFB", justify="right")
+    table.add_column("Bytes", justify="right")
+    table.add_column("Throughput", justify="right")
+    for target in report["targets"]:
+        http = target.get("http")
+        if http is None:
+            table.add_row(escape(target["label"]), "[dim]skipped[/dim]", "", "", "", "")
+            continue
+        if http["error"]:
+            status = "[red]error[/red]"
+        else:
+            style = "green" if http["status"] < 400 else "red"
+            status = f"[{style}]{http['status']}[/{style}] {http.get('http_version', '')}"
+        via = target["proxy"] or "direct"
+        if http["redirects"]:
+            via += f" → {urlsplit(http['final_url']).hostname}"
+        throughput = http.get("throughput")
+        table.add_row(
+            escape(target["label"]),
+            status,
+            escape(via),
+            f"{http['ttfb_seconds'] * 1000:.1f} ms" if "ttfb_seconds" in http else "-",
+            f"{http['bytes']:,}" if "bytes" in http else "-",
+            f"{throughput / 1_000_000:.2f} MB/s" if throughput else "-",
+        )
+    console.print(table)
+
+    if report["findings"]:
+        for note in report["findings"]:
+            console.print(f"[yellow]•[/yellow] {escape(note)}")
+    else:
+        console.print("[green]No problems found.[/green]")
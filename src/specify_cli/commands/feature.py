@@ -0,0 +1,79 @@
+"""
+Feature command implementation for Specify CLI.
+
+This module contains the logic for creating feature branches (optionally in
+their own git worktree) and listing the features of a repository.
+"""
+
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+from rich.markup import escape
+from rich.table import Table
+
+from ..ui import console
+from ..project.paths import find_repo_root
+from ..tools.features import FeatureError, create_feature, list_features, uncommitted_project_files
+
+
+def _repo_root_or_exit(repo: Optional[Path]) -> Path:
+    repo_root = find_repo_root(repo)
+    if repo_root is None:
+        console.print(f"[red]Error:[/red] Not inside a git repository: {repo or Path.cwd()}")
+        raise typer.Exit(1)
+    return repo_root
+
+
+def feature_new_command(
+    description: List[str],
+    worktree: bool = False,
+    path: Optional[Path] = None,
+    repo: Optional[Path] = None,
+    as_json: bool = False,
+) -> None:
+    """Create the next ``NNN-name`` feature branch and spec, in the current tree or a new worktree."""
+    repo_root = _repo_root_or_exit(repo)
+    if path is not None and not worktree:
+        console.print("[red]Error:[/red] --path is only used with --worktree")
+        raise typer.Exit(1)
+    try:
+        result = create_feature(repo_root, " ".join(description), worktree=worktree, worktree_path=path)
+    except FeatureError as e:
+        console.print(f"[red]Error:[/red] {escape(str(e))}")
+        raise typer.Exit(1)
+
+    if as_json:
+        print(json.dumps(result, ensure_ascii=False))
+        return
+    for key in ("BRANCH_NAME", "SPEC_FILE", "FEATURE_NUM"):
+        print(f"{key}: {result[key]}")
+    if result["WORKTREE"]:
+        print(f"WORKTREE: {result['WORKTREE']}")
+        if uncommitted_project_files(repo_root):
+            console.print("[yellow]Warning:[/yellow] .specify/ is not committed, so the new worktree has no Spec Kit scripts or templates; commit it first")
+        console.print(f"[dim]Run the agent in the worktree: cd {escape(result['WORKTREE'])}[/dim]")
+
+
+def feature_list_command(repo: Optional[Path] = None, as_json: bool = False) -> None:
+    """List feature branches and the worktree each is checked out in."""
+    repo_root = _repo_root_or_exit(repo)
+    try:
+        features = list_features(repo_root)
+    except FeatureError as e:
+        console.print(f"[red]Error:[/red] {escape(str(e))}")
+        raise typer.Exit(1)
+
+    if as_json:
+        print(json.dumps(features, ensure_ascii=False))
+        return
+    if not features:
+        console.print("[dim]No feature branches (named like 001-feature-name)[/dim]")
+        return
+    table = Table(show_header=True, header_style="bold")
+    table.add_column("Branch")
+    table.add_column("Worktree")
+    for feature in features:
+        table.add_row(escape(feature["branch"]), escape(feature["worktree"]) if feature["worktree"] else "[dim]-[/dim]")
+    console.print(table)
@@ -0,0 +1,153 @@
+"""
+Fleet command implementation for Specify CLI.
+
+This module contains the logic for running upgrade, verify, context and
+lint operations across many Spec Kit repositories and summarising the
+outcome per repository.
+"""
+
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import typer
+from rich.markup import escape
+from rich.panel import Panel
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+from rich.table import Table
+
+from ..ui import console
+from ..tools.downloader import download_universal_template
+from ..tools.fleet import DEFAULT_JOBS, FLEET_OPS, expand_repos, run_fleet
+from ..tools.http import create_client
+from ..tools.ledger import percentile
+from ..tools.render import find_universal_asset
+from ..tools.sources import configured_sources, resolve_release
+
+STATUS_STYLES = {"ok": "green", "changed": "cyan", "issues": "yellow", "skipped": "dim", "error": "red"}
+
+
+def _prepare_upgrade(workdir: Path, tag: Optional[str], skip_tls: bool, debug: bool, quiet: bool) -> Dict:
+    """Resolve the release and fetch its universal asset once for every worker."""
+    sources = configured_sources()
+    with create_client(skip_tls) as client:
+        try:
+            resolved = resolve_release(client, sources, tag=tag, debug=debug)
+        except Exception as e:
+            console.print(Panel(str(e), title="Fetch Error", border_style="red"))
+            raise typer.Exit(1)
+        release = resolved[1]
+        asset = find_universal_asset(release)
+        if asset is None:
+            console.print(f"[red]Error:[/red] Release {release['tag_name']} has no universal template asset; "
+                          "fleet upgrade renders every repository from it")
+            raise typer.Exit(1)
+        try:
+            archive, meta = download_universal_template(workdir, asset, resolved, client=client, sources=sources)
+        except Exception as e:
+            console.print(f"[red]Error:[/red] Downloading {asset['name']} failed: {e}")
+            raise typer.Exit(1)
+    if not quiet:
+        cached = " (cached)" if meta["cache"] == "hit" else ""
+        console.print(f"[cyan]Release {meta['release']} via {meta['source']}: {meta['filename']}{cached}[/cyan]")
+    return {"archive": str(archive), "release": meta["release"]}
+
+
+def fleet_command(
+    op: str,
+    repos: List[str],
+    jobs: Optional[int] = None,
+    tag: Optional[str] = None,
+    dry_run: bool = False,
+    force: bool = False,
+    as_json: bool = False,
+    strict: bool = False,
+    skip_tls: bool = False,
+    debug: bool = False,
+) -> None:
+    """Run ``op`` on every repository; exits 1 on errors (and with ``strict``, on issues)."""
+    if op not in FLEET_OPS:
+        console.print(f"[red]Error:[/red] Unknown operation '{op}' (choose from {', '.join(FLEET_OPS)})")
+        raise typer.Exit(1)
+    jobs = DEFAULT_JOBS if jobs is None else jobs
+    if jobs < 1:
+        console.print("[red]Error:[/red] --jobs must be at least 1")
+        raise typer.Exit(1)
+    if op != "upgrade" and (tag or dry_run or force):
+        console.print("[red]Error:[/red] --tag, --dry-run and --force only apply to 'fleet upgrade'")
+        raise typer.Exit(1)
+    try:
+        paths = expand_repos(repos)
+    except OSError as e:
+        console.print(f"[red]Error:[/red] Cannot read repository list: {e}")
+        raise typer.Exit(1)
+    if not paths:
+        console.print(f"[red]Error:[/red] No repository directories match {', '.join(repos)}")
+        raise typer.Exit(1)
+
+    jobs = min(jobs, len(paths))
+    workdir = Path(tempfile.mkdtemp(prefix="specify-fleet-"))
+    try:
+        started = time.perf_counter()
+        options = _prepare_upgrade(workdir, tag, skip_tls, debug, as_json) if op == "upgrade" else {}
+        options.update(dry_run=dry_run, force=force)
+        if as_json:
+            results = run_fleet(op, paths, jobs=jobs, options=options)
+        else:
+            with Progress(
+                TextColumn(f"[cyan]fleet {op}[/cyan]"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                TimeElapsedColumn(),
+                console=console,
+                transient=True,
+            ) as progress:
+                task = progress.add_task(op, total=len(paths))
+                results = run_fleet(op, paths, jobs=jobs, options=options,
+                                    on_result=lambda _result: progress.advance(task))
+        elapsed = time.perf_counter() - started
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    counts = {status: sum(1 for r in results if r["status"] == status) for status in STATUS_STYLES}
+    timings = [r["seconds"] for r in results]
+    summary = {
+        "op": op,
+        "release": options.get("release"),
+        "repos": len(results),
+        "jobs": jobs,
+        "seconds": round(elapsed, 3),
+        "repo_seconds": round(sum(timings), 3),
+        "p50": round(percentile(timings, 50), 3),
+        "max": round(max(timings), 3),
+        "counts": counts,
+    }
+    if as_json:
+        print(json.dumps({"summary": summary, "results": results}, indent=2, ensure_ascii=False))
+    else:
+        _print_report(summary, results)
+
+    if counts["error"] or (strict and counts["issues"]):
+        raise typer.Exit(1)
+
+
+def _print_report(summary: Dict, results: List[Dict]) -> None:
+    table = Table(show_header=True)
+    table.add_column("Repository", style="cyan")
+    table.add_column("Status")
+    table.add_column("Time", justify="right")
+    table.add_column("Details")
+    for r in results:
+        style = STATUS_STYLES[r["status"]]
+        table.add_row(escape(r["repo"]), f"[{style}]{r['status']}[/{style}]", f"{r['seconds']:.2f}s", escape(r["detail"]))
+    console.print(table)
+
+    counts = ", ".join(f"[{STATUS_STYLES[s]}]{n} {s}[/{STATUS_STYLES[s]}]" for s, n in summary["counts"].items() if n)
+    console.print(f"{summary['repos']} repositories: {counts}")
+    console.print(
+        f"[dim]{summary['seconds']:.2f}s wall with {summary['jobs']} worker(s), {summary['repo_seconds']:.2f}s of repository "
+        f"time (median {summary['p50']:.2f}s, slowest {summary['max']:.2f}s)[/dim]"
+    )
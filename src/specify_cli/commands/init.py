@@ -7,13 +7,13 @@ This module contains the logic for initializing new Specify projects.
 import os
 import sys
 import shutil
+import time
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Optional
 
 import typer
-import httpx
 from rich.panel import Panel
-from rich.live import Live
 from rich.align import Align
 
 from ..config import (
@@ -27,9 +27,9 @@ from ..config import (
 from ..i18n import t, set_language
 from ..ui import (
     show_banner,
-    select_with_arrows,
     StepTracker,
-    console
+    console,
+    is_interactive
 )
 from ..tools import (
     check_tool,
@@ -38,6 +38,13 @@ from ..tools import (
     download_and_extract_template,
     ensure_executable_scripts
 )
+from ..tools.blobstore import STRATEGIES as MATERIALIZE_STRATEGIES
+from ..tools.downloader import resolve_template_release
+from ..tools.http import create_client
+from ..tools.journal import InitJournal
+from ..tools.ledger import record_init_run
+from ..project.manifest import read_manifest
+from ..tools.prefetch import TemplatePrefetcher, prefetch_enabled
 
 
 def init_command(
@@ -50,6 +57,13 @@ def init_command(
     here: bool = False,
     skip_tls: bool = False,
     debug: bool = False,
+    bundle: Optional[Path] = None,
+    materialize: Optional[str] = None,
+    ci: bool = False,
+    resume: bool = False,
+    profile: Optional[str] = None,
+    profile_dir: Optional[Path] = None,
+    template_dir: Optional[Path] = None,
 ) -> None:
     """
     Initialize a new Specify project from the latest template.
@@ -61,9 +75,30 @@ def init_command(
     4. Extract the template to a new project directory or current directory
     5. Initialize a fresh git repository (if not --no-git and no existing repo)
     6. Optionally set up AI assistant commands
+
+    With ``ci`` (or when stdout is not a terminal) the banner, live progress tree
+    and panels are skipped: each finished step is printed as one plain line and
+    missing choices fall back to their defaults instead of prompting.
+
+    Each finished step is journaled (see ``tools.journal``). When a run fails
+    the finished work is kept and ``resume`` continues from the failed step
+    with the options of the interrupted run.
+
+    ``profile`` (``cpu`` or ``mem``) profiles each setup step separately and
+    writes the reports to ``profile_dir`` (see ``tools.profiling``).
+
+    ``template_dir`` renders the project from a local spec-kit checkout instead
+    of a release; ``specify sync`` later pushes edits made there.
     """
+    quiet = ci or not is_interactive()
+    prompt = not quiet and sys.stdin.isatty()
+    if prompt:
+        # Only interactive runs need the arrow-key selector (and readchar)
+        from ..ui.selector import select_with_arrows
+
     # Show banner first
-    show_banner()
+    if not quiet:
+        show_banner()
     
     # Validate arguments
     if here and project_name:
@@ -73,12 +108,60 @@ def init_command(
     if not here and not project_name:
         console.print(f"[red]Error:[/red] {t('project.name_required')}")
         raise typer.Exit(1)
-    
+
     # Determine project directory
     if here:
         project_name = Path.cwd().name
         project_path = Path.cwd()
-        
+    else:
+        project_path = Path(project_name).resolve()
+
+    # --resume continues an interrupted run with the options it was started with
+    journal = InitJournal(project_path)
+    if resume:
+        if not journal.load():
+            console.print(f"[red]Error:[/red] {t('errors.nothing_to_resume', path=project_path)}")
+            raise typer.Exit(1)
+        options = journal.options
+        ai_assistant = ",".join(options["agents"])
+        script_type, language = options["script_type"], options["language"]
+        no_git, materialize = options["no_git"], options["materialize"]
+        bundle = Path(options["bundle"]) if options.get("bundle") else None
+        template_dir = Path(options["template_dir"]) if options.get("template_dir") else None
+        # The interrupted run already checked (or was told to skip) the agent tools
+        ignore_agent_tools = True
+        if not quiet:
+            console.print(f"[cyan]{t('project.resuming', path=project_path, steps=', '.join(journal.pending()))}[/cyan]")
+
+    # Create a httpx client with verify based on skip_tls
+    local_client = create_client(skip_tls)
+
+    if materialize and materialize not in MATERIALIZE_STRATEGIES:
+        console.print(f"[red]Error:[/red] {t('errors.invalid_materialize', mode=materialize, choices=', '.join(MATERIALIZE_STRATEGIES))}")
+        raise typer.Exit(1)
+
+    if bundle is not None and not bundle.is_file():
+        console.print(f"[red]Error:[/red] {t('errors.bundle_not_found', path=bundle)}")
+        raise typer.Exit(1)
+
+    if template_dir is not None:
+        if bundle is not None:
+            console.print(f"[red]Error:[/red] {t('errors.bundle_and_template_dir')}")
+            raise typer.Exit(1)
+        if not template_dir.is_dir():
+            console.print(f"[red]Error:[/red] {t('errors.template_dir_not_found', path=template_dir)}")
+            raise typer.Exit(1)
+
+    profiler = None
+    if profile:
+        # Imported only when asked for: without --profile nothing is hooked into the run
+        from ..tools.profiling import INIT_PHASES, PROFILE_MODES, PhaseProfiler, default_profile_dir, report_profile
+        if profile not in PROFILE_MODES:
+            console.print(f"[red]Error:[/red] {t('errors.invalid_profile', mode=profile, choices=', '.join(PROFILE_MODES))}")
+            raise typer.Exit(1)
+        profiler = PhaseProfiler(profile, profile_dir or default_profile_dir("init"), INIT_PHASES, command="init")
+    
+    if here and not resume:
         # Check if current directory has any files
         existing_items = list(project_path.iterdir())
         if existing_items:
@@ -90,8 +173,7 @@ def init_command(
             if not response:
                 console.print(f"[yellow]{t('common.operation_cancelled')}[/yellow]")
                 raise typer.Exit(0)
-    else:
-        project_path = Path(project_name).resolve()
+    elif not resume:
         # Check if project directory already exists
         if project_path.exists():
             console.print(f"[red]Error:[/red] {t('project.directory_exists', name=project_name)}")
@@ -104,28 +186,46 @@ def init_command(
         if not git_available:
             console.print(f"[yellow]{t('git.not_found_skip')}[/yellow]")
 
-    # AI assistant selection
+    # The options and target directory have been checked; while the user is choosing,
+    # resolve the release and download the likely template
+    prefetcher = None
+    if prompt and bundle is None and template_dir is None and not resume and prefetch_enabled():
+        prefetcher = TemplatePrefetcher(
+            local_client,
+            (ai_assistant or "").split(",")[0].strip() or get_default_ai_assistant(),
+            script_type or get_default_script_type(),
+            language or get_default_language(),
+        ).start()
+
+    # AI assistant selection (comma separated: the first is primary, the rest get their command files too)
+    extra_agents = []
     if ai_assistant:
-        if ai_assistant not in get_ai_choices():
-            console.print(f"[red]Error:[/red] {t('errors.invalid_ai', ai=ai_assistant, choices=', '.join(get_ai_choices().keys()))}")
+        requested = list(dict.fromkeys(a.strip() for a in ai_assistant.split(",") if a.strip()))
+        invalid = [a for a in requested if a not in get_ai_choices()]
+        if invalid or not requested:
+            console.print(f"[red]Error:[/red] {t('errors.invalid_ai', ai=', '.join(invalid) or ai_assistant, choices=', '.join(get_ai_choices().keys()))}")
             raise typer.Exit(1)
-        selected_ai = ai_assistant
-    else:
+        selected_ai, extra_agents = requested[0], requested[1:]
+    elif prompt:
         # Use arrow-key selection interface
         selected_ai = select_with_arrows(
             get_ai_choices(), 
             t("selection.choose_ai"), 
             get_default_ai_assistant()
         )
+    else:
+        selected_ai = get_default_ai_assistant()
     
+    selected_agents = [selected_ai] + extra_agents
+
     # Check agent tools unless ignored
     if not ignore_agent_tools:
         agent_tool_missing = False
-        if selected_ai == "claude":
+        if "claude" in selected_agents:
             if not check_tool("claude", "Install from: https://docs.anthropic.com/en/docs/claude-code/setup"):
                 console.print(f"[red]Error:[/red] {t('errors.claude_required')}")
                 agent_tool_missing = True
-        elif selected_ai == "gemini":
+        if "gemini" in selected_agents:
             if not check_tool("gemini", "Install from: https://github.com/google-gemini/gemini-cli"):
                 console.print(f"[red]Error:[/red] {t('errors.gemini_required')}")
                 agent_tool_missing = True
@@ -145,7 +245,7 @@ def init_command(
         # Auto-detect default
         default_script = get_default_script_type()
         # Provide interactive selection similar to AI if stdin is a TTY
-        if sys.stdin.isatty():
+        if prompt:
             selected_script = select_with_arrows(get_script_type_choices(), t("selection.choose_script"), default_script)
         else:
             selected_script = default_script
@@ -160,7 +260,7 @@ def init_command(
         # Default to English
         default_language = get_default_language()
         # Provide interactive selection if stdin is a TTY
-        if sys.stdin.isatty():
+        if prompt:
             selected_language = select_with_arrows(get_language_choices(), t("selection.choose_language"), default_language)
         else:
             selected_language = default_language
@@ -168,20 +268,23 @@ def init_command(
     # Set the selected language for i18n before showing results
     set_language(selected_language)
     
-    console.print(f"[cyan]{t('summary.selected_ai', ai=selected_ai)}[/cyan]")
-    console.print(f"[cyan]{t('summary.selected_script', script=selected_script)}[/cyan]")
-    console.print(f"[cyan]{t('summary.selected_language', language=selected_language)}[/cyan]")
+    if not quiet:
+        console.print(f"[cyan]{t('summary.selected_ai', ai=', '.join(selected_agents))}[/cyan]")
+        console.print(f"[cyan]{t('summary.selected_script', script=selected_script)}[/cyan]")
+        console.print(f"[cyan]{t('summary.selected_language', language=selected_language)}[/cyan]")
     
     # Download and set up project
-    # New tree-based progress (no emojis); include earlier substeps
-    tracker = StepTracker(t('project.setup_title'))
+    # New tree-based progress (no emojis); include earlier substeps.
+    # Quiet mode prints one plain line per finished step and never renders the tree.
+    plain_writer = (lambda line: console.print(line, markup=False, highlight=False, soft_wrap=True)) if quiet else None
+    tracker = StepTracker(t('project.setup_title'), plain_writer=plain_writer)
     # Flag to allow suppressing legacy headings
     sys._specify_tracker_active = True
     # Pre steps recorded as completed before live rendering
     tracker.add("precheck", t("steps.precheck"))
     tracker.complete("precheck", t("common.ok"))
     tracker.add("ai-select", t("steps.ai_select"))
-    tracker.complete("ai-select", f"{selected_ai}")
+    tracker.complete("ai-select", ", ".join(selected_agents))
     tracker.add("script-select", t("steps.script_select"))
     tracker.complete("script-select", selected_script)
     for key, label_key in [
@@ -197,41 +300,100 @@ def init_command(
     ]:
         tracker.add(key, t(label_key))
 
-    # Use transient so live tree is replaced by the final static render (avoids duplicate output)
-    with Live(tracker.render(), console=console, refresh_per_second=8, transient=True) as live:
-        tracker.attach_refresh(lambda: live.update(tracker.render()))
+    if quiet:
+        live_context = nullcontext()
+    else:
+        from rich.live import Live
+        # Use transient so live tree is replaced by the final static render (avoids duplicate output)
+        live_context = Live(tracker.render(), console=console, refresh_per_second=8, transient=True)
+    if not resume:
+        journal.start({
+            "agents": selected_agents,
+            "script_type": selected_script,
+            "language": selected_language,
+            "no_git": no_git,
+            "materialize": materialize,
+            "bundle": str(bundle.resolve()) if bundle else None,
+            "template_dir": str(template_dir.resolve()) if template_dir else None,
+        })
+    resume_command = f"specify init {'--here' if here else project_name} --resume"
+    if profiler is not None:
+        tracker.attach_observer(profiler.observe)
+        profiler.start()
+
+    run_started = time.perf_counter()
+
+    def record_run(status: str) -> None:
+        record_init_run(tracker, journal, project_path, status="resumed" if resume and status == "ok" else status,
+                        seconds=time.perf_counter() - run_started, agents=selected_agents,
+                        script_type=selected_script, language=selected_language)
+
+    with live_context as live:
+        if live is not None:
+            tracker.attach_refresh(lambda: live.update(tracker.render()))
         try:
-            # Create a httpx client with verify based on skip_tls
-            import ssl
-            import truststore
-            verify = not skip_tls
-            ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT) if verify else False
-            local_client = httpx.Client(verify=ssl_context)
+            extracted = resume and journal.completed("extract") and project_path.is_dir()
+            if extracted:
+                for key in ("fetch", "download", "extract", "zip-list", "extracted-summary", "cleanup"):
+                    tracker.complete(key, t("common.resumed"))
+            else:
+                resolved = journal.release() if resume else None
+                if resolved is None and prefetcher is not None:
+                    tracker.start("fetch", "finishing background download")
+                    prefetcher.settle(selected_ai, selected_script, selected_language)
+                    resolved = prefetcher.release()
+                if resolved is None and bundle is None and template_dir is None:
+                    tracker.start("fetch", "contacting GitHub API")
+                    resolved = resolve_template_release(local_client, debug=debug, verbose=False)
+                if resolved is not None and not journal.completed("fetch"):
+                    source, release = resolved
+                    assets = [{k: a[k] for k in ("name", "size", "browser_download_url")} for a in release.get("assets", [])]
+                    journal.done("fetch", source=source.spec, release={"tag_name": release["tag_name"], "assets": assets})
 
-            download_and_extract_template(project_path, selected_ai, selected_script, selected_language, here, verbose=False, tracker=tracker, client=local_client, debug=debug)
+                download_and_extract_template(project_path, selected_ai, selected_script, selected_language, here, verbose=False, tracker=tracker, client=local_client, debug=debug, bundle=bundle, materialize=materialize, extra_agents=extra_agents, resolved=resolved, journal=journal, template_dir=template_dir)
+                journal.done("extract", method=(read_manifest(project_path) or {}).get("method"))
 
             # Ensure scripts are executable (POSIX)
-            ensure_executable_scripts(project_path, tracker=tracker)
+            if extracted and journal.completed("chmod"):
+                tracker.complete("chmod", t("common.resumed"))
+            else:
+                ensure_executable_scripts(project_path, tracker=tracker)
+                journal.done("chmod")
 
             # Git step
             if not no_git:
                 tracker.start("git")
-                if is_git_repo(project_path):
+                # A journaled git failure may have left an empty repository behind: retry it in full
+                retry_git = resume and journal.artifacts("git").get("status") == "error"
+                if is_git_repo(project_path) and not retry_git:
                     tracker.complete("git", t("git.existing_repo"))
+                    journal.done("git", result="existing")
                 elif git_available:
                     if init_git_repo(project_path, quiet=True):
                         tracker.complete("git", t("git.initialized"))
+                        journal.done("git", result="initialized")
                     else:
                         tracker.error("git", "init failed")
+                        journal.failed("git", "init failed")
                 else:
                     tracker.skip("git", t("git.not_available"))
+                    journal.done("git", result="unavailable")
             else:
                 tracker.skip("git", t("git.no_git_flag"))
+                journal.done("git", result="skipped")
 
             tracker.complete("final", t("project.ready"))
         except Exception as e:
+            running = [step["key"] for step in tracker.steps if step["status"] == "running"]
+            for key in running:
+                tracker.error(key, str(e))
+            journal.failed(getattr(e, "step", None) or (running[0] if running else "final"), str(e))
             tracker.error("final", str(e))
-            console.print(Panel(t("errors.initialization_failed", error=str(e)), title="Failure", border_style="red"))
+            record_run("error")
+            if quiet:
+                console.print(t("errors.initialization_failed", error=str(e)), markup=False, highlight=False, soft_wrap=True)
+            else:
+                console.print(Panel(t("errors.initialization_failed", error=str(e)), title="Failure", border_style="red"))
             if debug:
                 _env_pairs = [
                     ("Python", sys.version.split()[0]),
@@ -241,12 +403,27 @@ def init_command(
                 _label_width = max(len(k) for k, _ in _env_pairs)
                 env_lines = [f"{k.ljust(_label_width)} → [bright_black]{v}[/bright_black]" for k, v in _env_pairs]
                 console.print(Panel("\n".join(env_lines), title="Debug Environment", border_style="magenta"))
-            if not here and project_path.exists():
+            # Extracted files are kept for --resume; a half-written extraction never is
+            if not here and project_path.exists() and not journal.completed("extract"):
                 shutil.rmtree(project_path)
+            console.print(t("project.resume_hint", command=resume_command), markup=False, highlight=False, soft_wrap=True)
             raise typer.Exit(1)
         finally:
-            # Force final render
-            pass
+            if profiler is not None:
+                if live is not None:
+                    live.stop()
+                report_profile(profiler, quiet)
+
+    # A failed git step is the only one init completes without; --resume retries it
+    record_run("ok")
+    if journal.artifacts("git").get("status") == "error":
+        console.print(t("project.resume_hint", command=resume_command), markup=False, highlight=False, soft_wrap=True)
+    else:
+        journal.discard()
+
+    if quiet:
+        console.print(f"{t('summary.project_ready')} {project_path}", markup=False, highlight=False, soft_wrap=True)
+        return
 
     # Final static tree (ensures finished state visible after Live context ends)
     console.print(tracker.render())
@@ -279,3 +456,4 @@ def init_command(
     steps_panel = Panel("\n".join(steps_lines), title=t("next_steps.title"), border_style="cyan", padding=(1,2))
     console.print()  # blank line
     console.print(steps_panel)
+
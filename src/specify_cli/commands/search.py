@@ -0,0 +1,81 @@
+"""
+Search command implementation for Specify CLI.
+
+This module contains the logic for ranked full-text search across the
+repository's feature documents.
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.markup import escape
+
+from ..ui import console
+from ..project.paths import find_repo_root
+from ..project.search import SearchIndex, tokenize
+
+
+def search_command(
+    query: str,
+    limit: int = 10,
+    section: Optional[str] = None,
+    feature: Optional[str] = None,
+    repo: Optional[Path] = None,
+    reindex: bool = False,
+    refresh: bool = True,
+    as_json: bool = False,
+) -> None:
+    """Print BM25-ranked section hits with snippets (the index is refreshed first unless ``refresh`` is off)."""
+    repo_root = find_repo_root(repo)
+    if repo_root is None:
+        console.print(f"[red]Error:[/red] Not inside a git repository: {repo or Path.cwd()}")
+        raise typer.Exit(1)
+
+    started = time.perf_counter()
+    index = SearchIndex(repo_root)
+    if reindex:
+        index.conn.execute("DELETE FROM files")
+        index.conn.execute("DELETE FROM sections")
+        index.conn.execute("DELETE FROM postings")
+    if refresh or reindex:
+        refreshed = index.refresh()
+    else:
+        refreshed = {"files": 0, "unchanged": 0, "rehashed": 0, "indexed": 0, "removed": 0}
+    refreshed_at = time.perf_counter()
+    results = index.search(query, limit=limit, section=section, feature=feature)
+    finished = time.perf_counter()
+    totals = index.stats()
+    index.close()
+
+    if as_json:
+        print(json.dumps({
+            "query": query,
+            "results": results,
+            "index": dict(totals, **refreshed),
+            "refresh_ms": round((refreshed_at - started) * 1000, 2),
+            "query_ms": round((finished - refreshed_at) * 1000, 2),
+        }, ensure_ascii=False))
+        return
+
+    terms = sorted(set(tokenize(query)), key=len, reverse=True)
+    highlight = re.compile("|".join(re.escape(t) for t in terms), re.IGNORECASE) if terms else None
+    for rank, hit in enumerate(results, start=1):
+        snippet = escape(hit["snippet"])
+        if highlight:
+            snippet = highlight.sub(lambda m: f"[bold yellow]{m.group(0)}[/bold yellow]", snippet)
+        console.print(f"[bold]{rank}.[/bold] [cyan]{hit['path']}:{hit['line']}[/cyan] [dim]›[/dim] {escape(hit['heading'])} [dim]({hit['score']:.2f})[/dim]")
+        console.print(f"   {snippet}", highlight=False)
+    if not results:
+        console.print(f"[yellow]No matches for[/yellow] {escape(query)}")
+    if refresh or reindex:
+        freshness = f"refresh {(refreshed_at - started) * 1000:.1f} ms, {refreshed['indexed']} reindexed, {refreshed['removed']} removed"
+    else:
+        freshness = "not refreshed"
+    console.print(
+        f"[dim]{len(results)} result(s) in {(finished - refreshed_at) * 1000:.1f} ms over "
+        f"{totals['files']:,} files / {totals['sections']:,} sections ({freshness})[/dim]"
+    )
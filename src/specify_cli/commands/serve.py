@@ -0,0 +1,105 @@
+"""
+Serve and query command implementations for Specify CLI.
+
+This module contains the logic for the per-repository query daemon and its
+thin command-line client.
+"""
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from ..ui import console
+from ..project.paths import find_repo_root
+from ..tools.daemon import (
+    DaemonServer,
+    call_daemon,
+    daemon_supported,
+    query,
+    socket_path_for,
+)
+
+
+def _resolve_repo(repo: Optional[Path]) -> Path:
+    repo_root = find_repo_root(repo)
+    if repo_root is None:
+        console.print(f"[red]Error:[/red] Not inside a git repository: {repo or Path.cwd()}")
+        raise typer.Exit(1)
+    return repo_root
+
+
+def serve_command(
+    repo: Optional[Path] = None,
+    idle_timeout: float = 600,
+    detach: bool = False,
+    stop: bool = False,
+) -> None:
+    """Run (or stop) the query daemon for a repository."""
+    if not daemon_supported():
+        console.print("[red]Error:[/red] Unix domain sockets are not supported on this platform")
+        raise typer.Exit(1)
+
+    repo_root = _resolve_repo(repo)
+    socket_path = socket_path_for(repo_root)
+
+    if stop:
+        response = call_daemon(socket_path, "shutdown")
+        if response is None:
+            console.print(f"[yellow]No daemon running for {repo_root}[/yellow]")
+        else:
+            console.print(f"[green]Stopped daemon for {repo_root}[/green]")
+        return
+
+    if detach:
+        if call_daemon(socket_path, "ping") is not None:
+            console.print(f"[yellow]Daemon already running:[/yellow] {socket_path}")
+            return
+        subprocess.Popen(
+            [sys.executable, "-m", "specify_cli", "serve", "--repo", str(repo_root), "--idle-timeout", str(idle_timeout)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        # Wait briefly so callers can rely on the socket once we return
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if call_daemon(socket_path, "ping") is not None:
+                console.print(f"[green]Daemon started:[/green] {socket_path}")
+                return
+            time.sleep(0.05)
+        console.print("[red]Error:[/red] Daemon did not come up within 5s")
+        raise typer.Exit(1)
+
+    try:
+        server = DaemonServer(repo_root, socket_path, idle_timeout=idle_timeout)
+    except RuntimeError as e:
+        console.print(f"[yellow]{e}[/yellow]")
+        raise typer.Exit(1)
+    console.print(f"[cyan]Serving {repo_root} on {socket_path} (idle timeout {idle_timeout:g}s)[/cyan]")
+    try:
+        server.run()
+    except KeyboardInterrupt:
+        pass
+
+
+def query_command(
+    method: str,
+    repo: Optional[Path] = None,
+    no_daemon: bool = False,
+    doc: Optional[str] = None,
+    heading: Optional[str] = None,
+) -> None:
+    """Print the JSON answer to a query, via the daemon when available."""
+    repo_root = _resolve_repo(repo)
+    params = {k: v for k, v in (("doc", doc), ("heading", heading)) if v is not None}
+    response = query(repo_root, method, params, use_daemon=not no_daemon)
+    if "error" in response:
+        print(json.dumps(response["error"]), file=sys.stderr)
+        raise typer.Exit(1)
+    print(json.dumps(response["result"]))
@@ -0,0 +1,80 @@
+"""
+Stale command implementation for Specify CLI.
+
+This module contains the logic for listing derived documents whose inputs
+changed since they were generated, and for recording fresh provenance.
+"""
+
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+from rich.table import Table
+
+from ..ui import console
+from ..project.depgraph import DependencyGraph, PROVENANCE_FILE
+from ..project.paths import find_repo_root
+
+
+def stale_command(
+    feature: Optional[str] = None,
+    repo: Optional[Path] = None,
+    record: Optional[List[Path]] = None,
+    record_all: bool = False,
+    as_json: bool = False,
+    strict: bool = False,
+) -> None:
+    """List stale and untracked derived documents, or record provenance with ``record``/``record_all``."""
+    repo_root = find_repo_root(repo)
+    if repo_root is None:
+        console.print(f"[red]Error:[/red] Not inside a git repository: {repo or Path.cwd()}")
+        raise typer.Exit(1)
+    graph = DependencyGraph(repo_root)
+
+    if record or record_all:
+        if record_all:
+            targets = sorted(graph.rules())
+        else:
+            targets = [graph.relative(p) for p in record]
+        recorded = graph.record(targets)
+        unknown = sorted(set(targets) - set(recorded))
+        for target in unknown:
+            console.print(f"[yellow]Not a derived document (no dependency rule):[/yellow] {target}")
+        graph.save()
+        console.print(f"[green]Recorded provenance for {len(recorded)} document(s)[/green] [dim]({PROVENANCE_FILE})[/dim]")
+        if unknown and not recorded:
+            raise typer.Exit(1)
+        return
+
+    if feature is not None and not (repo_root / "specs" / feature).is_dir():
+        console.print(f"[red]Error:[/red] Feature directory not found: {repo_root / 'specs' / feature}")
+        raise typer.Exit(1)
+    results = graph.status(feature)
+    stale = [r for r in results if r["status"] == "stale"]
+    untracked = [r for r in results if r["status"] == "untracked"]
+
+    if as_json:
+        print(json.dumps(results, ensure_ascii=False))
+    else:
+        if stale or untracked:
+            table = Table(show_header=True)
+            table.add_column("Document", style="cyan")
+            table.add_column("Status")
+            table.add_column("Because of")
+            for r in stale + untracked:
+                if r["status"] == "stale":
+                    reasons = r["changed"] + [f"+{i}" for i in r["added"]] + [f"-{i}" for i in r["removed"]]
+                    reasons += [f"via {i}" for i in r["upstream"] if i not in r["changed"]]
+                    table.add_row(r["document"], "[red]stale[/red]", ", ".join(reasons))
+                else:
+                    table.add_row(r["document"], "[yellow]untracked[/yellow]", "[dim]no recorded provenance[/dim]")
+            console.print(table)
+        console.print(
+            f"[dim]{len(results)} derived document(s): {len(stale)} stale, {len(untracked)} untracked, "
+            f"{len(results) - len(stale) - len(untracked)} fresh[/dim]"
+        )
+        if untracked:
+            console.print("[dim]Record a baseline with: specify stale --record-all[/dim]")
+    if strict and stale:
+        raise typer.Exit(1)
@@ -0,0 +1,149 @@
+"""
+Stats command implementation for Specify CLI.
+
+This module contains the logic for reporting the local performance ledger:
+per-step percentiles of recorded ``specify init`` runs and regressions
+against a rolling baseline.
+"""
+
+import json
+import time
+from datetime import datetime
+from typing import Optional
+
+import typer
+from rich.table import Table
+
+from ..ui import console
+from ..tools.journal import STEPS
+from ..tools.ledger import (
+    DEFAULT_BASELINE,
+    DEFAULT_RECENT,
+    DEFAULT_THRESHOLD,
+    MIN_BASELINE_SAMPLES,
+    PerfLedger,
+    find_regression,
+    percentile,
+    step_series,
+)
+
+# Rows of the report, in pipeline order
+REPORTED_STEPS = ("total",) + STEPS
+
+
+def _step_order(label: str):
+    name = label.split(" ")[0]
+    return REPORTED_STEPS.index(name), label
+
+
+def stats_command(
+    recent: int = DEFAULT_RECENT,
+    baseline: int = DEFAULT_BASELINE,
+    threshold: float = DEFAULT_THRESHOLD,
+    days: Optional[float] = None,
+    as_json: bool = False,
+    strict: bool = False,
+    clear: bool = False,
+) -> None:
+    """Print step percentiles and regressions; ``strict`` exits 1 when a step regressed."""
+    if recent < 1 or baseline < 1 or threshold <= 1:
+        console.print("[red]Error:[/red] --recent and --baseline must be at least 1 and --threshold above 1")
+        raise typer.Exit(1)
+    ledger = PerfLedger()
+    try:
+        if clear:
+            removed = ledger.clear()
+            console.print(f"[green]Removed {removed} recorded run(s)[/green] [dim]({ledger.db_path})[/dim]")
+            return
+        runs = ledger.runs("init", since=time.time() - days * 86400 if days else None)
+    finally:
+        ledger.close()
+
+    series = step_series(runs)
+    steps = []
+    for label in sorted((l for l in series if l.split(" ")[0] in REPORTED_STEPS), key=_step_order):
+        samples = series[label]
+        values = [s["seconds"] for s in samples]
+        steps.append({
+            "step": label,
+            "runs": len(values),
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p99": percentile(values, 99),
+            "max": max(values),
+            "regression": find_regression(samples, recent=recent, baseline=baseline, threshold=threshold),
+        })
+    ok_runs = [r for r in runs if r["status"] == "ok"]
+    downloads = [r for r in ok_runs if r["cache"] in ("hit", "miss")]
+    summary = {
+        "runs": len(runs),
+        "failed": sum(1 for r in runs if r["status"] == "error"),
+        "resumed": sum(1 for r in runs if r["status"] == "resumed"),
+        "first": runs[0]["at"] if runs else None,
+        "last": runs[-1]["at"] if runs else None,
+        "latest_release": next((r["release"] for r in reversed(runs) if r["release"]), None),
+        "cache_hit_rate": sum(1 for r in downloads if r["cache"] == "hit") / len(downloads) if downloads else None,
+        "median_bytes": percentile([r["bytes"] for r in ok_runs if r["bytes"] is not None], 50) if ok_runs else None,
+        "median_files": percentile([r["files"] for r in ok_runs if r["files"] is not None], 50) if ok_runs else None,
+    }
+    regressions = [s for s in steps if s["regression"]]
+
+    if as_json:
+        print(json.dumps({"summary": summary, "steps": steps}, indent=2))
+    elif not runs:
+        console.print("[yellow]No recorded runs yet.[/yellow] Every 'specify init' adds one (unless SPECIFY_NO_LEDGER is set).")
+    else:
+        _print_report(summary, steps, recent, baseline)
+
+    if strict and regressions:
+        raise typer.Exit(1)
+
+
+def _print_report(summary, steps, recent: int, baseline: int) -> None:
+    first = datetime.fromtimestamp(summary["first"]).strftime("%Y-%m-%d %H:%M")
+    last = datetime.fromtimestamp(summary["last"]).strftime("%Y-%m-%d %H:%M")
+    details = [f"{summary['runs']} init run(s) from {first} to {last}"]
+    if summary["failed"] or summary["resumed"]:
+        details.append(f"{summary['failed']} failed, {summary['resumed']} resumed (not in the timings)")
+    if summary["latest_release"]:
+        details.append(f"latest release {summary['latest_release']}")
+    console.print(f"[cyan]{'; '.join(details)}[/cyan]")
+    facts = []
+    if summary["cache_hit_rate"] is not None:
+        facts.append(f"cache hits {summary['cache_hit_rate']:.0%}")
+    if summary["median_bytes"] is not None:
+        facts.append(f"median {summary['median_bytes']:,.0f} bytes transferred")
+    if summary["median_files"] is not None:
+        facts.append(f"median {summary['median_files']:,.0f} files")
+    if facts:
+        console.print(f"[dim]{', '.join(facts)}[/dim]")
+
+    table = Table(show_header=True)
+    table.add_column("Step", style="cyan")
+    table.add_column("Runs", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p90", justify="right")
+    table.add_column("p99", justify="right")
+    table.add_column("Max", justify="right")
+    table.add_column(f"Last {recent} vs previous {baseline}")
+    for step in steps:
+        regression = step["regression"]
+        if regression:
+            trend = (f"[red]{regression['baseline_p50']:.3f}s → {regression['recent_p50']:.3f}s "
+                     f"(+{regression['ratio'] - 1:.0%})[/red]")
+        else:
+            trend = "[dim]ok[/dim]" if step["runs"] >= recent + MIN_BASELINE_SAMPLES else "[dim]too few runs[/dim]"
+        table.add_row(step["step"], str(step["runs"]), f"{step['p50']:.3f}s", f"{step['p90']:.3f}s",
+                      f"{step['p99']:.3f}s", f"{step['max']:.3f}s", trend)
+    console.print(table)
+
+    for step in steps:
+        regression = step["regression"]
+        if not regression:
+            continue
+        line = (f"[red]Regression:[/red] {step['step']} median {regression['recent_p50']:.3f}s over the last "
+                f"{regression['recent_runs']} runs vs {regression['baseline_p50']:.3f}s over the {regression['baseline_runs']} before")
+        console.print(line)
+        for field, change in regression["changes"].items():
+            was = ", ".join(change["baseline"]) or "(none)"
+            console.print(f"  [yellow]{field} changed:[/yellow] {was} → {', '.join(change['recent'])}")
@@ -0,0 +1,49 @@
+"""
+Sync command implementation for Specify CLI.
+
+This module contains the logic for pushing edits made in a local template
+checkout into a project created with ``specify init --template-dir``.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.markup import escape
+
+from ..ui import console
+from ..tools.render import RenderError
+from ..tools.sync import sync_project
+
+CHANGE_STYLES = {"updated": "cyan", "added": "green", "removed": "red", "kept": "yellow"}
+
+
+def sync_command(
+    repo: Optional[Path] = None,
+    template_dir: Optional[Path] = None,
+    dry_run: bool = False,
+    force: bool = False,
+) -> None:
+    """Write the template files that changed in the checkout into ``repo``."""
+    repo = repo or Path.cwd()
+    try:
+        result = sync_project(repo, template_dir, dry_run=dry_run, force=force)
+    except (OSError, ValueError) as e:
+        prefix = "Cannot render templates" if isinstance(e, RenderError) else "Error"
+        console.print(f"[red]{prefix}:[/red] {escape(str(e))}")
+        raise typer.Exit(1)
+
+    elapsed = f"{result['seconds'] * 1000:.0f} ms"
+    if result["unchanged"]:
+        console.print(f"[green]Up to date[/green] [dim](no file in {escape(result['template_dir'])} changed since the last sync, {elapsed})[/dim]")
+        return
+
+    for change, style in CHANGE_STYLES.items():
+        for rel in result[change]:
+            note = " [dim](edited locally; --force overwrites)[/dim]" if change == "kept" else ""
+            console.print(f"  [{style}]{change:<8}[/{style}] {escape(rel)}{note}")
+    for warning in result["warnings"]:
+        console.print(f"[yellow]Warning:[/yellow] {escape(warning)}")
+    counts = [f"{len(result[change])} {change}" for change in CHANGE_STYLES if result[change]]
+    summary = ", ".join(counts) if counts else "no template output changed"
+    console.print(f"{'[dim](dry run)[/dim] ' if dry_run else ''}Synced from {escape(result['template_dir'])}: {summary} [dim]({elapsed})[/dim]")
@@ -0,0 +1,94 @@
+"""
+Trace command implementation for Specify CLI.
+
+This module contains the logic for reporting requirement-to-task coverage
+for one feature or the whole repository.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.table import Table
+
+from ..ui import console
+from ..project.paths import find_repo_root, is_feature_branch, read_current_branch
+from ..project.trace import TraceIndex
+
+
+def _ids(values, limit: int = 6) -> str:
+    if not values:
+        return "[green]-[/green]"
+    shown = ", ".join(values[:limit])
+    return shown + (f" (+{len(values) - limit})" if len(values) > limit else "")
+
+
+def trace_command(
+    feature: Optional[str] = None,
+    all_features: bool = False,
+    repo: Optional[Path] = None,
+    as_json: bool = False,
+    strict: bool = False,
+) -> None:
+    """Print uncovered requirements and orphan tasks; ``strict`` exits 1 when any are found."""
+    repo_root = find_repo_root(repo)
+    if repo_root is None:
+        console.print(f"[red]Error:[/red] Not inside a git repository: {repo or Path.cwd()}")
+        raise typer.Exit(1)
+
+    if feature is None and not all_features:
+        branch = read_current_branch(repo_root)
+        if is_feature_branch(branch):
+            feature = branch
+        else:
+            all_features = True
+
+    started = time.perf_counter()
+    index = TraceIndex(repo_root)
+    if all_features:
+        reports = [r for r in index.features() if r["has_spec"] or r["has_tasks"]]
+    else:
+        feature_dir = repo_root / "specs" / feature
+        if not feature_dir.is_dir():
+            console.print(f"[red]Error:[/red] Feature directory not found: {feature_dir}")
+            raise typer.Exit(1)
+        reports = [index.feature(feature_dir)]
+    index.save()
+    elapsed = time.perf_counter() - started
+
+    problems = sum(len(r["uncovered"]) + len(r["orphan_tasks"]) for r in reports)
+    if as_json:
+        print(json.dumps({
+            "features": reports,
+            "index": {"stat_hits": index.stat_hits, "hash_hits": index.hash_hits, "parsed": index.parsed},
+            "seconds": round(elapsed, 4),
+        }, ensure_ascii=False))
+    else:
+        table = Table(show_header=True)
+        table.add_column("Feature", style="cyan")
+        table.add_column("FRs", justify="right")
+        table.add_column("Tasks", justify="right")
+        table.add_column("Uncovered")
+        table.add_column("No test task")
+        table.add_column("Orphan tasks")
+        for r in reports:
+            table.add_row(
+                r["feature"],
+                str(r["requirements"]),
+                str(r["tasks"]),
+                _ids(r["uncovered"]),
+                _ids(r["untested"]),
+                _ids(r["orphan_tasks"]),
+            )
+        console.print(table)
+        for r in reports:
+            for ref in r["unknown_references"]:
+                console.print(f"[yellow]{r['feature']}: {ref['task']} references undefined {ref['requirement']}[/yellow]")
+        console.print(
+            f"[dim]{len(reports)} feature(s) in {elapsed * 1000:.1f} ms "
+            f"(index: {index.stat_hits} unchanged, {index.hash_hits} rehashed, {index.parsed} parsed)[/dim]"
+        )
+    if strict and problems:
+        raise typer.Exit(1)
@@ -0,0 +1,58 @@
+"""
+Agent context file layout inspection for Specify CLI.
+
+Provider-side prompt caching only reuses the longest unchanged *prefix* of
+a prompt. ``update-agent-context`` can write CLAUDE.md/GEMINI.md/... in a
+"stable" layout where everything that changes between updates (recent
+changes, the last-updated date) sits after a ``<!-- STABLE PREFIX END -->``
+marker. This module reports how many leading bytes of each agent file are
+stable, so the effect of the layout can be checked.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, List
+
+from .context import estimate_tokens
+
+STABLE_PREFIX_MARKER = b"<!-- STABLE PREFIX END -->"
+
+# Same files update-agent-context.sh maintains
+AGENT_CONTEXT_FILES = {
+    "claude": "CLAUDE.md",
+    "gemini": "GEMINI.md",
+    "copilot": ".github/copilot-instructions.md",
+    "cursor": ".cursor/rules/specify-rules.mdc",
+}
+
+# First volatile bytes of a classic-layout file: the last-updated date
+_CLASSIC_VOLATILE_RE = re.compile(r"(Last updated: |最后更新：)\d{4}-\d{2}-\d{2}".encode("utf-8"))
+
+
+def stable_prefix_length(data: bytes) -> int:
+    """Number of leading bytes that do not change between context updates."""
+    index = data.find(STABLE_PREFIX_MARKER)
+    if index >= 0:
+        return index
+    match = _CLASSIC_VOLATILE_RE.search(data)
+    return match.start() if match else len(data)
+
+
+def describe_agent_file(path: Path) -> Dict:
+    """Layout, size and stable-prefix details for one agent context file."""
+    data = Path(path).read_bytes()
+    prefix = data[:stable_prefix_length(data)]
+    return {
+        "file": str(path),
+        "layout": "stable" if STABLE_PREFIX_MARKER in data else "classic",
+        "bytes": len(data),
+        "stable_bytes": len(prefix),
+        "stable_tokens": estimate_tokens(prefix.decode("utf-8", errors="replace")),
+        "stable_sha256": hashlib.sha256(prefix).hexdigest()[:16],
+    }
+
+
+def find_agent_files(repo_root: Path) -> List[Path]:
+    """Agent context files present in a repository."""
+    return [repo_root / rel for rel in AGENT_CONTEXT_FILES.values() if (repo_root / rel).is_file()]
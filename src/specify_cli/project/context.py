@@ -0,0 +1,228 @@
+"""
+Token-budgeted context packing for Specify CLI.
+
+A feature's design artifacts (spec.md, plan.md, data-model.md, contracts/,
+research.md, quickstart.md, tasks.md) are split into markdown sections,
+each with an estimated token count. Sections are ranked by how relevant
+they are to the slash command being run (``plan``, ``tasks`` or
+``implement``) plus an optional free-text query, and packed greedily under
+a token budget. Everything that did not fit is listed in a manifest so an
+agent can still open the source file when it needs a cut section.
+
+Section splits are cached per user, keyed by the SHA-256 of the file
+contents, so unchanged artifacts are never re-parsed.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..tools.cache import get_cache_dir
+from .mdindex import MarkdownIndex
+
+CACHE_VERSION = 1
+
+STAGES = ["plan", "tasks", "implement"]
+
+# Per-stage weight of each artifact (``contracts/`` covers every file in the directory)
+STAGE_WEIGHTS = {
+    "plan": {
+        "spec.md": 1.0, "plan.md": 0.9, "research.md": 0.7, "data-model.md": 0.6,
+        "contracts/": 0.5, "quickstart.md": 0.5, "tasks.md": 0.2,
+    },
+    "tasks": {
+        "plan.md": 1.0, "data-model.md": 0.9, "contracts/": 0.9, "quickstart.md": 0.7,
+        "research.md": 0.5, "spec.md": 0.4, "tasks.md": 0.3,
+    },
+    "implement": {
+        "tasks.md": 1.0, "plan.md": 0.9, "data-model.md": 0.8, "contracts/": 0.8,
+        "quickstart.md": 0.6, "research.md": 0.5, "spec.md": 0.4,
+    },
+}
+
+# Headings that carry the decisions agents need (boosted) and template scaffolding (demoted)
+KEY_HEADINGS = (
+    "technical context", "summary", "requirements", "entities", "project structure",
+    "user scenarios", "acceptance", "decision", "endpoints", "phase 3", "constraints",
+    "技术上下文", "摘要", "需求", "实体", "项目结构", "用户场景", "验收", "决策",
+)
+BOILERPLATE_HEADINGS = (
+    "execution flow", "progress tracking", "review & acceptance checklist",
+    "complexity tracking", "quick guidelines", "validation checklist",
+    "执行流程", "进度跟踪", "审查与验收清单", "复杂性跟踪", "快速指南", "验证清单",
+)
+
+_CJK_RE = re.compile("[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]")
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9_\-]{2,}")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate: ~4 characters per token, one token per CJK character."""
+    cjk = len(_CJK_RE.findall(text))
+    other = len(text) - cjk
+    return cjk + (other + 3) // 4
+
+
+def split_sections(text: Union[str, bytes]) -> List[Dict]:
+    """Split markdown into heading-delimited sections (headings inside code fences are ignored).
+
+    Each section is a dict with ``heading``, ``level``, ``path`` (ancestor
+    headings below the document title joined by `` > ``), ``start``/``end`` line numbers (1-based,
+    inclusive), ``text`` and ``tokens``. Text before the first heading becomes
+    a level-0 ``(preamble)`` section when it is not blank.
+    """
+    data = text.encode("utf-8") if isinstance(text, str) else text
+    return [
+        {
+            "heading": s["heading"],
+            "level": s["level"],
+            "path": s["path"],
+            "start": s["start"],
+            "end": s["end"],
+            "text": s["text"],
+            "tokens": estimate_tokens(s["text"]),
+        }
+        for s in MarkdownIndex.from_bytes(data).sections_with_text()
+    ]
+
+
+class SectionCache:
+    """Section splits keyed by content hash under ``<cache>/context``."""
+
+    def __init__(self, root: Path = None):
+        self.root = Path(root) if root else get_cache_dir() / "context"
+        self.hits = 0
+        self.misses = 0
+
+    def sections_for(self, data: bytes) -> List[Dict]:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.root / f"v{CACHE_VERSION}" / digest[:2] / f"{digest}.json"
+        try:
+            sections = json.loads(path.read_text(encoding="utf-8"))
+            self.hits += 1
+            return sections
+        except (OSError, ValueError):
+            pass
+        self.misses += 1
+        sections = split_sections(data)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(sections, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass  # The cache is an optimisation only
+        return sections
+
+
+def iter_artifacts(feature_dir: Path) -> List[Tuple[str, str, Path]]:
+    """Return ``(weight_key, relative_name, path)`` for every artifact present in a feature directory."""
+    artifacts = []
+    for name in ("spec.md", "plan.md", "research.md", "data-model.md", "quickstart.md", "tasks.md"):
+        path = feature_dir / name
+        if path.is_file():
+            artifacts.append((name, name, path))
+    contracts = feature_dir / "contracts"
+    if contracts.is_dir():
+        for path in sorted(p for p in contracts.rglob("*") if p.is_file()):
+            artifacts.append(("contracts/", path.relative_to(feature_dir).as_posix(), path))
+    return artifacts
+
+
+def query_terms(query: Optional[str]) -> List[str]:
+    if not query:
+        return []
+    return sorted(set(_WORD_RE.findall(query.lower())) | set(_CJK_RE.findall(query)))
+
+
+def score_section(section: Dict, weight: float, index: int, terms: List[str]) -> float:
+    """Relevance of one section: artifact weight, heading boosts, position and query overlap."""
+    heading = section["path"].lower()
+    score = weight
+    if any(key in heading for key in KEY_HEADINGS):
+        score *= 1.5
+    if any(key in heading for key in BOILERPLATE_HEADINGS):
+        score *= 0.3
+    # Earlier sections of a document tend to frame the rest
+    score *= 1.0 - 0.02 * min(index, 10)
+    if terms:
+        body = section["text"].lower()
+        matched = sum(1 for term in terms if term in body)
+        score *= 1.0 + 2.0 * matched / len(terms)
+    return round(score, 4)
+
+
+def pack_context(
+    feature_dir: Path,
+    budget: int,
+    stage: str = "tasks",
+    query: Optional[str] = None,
+    cache: Optional[SectionCache] = None,
+) -> Tuple[str, Dict]:
+    """Build a context pack for ``feature_dir`` under ``budget`` tokens.
+
+    Returns ``(pack_markdown, manifest)``. The manifest lists included and cut
+    sections with their source file, heading, line range, tokens and score.
+    """
+    if stage not in STAGE_WEIGHTS:
+        raise ValueError(f"Unknown stage '{stage}'. Choose from: {', '.join(STAGES)}")
+    feature_dir = Path(feature_dir)
+    cache = cache or SectionCache()
+    weights = STAGE_WEIGHTS[stage]
+    terms = query_terms(query)
+
+    candidates = []
+    for order, (key, name, path) in enumerate(iter_artifacts(feature_dir)):
+        weight = weights.get(key, 0.3)
+        for index, section in enumerate(cache.sections_for(path.read_bytes())):
+            candidates.append({
+                "file": name,
+                "heading": section["path"],
+                "lines": [section["start"], section["end"]],
+                "tokens": section["tokens"],
+                "score": score_section(section, weight, index, terms),
+                "_order": (-weight, order, index),
+                "_text": section["text"],
+            })
+
+    header_tokens = 40  # Pack title and per-section source comments
+    used = header_tokens
+    included, cut = [], []
+    for candidate in sorted(candidates, key=lambda c: (-c["score"], c["_order"])):
+        cost = candidate["tokens"] + 12
+        if used + cost <= budget:
+            used += cost
+            included.append(candidate)
+        else:
+            cut.append(dict(candidate, reason="budget"))
+
+    # Emit in reading order: most relevant artifact first, sections in document order
+    included.sort(key=lambda c: c["_order"])
+    parts = [
+        f"# Context pack: {feature_dir.name} ({stage})\n\n",
+        f"Budget: {budget} tokens, used ~{used}. {len(cut)} section(s) cut; see the manifest to open them from source.\n",
+    ]
+    for candidate in included:
+        start, end = candidate["lines"]
+        parts.append(f"\n<!-- source: {candidate['file']} lines {start}-{end} -->\n")
+        parts.append(candidate["_text"].rstrip("\n") + "\n")
+
+    def public(entry: Dict) -> Dict:
+        return {k: v for k, v in entry.items() if not k.startswith("_")}
+
+    cut.sort(key=lambda c: -c["score"])
+    manifest = {
+        "feature_dir": str(feature_dir),
+        "stage": stage,
+        "query": query,
+        "budget": budget,
+        "used_tokens": used,
+        "total_tokens": header_tokens + sum(c["tokens"] + 12 for c in candidates),
+        "included": [public(c) for c in included],
+        "cut": [public(c) for c in cut],
+        "cache": {"hits": cache.hits, "misses": cache.misses},
+    }
+    return "".join(parts), manifest
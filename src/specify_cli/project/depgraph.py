@@ -0,0 +1,197 @@
+"""
+Document dependency graph for Specify CLI.
+
+Derived documents are produced from other documents: a feature's plan.md
+from its spec.md and the constitution, tasks.md from the plan and design
+artifacts, agent files (CLAUDE.md, ...) from every plan, and the templates
+and command files listed in ``constitution_update_checklist.md`` from the
+constitution. When a derived document is (re)generated its inputs' SHA-256
+hashes are recorded in ``.specify/provenance.json``; ``specify stale`` then
+compares them with the current inputs and lists exactly which documents
+need regenerating.
+
+Paths under ``memory/`` and ``templates/`` resolve to ``.specify/memory``
+and ``.specify/templates`` in initialized projects.
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROVENANCE_FILE = ".specify/provenance.json"
+PROVENANCE_VERSION = 1
+
+CONSTITUTION = "memory/constitution.md"
+
+# Derived document → inputs; ``{feature}`` expands to every directory under specs/
+FEATURE_RULES = [
+    ("specs/{feature}/plan.md", [
+        "specs/{feature}/spec.md",
+        CONSTITUTION,
+        "templates/plan-template.md",
+    ]),
+    ("specs/{feature}/tasks.md", [
+        "specs/{feature}/plan.md",
+        "specs/{feature}/research.md",
+        "specs/{feature}/data-model.md",
+        "specs/{feature}/quickstart.md",
+        "specs/{feature}/contracts/*",
+        "templates/tasks-template.md",
+    ]),
+]
+
+# Agent context files are rebuilt from the plans by update-agent-context
+AGENT_FILES = ["CLAUDE.md", "GEMINI.md", ".github/copilot-instructions.md", ".cursor/rules/specify-rules.mdc"]
+
+# Documents constitution_update_checklist.md says must follow constitution amendments
+CONSTITUTION_DEPENDENTS = [
+    "templates/plan-template.md",
+    "templates/spec-template.md",
+    "templates/tasks-template.md",
+    ".claude/commands/plan.md",
+    ".claude/commands/tasks.md",
+    ".gemini/commands/plan.toml",
+    ".gemini/commands/tasks.toml",
+    ".github/prompts/plan.prompt.md",
+    ".github/prompts/tasks.prompt.md",
+    ".cursor/commands/plan.md",
+    ".cursor/commands/tasks.md",
+]
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DependencyGraph:
+    """Dependency rules expanded against one repository, plus recorded provenance."""
+
+    def __init__(self, repo_root: Path):
+        self.repo_root = Path(repo_root).resolve()
+        self.provenance_path = self.repo_root / PROVENANCE_FILE
+        try:
+            data = json.loads(self.provenance_path.read_text(encoding="utf-8"))
+            self.records: Dict[str, Dict] = data["documents"] if data.get("version") == PROVENANCE_VERSION else {}
+        except (OSError, ValueError, KeyError):
+            self.records = {}
+        self._hashes: Dict[str, Optional[str]] = {}
+
+    def resolve(self, rel: str) -> str:
+        """Map ``memory/...``/``templates/...`` to ``.specify/...`` when the project has them there."""
+        if rel.startswith(("memory/", "templates/")) and (self.repo_root / ".specify" / rel.split("/", 1)[0]).is_dir():
+            return f".specify/{rel}"
+        return rel
+
+    def _expand(self, pattern: str) -> List[str]:
+        """Existing files matching a repository-relative pattern (``*`` only in the last component)."""
+        rel = self.resolve(pattern)
+        if "*" not in rel:
+            return [rel] if (self.repo_root / rel).is_file() else []
+        directory, name = rel.rsplit("/", 1)
+        try:
+            entries = sorted(os.listdir(self.repo_root / directory))
+        except OSError:
+            return []
+        return [f"{directory}/{e}" for e in entries if fnmatch.fnmatch(e, name) and (self.repo_root / directory / e).is_file()]
+
+    def features(self) -> List[str]:
+        specs = self.repo_root / "specs"
+        if not specs.is_dir():
+            return []
+        return sorted(e.name for e in os.scandir(specs) if e.is_dir())
+
+    def rules(self, feature: Optional[str] = None) -> Dict[str, List[str]]:
+        """Every existing derived document mapped to its (existing) input files."""
+        graph: Dict[str, List[str]] = {}
+        features = [feature] if feature else self.features()
+        for name in features:
+            for derived, inputs in FEATURE_RULES:
+                target = derived.format(feature=name)
+                if (self.repo_root / target).is_file():
+                    graph[target] = sorted({f for p in inputs for f in self._expand(p.format(feature=name))})
+        if feature is None:
+            constitution = self._expand(CONSTITUTION)
+            plans = [f"specs/{name}/plan.md" for name in features if (self.repo_root / "specs" / name / "plan.md").is_file()]
+            for agent_file in AGENT_FILES:
+                if (self.repo_root / agent_file).is_file():
+                    graph[agent_file] = sorted(set(plans + constitution))
+            for dependent in CONSTITUTION_DEPENDENTS:
+                for target in self._expand(dependent):
+                    graph.setdefault(target, [])
+                    graph[target] = sorted(set(graph[target] + constitution))
+        return graph
+
+    def sha(self, rel: str) -> Optional[str]:
+        if rel not in self._hashes:
+            try:
+                self._hashes[rel] = file_sha256(self.repo_root / rel)
+            except OSError:
+                self._hashes[rel] = None
+        return self._hashes[rel]
+
+    def status(self, feature: Optional[str] = None) -> List[Dict]:
+        """Freshness of every derived document: ``fresh``, ``stale`` or ``untracked``.
+
+        A document is stale when an input's hash differs from the recorded one,
+        an input was added or removed, or an input is itself stale (``upstream``).
+        """
+        results = []
+        for target, inputs in sorted(self.rules(feature).items()):
+            record = self.records.get(target)
+            entry = {"document": target, "inputs": inputs, "changed": [], "added": [], "removed": [], "upstream": []}
+            if record is None:
+                entry["status"] = "untracked"
+            else:
+                recorded = record["inputs"]
+                entry["changed"] = [i for i in inputs if i in recorded and recorded[i] != self.sha(i)]
+                entry["added"] = [i for i in inputs if i not in recorded]
+                entry["removed"] = [i for i in recorded if i not in inputs]
+                stale = entry["changed"] or entry["added"] or entry["removed"]
+                entry["status"] = "stale" if stale else "fresh"
+                # The document itself was edited after it was recorded (informational)
+                entry["edited"] = record.get("sha256") != self.sha(target)
+            results.append(entry)
+        # Anything built from a stale document will be regenerated too
+        by_name = {r["document"]: r for r in results}
+        changed = True
+        while changed:
+            changed = False
+            for entry in results:
+                upstream = [i for i in entry["inputs"] if i in by_name and by_name[i]["status"] == "stale"]
+                if upstream and entry["status"] == "fresh":
+                    entry["status"] = "stale"
+                    changed = True
+                entry["upstream"] = upstream
+        return results
+
+    def record(self, targets: List[str]) -> List[str]:
+        """Record the current input hashes for derived documents; returns the ones recorded."""
+        graph = self.rules()
+        recorded = []
+        for target in targets:
+            if target not in graph:
+                continue
+            self.records[target] = {
+                "sha256": self.sha(target),
+                "inputs": {i: self.sha(i) for i in graph[target]},
+            }
+            recorded.append(target)
+        return recorded
+
+    def relative(self, path: Path) -> str:
+        """Repository-relative POSIX path for a user-supplied path."""
+        return Path(os.path.relpath(Path(path).resolve(), self.repo_root)).as_posix()
+
+    def save(self) -> None:
+        self.provenance_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": PROVENANCE_VERSION, "documents": dict(sorted(self.records.items()))}
+        tmp = self.provenance_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp, self.provenance_path)
@@ -0,0 +1,61 @@
+"""
+Project manifest for Specify CLI.
+
+``specify init`` records how a project was set up in ``.specify/project.json``:
+the agents, script type and language, the template release and how the
+files were obtained (``render``, ``variant`` zip, offline ``bundle``, or
+``source`` for a local template checkout, whose path is kept for ``specify sync``).
+Rendered projects also list the SHA-256 of every generated file, so later
+updates can tell untouched template files from ones the user edited.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MANIFEST_FILE = ".specify/project.json"
+MANIFEST_VERSION = 1
+
+
+def read_manifest(project_path: Path) -> Optional[Dict]:
+    """The project's manifest, or None when missing or unreadable."""
+    try:
+        data = json.loads((Path(project_path) / MANIFEST_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if data.get("version") == MANIFEST_VERSION else None
+
+
+def write_manifest(
+    project_path: Path,
+    *,
+    agents: List[str],
+    script_type: str,
+    language: str,
+    release: Optional[str],
+    method: str,
+    files: Optional[Dict[str, str]] = None,
+    source: Optional[Dict[str, str]] = None,
+) -> Path:
+    """Write ``.specify/project.json`` atomically and return its path."""
+    path = Path(project_path) / MANIFEST_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "version": MANIFEST_VERSION,
+        "agents": agents,
+        "script": script_type,
+        "language": language,
+        "release": release,
+        "method": method,
+        "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    if source is not None:
+        data["source"] = source
+    if files is not None:
+        data["files"] = dict(sorted(files.items()))
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,230 @@
+"""
+Markdown section index for Specify CLI.
+
+One pass over a markdown file (memory-mapped, so it is never read into a
+single Python string) records every heading with its byte offset and line
+number, the YAML-style frontmatter, and the ``**Key**: value`` fields that
+plans use for their Technical Context (the same lines
+``update-agent-context`` greps for). Headings and fields inside code
+fences are ignored.
+
+Consumers then decode only what they need: ``RepoState`` reads plan
+fields straight from the field table, and ``specify query section`` reads
+a single section of a multi-megabyte ``research.md`` with one seek.
+``index_markdown`` keeps recent indexes in memory, keyed by path and
+``(mtime_ns, size)``, so a warm daemon re-scans a file only after it
+changes. ``split_sections`` in ``context`` builds on the same scanner.
+
+Lines are split on ``\\n`` only; ``\\r\\n`` files work, other Unicode line
+separators are treated as ordinary characters.
+"""
+
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+# Indexes kept by index_markdown (least recently used dropped first)
+MAX_CACHED_INDEXES = 256
+
+# One alternation per interesting line kind, matched against the raw bytes
+_LINE_BODY = (
+    rb"(?:(?P<fence>[^\S\n]*(?:```|~~~))"
+    rb"|(?P<hashes>#{1,6})(?:[^\S\n]|\xe3\x80\x80)+(?P<heading>[^\n]+?)[^\S\n]*#*[^\S\n]*$"
+    rb"|\*\*(?P<key>[^*\n]+)\*\*:[^\S\n]*(?P<value>[^\n]*?)[^\S\n]*$)"
+)
+_FIRST_LINE_RE = re.compile(rb"^" + _LINE_BODY, re.MULTILINE)
+# Leading with a literal newline lets the regex engine jump between lines (several times faster than ^)
+_NEXT_LINE_RE = re.compile(rb"\n" + _LINE_BODY, re.MULTILINE)
+_FRONTMATTER_START_RE = re.compile(rb"\A---[^\S\n]*\n")
+_FRONTMATTER_END_RE = re.compile(rb"^(?:---|\.\.\.)[^\S\n]*$", re.MULTILINE)
+_HEADING_LINE_RE = re.compile(rb"^#{1,6}[^\S\n]", re.MULTILINE)
+_FRONTMATTER_FIELD_RE = re.compile(rb"^(?P<key>[A-Za-z0-9_][\w.-]*)[^\S\n]*:[^\S\n]*(?P<value>[^\n]*?)[^\S\n]*$", re.MULTILINE)
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+def _iter_lines(buf: Buffer, start: int):
+    """``(line_offset, match)`` for every fence, heading and field line from ``start`` (a line start)."""
+    first = _FIRST_LINE_RE.match(buf, start)
+    if first is not None:
+        yield start, first
+    for match in _NEXT_LINE_RE.finditer(buf, start):
+        yield match.start() + 1, match
+
+
+class FileChangedError(ValueError):
+    """The file no longer matches the index it is being read through."""
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace")
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+    return value
+
+
+class MarkdownIndex:
+    """Heading/byte-offset index, frontmatter and ``**Key**: value`` fields of one markdown document.
+
+    ``sections`` are dicts with ``heading``, ``level``, ``path`` (ancestor
+    headings below the document title joined by `` > ``), ``start``/``end``
+    line numbers (1-based, inclusive) and the ``offset``/``length`` of the
+    section's bytes, heading line included. Text before the first heading is
+    a level-0 ``(preamble)`` section when it is not blank. ``fields`` are
+    dicts with ``key``, ``value``, ``line`` and the ``section`` path.
+    """
+
+    def __init__(self, path: Optional[Path] = None, data: Optional[bytes] = None):
+        self.path = Path(path) if path is not None else None
+        self.key: Optional[Tuple[int, int]] = None
+        self.sections: List[Dict] = []
+        self.fields: List[Dict] = []
+        self.frontmatter: Dict[str, str] = {}
+        self.size = 0
+        self._data = data
+        if data is not None:
+            self._scan(data)
+            return
+        with open(self.path, "rb") as f:
+            st = os.fstat(f.fileno())
+            self.key = (st.st_mtime_ns, st.st_size)
+            if st.st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                self._scan(buf)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "MarkdownIndex":
+        return cls(data=bytes(data))
+
+    def _scan(self, buf: Buffer) -> None:
+        size = len(buf)
+        self.size = size
+        body_start = self._scan_frontmatter(buf)
+        stack: List[Tuple[int, str]] = []
+        section = {"heading": "(preamble)", "level": 0, "path": "(preamble)", "start": 1, "offset": 0}
+        line, counted_to = 1, 0
+        in_fence = False
+
+        def close(end_offset: int, end_line: int) -> None:
+            length = end_offset - section["offset"]
+            if section["level"] == 0 and not buf[section["offset"]:end_offset].strip():
+                return
+            self.sections.append(dict(section, end=end_line, length=length))
+
+        for pos, match in _iter_lines(buf, body_start):
+            line += buf[counted_to:pos].count(b"\n")
+            counted_to = pos
+            if match.group("fence") is not None:
+                in_fence = not in_fence
+                continue
+            if in_fence:
+                continue
+            if match.group("hashes") is not None:
+                close(pos, line - 1)
+                level, heading = len(match.group("hashes")), _decode(match.group("heading")).strip()
+                while stack and stack[-1][0] >= level:
+                    stack.pop()
+                stack.append((level, heading))
+                section = {
+                    "heading": heading,
+                    "level": level,
+                    # The document title (level 1) is left out of nested paths to keep them short
+                    "path": " > ".join(h for lvl, h in stack if lvl > 1 or lvl == level),
+                    "start": line,
+                    "offset": pos,
+                }
+            else:
+                self.fields.append({
+                    "key": _decode(match.group("key")).strip(),
+                    "value": _decode(match.group("value")),
+                    "line": line,
+                    "section": section["path"],
+                })
+        total_lines = line + buf[counted_to:size].count(b"\n")
+        if size and buf[size - 1:size] == b"\n":
+            total_lines -= 1
+        close(size, total_lines)
+
+    def _scan_frontmatter(self, buf: Buffer) -> int:
+        """Parse a leading ``---`` block (flat ``key: value`` pairs); returns the offset after it."""
+        start = _FRONTMATTER_START_RE.match(buf)
+        if start is None:
+            return 0
+        end = _FRONTMATTER_END_RE.search(buf, start.end())
+        if end is None:
+            return 0
+        block = buf[start.end():end.start()]
+        # A document that merely opens with a thematic break keeps its headings
+        if _FRONTMATTER_FIELD_RE.search(block) is None or _HEADING_LINE_RE.search(block) is not None:
+            return 0
+        for match in _FRONTMATTER_FIELD_RE.finditer(block):
+            key = _decode(match.group("key"))
+            if key not in self.frontmatter:
+                self.frontmatter[key] = _unquote(_decode(match.group("value")))
+        newline = buf.find(b"\n", end.end())
+        return newline + 1 if newline >= 0 else len(buf)
+
+    def field(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Value of the first ``**key**: value`` line."""
+        for entry in self.fields:
+            if entry["key"] == key:
+                return entry["value"]
+        return default
+
+    def find(self, heading: str) -> List[Dict]:
+        """Sections whose heading or heading path is ``heading`` (case-insensitive), in document order."""
+        wanted = heading.strip().lower()
+        return [s for s in self.sections
+                if s["heading"].lower() == wanted or s["path"].lower() == wanted or s["path"].lower().endswith(" > " + wanted)]
+
+    def read(self, section: Dict) -> bytes:
+        """The raw bytes of one section (heading line included), read with a single seek."""
+        if self._data is not None:
+            return self._data[section["offset"]:section["offset"] + section["length"]]
+        with open(self.path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if (st.st_mtime_ns, st.st_size) != self.key:
+                raise FileChangedError(f"{self.path} changed since it was indexed")
+            f.seek(section["offset"])
+            return f.read(section["length"])
+
+    def text(self, section: Dict) -> str:
+        return _decode(self.read(section))
+
+    def sections_with_text(self) -> List[Dict]:
+        """Every section with its decoded ``text`` (reads the whole document once)."""
+        if self._data is not None:
+            data = self._data
+        else:
+            data = self.read({"offset": 0, "length": self.size})
+        return [dict(s, text=_decode(data[s["offset"]:s["offset"] + s["length"]])) for s in self.sections]
+
+
+_cache: "OrderedDict[str, MarkdownIndex]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def index_markdown(path: Union[str, Path]) -> MarkdownIndex:
+    """The index of ``path``, rebuilt only when its ``(mtime_ns, size)`` changed; raises OSError if unreadable."""
+    name = os.path.abspath(path)
+    st = os.stat(name)
+    with _cache_lock:
+        cached = _cache.get(name)
+        if cached is not None and cached.key == (st.st_mtime_ns, st.st_size):
+            _cache.move_to_end(name)
+            return cached
+    index = MarkdownIndex(Path(name))
+    with _cache_lock:
+        _cache[name] = index
+        _cache.move_to_end(name)
+        while len(_cache) > MAX_CACHED_INDEXES:
+            _cache.popitem(last=False)
+    return index
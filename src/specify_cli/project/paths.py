@@ -0,0 +1,145 @@
+"""
+Repository and feature path resolution for Specify CLI.
+
+Python counterpart of ``get_feature_paths`` in ``scripts/bash/common.sh``.
+The repository root and current branch are read straight from the ``.git``
+metadata so that no ``git`` subprocess is needed on the hot path. Linked
+worktrees (``specify feature new --worktree``) are listed the same way, from
+the ``worktrees/`` directory of the shared git directory.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+FEATURE_BRANCH_RE = re.compile(r"^[0-9]{3}-")
+
+# Optional design documents reported by check-task-prerequisites
+OPTIONAL_DOCS = [
+    ("RESEARCH", "research.md"),
+    ("DATA_MODEL", "data-model.md"),
+    ("CONTRACTS_DIR", "contracts/"),
+    ("QUICKSTART", "quickstart.md"),
+]
+
+
+def find_repo_root(start: Path = None) -> Optional[Path]:
+    """Walk upwards from ``start`` until a directory containing ``.git`` is found."""
+    current = (start or Path.cwd()).resolve()
+    for candidate in [current, *current.parents]:
+        if (candidate / ".git").exists():
+            return candidate
+    return None
+
+
+def resolve_git_dir(repo_root: Path) -> Path:
+    """Return the git directory for a work tree (handles ``.git`` files used by worktrees)."""
+    dot_git = repo_root / ".git"
+    if dot_git.is_file():
+        content = dot_git.read_text(encoding="utf-8").strip()
+        if content.startswith("gitdir:"):
+            git_dir = Path(content[len("gitdir:"):].strip())
+            if not git_dir.is_absolute():
+                git_dir = (repo_root / git_dir).resolve()
+            return git_dir
+    return dot_git
+
+
+def resolve_common_dir(repo_root: Path) -> Path:
+    """Return the git directory shared by the main work tree and all linked worktrees."""
+    git_dir = resolve_git_dir(repo_root)
+    try:
+        common = Path((git_dir / "commondir").read_text(encoding="utf-8").strip())
+    except OSError:
+        return git_dir
+    return common if common.is_absolute() else (git_dir / common).resolve()
+
+
+def _read_head(head: Path) -> str:
+    try:
+        content = head.read_text(encoding="utf-8").strip()
+    except OSError:
+        return "HEAD"
+    if content.startswith("ref: refs/heads/"):
+        return content[len("ref: refs/heads/"):]
+    return "HEAD"
+
+
+def read_current_branch(repo_root: Path) -> str:
+    """Read the current branch name from HEAD; returns ``HEAD`` when detached (like ``git rev-parse --abbrev-ref``)."""
+    return _read_head(resolve_git_dir(repo_root) / "HEAD")
+
+
+def list_worktrees(repo_root: Path) -> List[Dict[str, str]]:
+    """``path`` and ``branch`` of the main work tree and each linked worktree that still exists."""
+    common = resolve_common_dir(repo_root)
+    trees = [{"path": str(common.parent), "branch": _read_head(common / "HEAD")}]
+    linked = common / "worktrees"
+    if linked.is_dir():
+        for entry in sorted(linked.iterdir()):
+            try:
+                dot_git = Path((entry / "gitdir").read_text(encoding="utf-8").strip())
+            except OSError:
+                continue
+            if dot_git.exists():
+                trees.append({"path": str(dot_git.parent), "branch": _read_head(entry / "HEAD")})
+    return trees
+
+
+def find_feature_worktree(repo_root: Path, branch: str) -> Optional[Path]:
+    """The work tree that has ``branch`` checked out, if any."""
+    for tree in list_worktrees(repo_root):
+        if tree["branch"] == branch:
+            return Path(tree["path"])
+    return None
+
+
+def is_feature_branch(branch: str) -> bool:
+    """Feature branches are named like ``001-feature-name``."""
+    return bool(FEATURE_BRANCH_RE.match(branch))
+
+
+def get_feature_dir(repo_root: Path, branch: str) -> Path:
+    """Return ``specs/<branch>`` under the repository root."""
+    return repo_root / "specs" / branch
+
+
+def get_feature_paths(repo_root: Path, branch: str = None) -> Dict[str, str]:
+    """Return the same keys that ``get_feature_paths`` in common.sh exports.
+
+    ``branch`` (or ``SPECIFY_FEATURE``) selects a feature other than the
+    current branch; when it is checked out in another worktree, that
+    worktree becomes ``REPO_ROOT``.
+    """
+    if branch is None:
+        branch = os.environ.get("SPECIFY_FEATURE") or read_current_branch(repo_root)
+    if branch != read_current_branch(repo_root):
+        repo_root = find_feature_worktree(repo_root, branch) or repo_root
+    feature_dir = get_feature_dir(repo_root, branch)
+    return {
+        "REPO_ROOT": str(repo_root),
+        "MAIN_REPO_ROOT": str(resolve_common_dir(repo_root).parent),
+        "CURRENT_BRANCH": branch,
+        "FEATURE_DIR": str(feature_dir),
+        "FEATURE_SPEC": str(feature_dir / "spec.md"),
+        "IMPL_PLAN": str(feature_dir / "plan.md"),
+        "TASKS": str(feature_dir / "tasks.md"),
+        "RESEARCH": str(feature_dir / "research.md"),
+        "DATA_MODEL": str(feature_dir / "data-model.md"),
+        "QUICKSTART": str(feature_dir / "quickstart.md"),
+        "CONTRACTS_DIR": str(feature_dir / "contracts"),
+    }
+
+
+def get_available_docs(paths: Dict[str, str]) -> List[str]:
+    """List optional design documents present for a feature (check-task-prerequisites semantics)."""
+    docs = []
+    for key, label in OPTIONAL_DOCS:
+        path = Path(paths[key])
+        if label.endswith("/"):
+            if path.is_dir() and any(path.iterdir()):
+                docs.append(label)
+        elif path.is_file():
+            docs.append(label)
+    return docs
@@ -0,0 +1,276 @@
+"""
+Full-text search over feature documents for Specify CLI.
+
+Every markdown section of ``specs/*/{spec,plan,research,data-model,
+quickstart,tasks}.md`` and ``specs/*/contracts/*.md`` is a search document.
+Terms live in an on-disk inverted index (SQLite, one database per
+repository in the user cache) and queries are ranked with BM25. Heading
+terms count extra, so a query like "technical context postgres" prefers
+the plan section of that name.
+
+Text is lowercased and split into ASCII words; runs of CJK characters are
+split into overlapping bigrams (single characters stay unigrams), which
+works for Chinese without a dictionary.
+
+Updates are incremental: files are compared by ``(mtime_ns, size)`` and
+then SHA-256, and only changed files are re-tokenized.
+"""
+
+import hashlib
+import math
+import os
+import re
+import sqlite3
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..tools.cache import get_cache_dir
+from .context import split_sections
+
+SCHEMA_VERSION = 1
+
+FEATURE_DOCS = ("spec.md", "plan.md", "research.md", "data-model.md", "quickstart.md", "tasks.md")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+HEADING_WEIGHT = 3
+
+_TOKEN_RE = re.compile("[a-z0-9_]+|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY, path TEXT UNIQUE, mtime_ns INTEGER, size INTEGER, sha256 TEXT
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY, file_id INTEGER, heading TEXT, start INTEGER, length INTEGER, text TEXT
+);
+CREATE INDEX IF NOT EXISTS sections_file ON sections (file_id);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT, section_id INTEGER, tf INTEGER, PRIMARY KEY (term, section_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_section ON postings (section_id);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """ASCII words plus CJK bigrams, lowercased."""
+    tokens = []
+    for run in _TOKEN_RE.findall(text.lower()):
+        if run[0] < "\u3040":  # ASCII word
+            if len(run) > 1:
+                tokens.append(run)
+        elif len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def iter_feature_documents(repo_root: Path) -> List[str]:
+    """Repository-relative paths of every searchable document under ``specs/``."""
+    specs = os.path.join(str(repo_root), "specs")
+    paths = []
+    try:
+        features = sorted(e.name for e in os.scandir(specs) if e.is_dir())
+    except OSError:
+        return paths
+    for feature in features:
+        base = os.path.join(specs, feature)
+        try:
+            names = set(os.listdir(base))
+        except OSError:
+            continue
+        paths.extend(f"specs/{feature}/{name}" for name in FEATURE_DOCS if name in names)
+        if "contracts" in names:
+            try:
+                contracts = sorted(n for n in os.listdir(os.path.join(base, "contracts")) if n.endswith(".md"))
+            except OSError:
+                contracts = []
+            paths.extend(f"specs/{feature}/contracts/{name}" for name in contracts)
+    return paths
+
+
+class SearchIndex:
+    """BM25 inverted index over a repository's feature documents."""
+
+    def __init__(self, repo_root: Path, db_path: Path = None):
+        self.repo_root = Path(repo_root).resolve()
+        digest = hashlib.sha1(str(self.repo_root).encode("utf-8")).hexdigest()[:16]
+        self.db_path = db_path or get_cache_dir() / "search" / f"{digest}.sqlite"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        version = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+            version = int(row[0]) if row else None
+        except sqlite3.DatabaseError:
+            pass
+        if version != SCHEMA_VERSION:
+            self.conn.executescript("DROP TABLE IF EXISTS meta; DROP TABLE IF EXISTS files; "
+                                    "DROP TABLE IF EXISTS sections; DROP TABLE IF EXISTS postings;")
+        self.conn.executescript(_SCHEMA)
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _remove_file(self, file_id: int) -> None:
+        self.conn.execute("DELETE FROM postings WHERE section_id IN (SELECT id FROM sections WHERE file_id = ?)", (file_id,))
+        self.conn.execute("DELETE FROM sections WHERE file_id = ?", (file_id,))
+
+    def _index_file(self, file_id: int, data: bytes) -> int:
+        count = 0
+        for section in split_sections(data):
+            body_tokens = tokenize(section["text"])
+            counts = Counter(body_tokens)
+            for token in tokenize(section["path"]):
+                counts[token] += HEADING_WEIGHT - 1
+            cursor = self.conn.execute(
+                "INSERT INTO sections (file_id, heading, start, length, text) VALUES (?, ?, ?, ?, ?)",
+                (file_id, section["path"], section["start"], max(len(body_tokens), 1), section["text"]),
+            )
+            self.conn.executemany(
+                "INSERT INTO postings (term, section_id, tf) VALUES (?, ?, ?)",
+                [(term, cursor.lastrowid, tf) for term, tf in counts.items()],
+            )
+            count += 1
+        return count
+
+    def refresh(self) -> Dict[str, int]:
+        """Bring the index up to date with the files on disk; returns change counts."""
+        stats = {"files": 0, "unchanged": 0, "rehashed": 0, "indexed": 0, "removed": 0}
+        known = {path: (fid, mtime, size, sha) for fid, path, mtime, size, sha in
+                 self.conn.execute("SELECT id, path, mtime_ns, size, sha256 FROM files")}
+        root = str(self.repo_root)
+        seen = set()
+        with self.conn:
+            for rel in iter_feature_documents(self.repo_root):
+                seen.add(rel)
+                stats["files"] += 1
+                try:
+                    st = os.stat(os.path.join(root, rel))
+                except OSError:
+                    continue
+                entry = known.get(rel)
+                if entry and entry[1] == st.st_mtime_ns and entry[2] == st.st_size:
+                    stats["unchanged"] += 1
+                    continue
+                with open(os.path.join(root, rel), "rb") as f:
+                    data = f.read()
+                digest = hashlib.sha256(data).hexdigest()
+                if entry and entry[3] == digest:
+                    stats["rehashed"] += 1
+                    self.conn.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?", (st.st_mtime_ns, st.st_size, entry[0]))
+                    continue
+                if entry:
+                    self._remove_file(entry[0])
+                    self.conn.execute("UPDATE files SET mtime_ns = ?, size = ?, sha256 = ? WHERE id = ?",
+                                      (st.st_mtime_ns, st.st_size, digest, entry[0]))
+                    file_id = entry[0]
+                else:
+                    file_id = self.conn.execute("INSERT INTO files (path, mtime_ns, size, sha256) VALUES (?, ?, ?, ?)",
+                                                (rel, st.st_mtime_ns, st.st_size, digest)).lastrowid
+                self._index_file(file_id, data)
+                stats["indexed"] += 1
+            for rel, entry in known.items():
+                if rel not in seen:
+                    self._remove_file(entry[0])
+                    self.conn.execute("DELETE FROM files WHERE id = ?", (entry[0],))
+                    stats["removed"] += 1
+        return stats
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        section: Optional[str] = None,
+        feature: Optional[str] = None,
+    ) -> List[Dict]:
+        """BM25-ranked sections for ``query``, optionally restricted by heading text or feature."""
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+        total, total_length = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM sections").fetchone()
+        if not total:
+            return []
+        avg_length = total_length / total
+
+        placeholders = ",".join("?" * len(terms))
+        df = dict(self.conn.execute(
+            f"SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) GROUP BY term", terms))
+        if not df:
+            return []
+        # Score and filter inside SQLite; only the top ``limit`` sections come back to Python
+        weights = []
+        for term, count in df.items():
+            weights += [term, math.log(1 + (total - count + 0.5) / (count + 0.5))]
+        sql = (
+            f"WITH q (term, idf) AS (VALUES {','.join(['(?, ?)'] * len(df))}) "
+            "SELECT p.section_id, SUM(q.idf * p.tf * ? / (p.tf + ? * (1 - ? + ? * s.length / ?))) AS score "
+            "FROM q JOIN postings p ON p.term = q.term JOIN sections s ON s.id = p.section_id "
+        )
+        params = weights + [BM25_K1 + 1, BM25_K1, BM25_B, BM25_B, avg_length]
+        where = []
+        if feature:
+            # Range over the unique path index: everything under specs/<feature>/
+            sql += "JOIN files f ON f.id = s.file_id "
+            where.append("f.path > ? AND f.path < ?")
+            params += [f"specs/{feature}/", f"specs/{feature}0"]
+        if section:
+            where.append("instr(lower(s.heading), ?) > 0")
+            params.append(section.lower())
+        if where:
+            sql += "WHERE " + " AND ".join(where) + " "
+        sql += "GROUP BY p.section_id ORDER BY score DESC LIMIT ?"
+        params.append(limit)
+        scores = self.conn.execute(sql, params).fetchall()
+        if not scores:
+            return []
+
+        rows = {row[0]: row[1:] for row in self.conn.execute(
+            "SELECT s.id, f.path, s.heading, s.start, s.text FROM sections s JOIN files f ON f.id = s.file_id "
+            f"WHERE s.id IN ({','.join('?' * len(scores))})", [section_id for section_id, _ in scores])}
+        results = []
+        for section_id, score in scores:
+            path, heading, start, text = rows[section_id]
+            line, snippet = make_snippet(text, query, terms)
+            results.append({
+                "path": path,
+                "heading": heading,
+                "line": start + line,
+                "score": round(score, 4),
+                "snippet": snippet,
+            })
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        files, = self.conn.execute("SELECT COUNT(*) FROM files").fetchone()
+        sections, = self.conn.execute("SELECT COUNT(*) FROM sections").fetchone()
+        return {"files": files, "sections": sections}
+
+
+def make_snippet(text: str, query: str, terms: List[str], width: int = 160) -> Tuple[int, str]:
+    """``(line offset, snippet)`` around the first query hit in a section (whole query first, then terms)."""
+    lowered = text.lower()
+    candidates = [query.lower().strip()] + sorted(terms, key=len, reverse=True)
+    position = -1
+    for candidate in candidates:
+        if candidate:
+            position = lowered.find(candidate)
+            if position >= 0:
+                break
+    if position < 0:
+        position = 0
+    start = max(0, position - width // 3)
+    end = min(len(text), start + width)
+    snippet = " ".join(text[start:end].split())
+    if start > 0:
+        snippet = "…" + snippet
+    if end < len(text):
+        snippet += "…"
+    return text.count("\n", 0, position), snippet
@@ -0,0 +1,189 @@
+"""
+Warm repository state for Specify CLI.
+
+``RepoState`` answers the questions agents ask between slash commands
+(feature paths, task prerequisites, artifact status, plan context) and
+memoizes every answer against the ``stat`` of the files it was derived
+from. The same object backs both ``specify serve`` and the direct fallback
+used by ``specify query`` when no daemon is running.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .mdindex import index_markdown
+from .paths import (
+    get_available_docs,
+    get_feature_paths,
+    is_feature_branch,
+    read_current_branch,
+    resolve_git_dir,
+)
+
+# Technical Context fields extracted from plan.md (same keys update-agent-context.sh greps for)
+PLAN_CONTEXT_FIELDS = [
+    "Language/Version",
+    "Primary Dependencies",
+    "Storage",
+    "Testing",
+    "Target Platform",
+    "Project Type",
+]
+
+
+def stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    """Return ``(mtime_ns, size)`` for a path, or None when it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class RepoState:
+    """Memoized view of a repository's current feature state."""
+
+    def __init__(self, repo_root: Path):
+        self.repo_root = Path(repo_root).resolve()
+        self.started = time.time()
+        self.hits = 0
+        self.misses = 0
+        self._git_dir = resolve_git_dir(self.repo_root)
+        self._memo: Dict[str, Tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, name: str, key: Any, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._memo.get(name)
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[1]
+        value = compute()
+        with self._lock:
+            self.misses += 1
+            self._memo[name] = (key, value)
+        return value
+
+    def branch(self) -> str:
+        head = self._git_dir / "HEAD"
+        return self._cached("branch", stat_key(head), lambda: read_current_branch(self.repo_root))
+
+    def paths(self) -> Dict[str, str]:
+        branch = self.branch()
+        return self._cached("paths", branch, lambda: get_feature_paths(self.repo_root, branch))
+
+    def prereqs(self) -> Dict[str, Any]:
+        """Mirror check-task-prerequisites.sh: feature dir and plan.md must exist."""
+        paths = self.paths()
+        feature_dir = Path(paths["FEATURE_DIR"])
+        errors = []
+        if not is_feature_branch(paths["CURRENT_BRANCH"]):
+            errors.append(f"Not on a feature branch. Current branch: {paths['CURRENT_BRANCH']}")
+        elif not feature_dir.is_dir():
+            errors.append(f"Feature directory not found: {feature_dir}")
+        elif not Path(paths["IMPL_PLAN"]).is_file():
+            errors.append(f"plan.md not found in {feature_dir}")
+        docs = get_available_docs(paths) if feature_dir.is_dir() else []
+        return {
+            "ok": not errors,
+            "errors": errors,
+            "FEATURE_DIR": paths["FEATURE_DIR"],
+            "AVAILABLE_DOCS": docs,
+        }
+
+    def status(self) -> Dict[str, Any]:
+        paths = self.paths()
+        artifacts = {}
+        for key in ("FEATURE_SPEC", "IMPL_PLAN", "TASKS", "RESEARCH", "DATA_MODEL", "QUICKSTART"):
+            artifacts[Path(paths[key]).name] = Path(paths[key]).is_file()
+        contracts = Path(paths["CONTRACTS_DIR"])
+        artifacts["contracts/"] = contracts.is_dir() and any(contracts.iterdir())
+        return {
+            "repo_root": str(self.repo_root),
+            "branch": paths["CURRENT_BRANCH"],
+            "feature_branch": is_feature_branch(paths["CURRENT_BRANCH"]),
+            "artifacts": artifacts,
+        }
+
+    def context(self) -> Dict[str, Any]:
+        """Technical Context fields of the current plan.md (NEEDS CLARIFICATION values dropped)."""
+        plan = Path(self.paths()["IMPL_PLAN"])
+        return self._cached(f"context:{plan}", stat_key(plan), lambda: self._parse_plan_context(plan))
+
+    @staticmethod
+    def _parse_plan_context(plan: Path) -> Dict[str, Any]:
+        if not plan.is_file():
+            return {"plan": str(plan), "exists": False, "fields": {}}
+        fields = {}
+        for entry in index_markdown(plan).fields:
+            key, value = entry["key"], entry["value"]
+            if key in PLAN_CONTEXT_FIELDS and key not in fields and value and "NEEDS CLARIFICATION" not in value:
+                fields[key] = value
+        return {"plan": str(plan), "exists": True, "fields": fields}
+
+    def _feature_doc(self, params: Dict[str, Any]) -> Path:
+        """A document of the current feature named by ``params["doc"]`` (e.g. ``research.md``)."""
+        doc = params.get("doc")
+        if not doc:
+            raise ValueError("Missing parameter: doc")
+        feature_dir = Path(self.paths()["FEATURE_DIR"]).resolve()
+        path = (feature_dir / doc).resolve()
+        if feature_dir not in path.parents:
+            raise ValueError(f"Not a document of the current feature: {doc}")
+        return path
+
+    def sections(self, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Heading index, frontmatter and ``**Key**: value`` fields of a feature document."""
+        path = self._feature_doc(params or {})
+        if not path.is_file():
+            return {"doc": str(path), "exists": False, "sections": []}
+        index = index_markdown(path)
+        return {
+            "doc": str(path),
+            "exists": True,
+            "bytes": index.size,
+            "sections": [{k: s[k] for k in ("heading", "level", "path", "start", "end", "length")} for s in index.sections],
+            "frontmatter": index.frontmatter,
+            "fields": index.fields,
+        }
+
+    def section(self, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Text of the sections of a feature document with the given ``heading`` (read without loading the rest)."""
+        params = params or {}
+        path = self._feature_doc(params)
+        heading = params.get("heading")
+        if not heading:
+            raise ValueError("Missing parameter: heading")
+        if not path.is_file():
+            return {"doc": str(path), "exists": False, "matches": []}
+        index = index_markdown(path)
+        matches = [
+            {"heading": s["heading"], "path": s["path"], "start": s["start"], "end": s["end"], "text": index.text(s)}
+            for s in index.find(heading)
+        ]
+        return {"doc": str(path), "exists": True, "matches": matches}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "uptime": round(time.time() - self.started, 3),
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+        }
+
+    def dispatch(self, method: str, params: Dict[str, Any] = None) -> Any:
+        """Answer a query by name; raises KeyError for unknown methods and ValueError for bad ``params``."""
+        handlers = {
+            "paths": self.paths,
+            "prereqs": self.prereqs,
+            "status": self.status,
+            "context": self.context,
+            "stats": self.stats,
+            "sections": lambda: self.sections(params),
+            "section": lambda: self.section(params),
+        }
+        if method not in handlers:
+            raise KeyError(method)
+        return handlers[method]()
@@ -0,0 +1,188 @@
+"""
+Requirement traceability index for Specify CLI.
+
+Links the functional requirements a spec defines (``**FR-001**: ...``) to
+the tasks that implement them (``- [ ] T012 [FR-001] ... in src/x.py``) and
+reports, per feature, requirements no task covers, requirements no test
+task covers, and tasks that reference no requirement.
+
+The index is incremental: every file is remembered with its
+``(mtime_ns, size)`` and SHA-256, and each feature's report with the hashes
+it was built from. Unchanged files are skipped after a ``stat``;
+touched-but-identical files after hashing. The index lives in the per-user
+cache, one JSON file per repository.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..tools.cache import get_cache_dir
+
+INDEX_VERSION = 1
+
+REQUIREMENT_DEF_RE = re.compile(r"^\s*[-*]\s*\*\*(?P<id>N?FR-\d{3,})\*\*\s*:?\s*(?P<text>.*)$", re.MULTILINE)
+REQUIREMENT_REF_RE = re.compile(r"\bN?FR-\d{3,}\b")
+TASK_RE = re.compile(r"^\s*[-*]\s*\[(?P<done>[ xX])\]\s*(?P<id>T\d{3,})\b(?P<text>.*)$", re.MULTILINE)
+# Repository paths mentioned in a task (``src/models/user.py``, ``tests/contract/``)
+PATH_RE = re.compile(r"(?<![\w/.-])((?:[\w.-]+/)+[\w.-]*|[\w-]+\.(?:py|ts|tsx|js|go|rs|java|kt|swift|rb|cs|md|json|ya?ml|sql|sh|ps1))(?![\w/])")
+TEST_HINT_RE = re.compile(r"\btests?\b|(^|/)test_|_test\.|\.test\.|\.spec\.", re.IGNORECASE)
+
+
+def parse_spec(text: str) -> List[str]:
+    """Requirement IDs defined by a spec, in definition order."""
+    return list(dict.fromkeys(m.group("id") for m in REQUIREMENT_DEF_RE.finditer(text)))
+
+
+def parse_tasks(text: str) -> List[Dict]:
+    """Task checklist items with requirement references, file paths and a test flag."""
+    tasks = []
+    for m in TASK_RE.finditer(text):
+        body = m.group("text")
+        files = sorted({p.rstrip(".") for p in PATH_RE.findall(body) if not REQUIREMENT_REF_RE.fullmatch(p)})
+        tasks.append({
+            "id": m.group("id"),
+            "done": m.group("done") != " ",
+            "requirements": sorted(set(REQUIREMENT_REF_RE.findall(body))),
+            "files": files,
+            "test": bool(TEST_HINT_RE.search(body)),
+        })
+    return tasks
+
+
+def build_report(name: str, requirements: Optional[List[str]], tasks: Optional[List[Dict]]) -> Dict:
+    """Coverage report for one feature from its parsed spec and tasks (None when a file is missing)."""
+    covered: Dict[str, List[str]] = {rid: [] for rid in requirements or []}
+    tested = set()
+    unknown = []
+    for task in tasks or []:
+        for rid in task["requirements"]:
+            if rid in covered:
+                covered[rid].append(task["id"])
+                if task["test"]:
+                    tested.add(rid)
+            else:
+                unknown.append({"task": task["id"], "requirement": rid})
+    return {
+        "feature": name,
+        "has_spec": requirements is not None,
+        "has_tasks": tasks is not None,
+        "requirements": len(covered),
+        "tasks": len(tasks or []),
+        "coverage": covered,
+        "uncovered": [rid for rid, ids in covered.items() if not ids],
+        "untested": [rid for rid, ids in covered.items() if ids and rid not in tested],
+        "orphan_tasks": [t["id"] for t in tasks or [] if not t["requirements"]],
+        "unknown_references": unknown,
+        "files": sorted({f for t in tasks or [] for f in t["files"]}),
+    }
+
+
+class TraceIndex:
+    """Incremental spec/tasks cross-reference index for one repository.
+
+    Files are tracked by ``stat`` and SHA-256; finished per-feature reports
+    are stored against the hashes of their ``spec.md`` and ``tasks.md``, so a
+    warm run costs two ``stat`` calls per feature.
+    """
+
+    def __init__(self, repo_root: Path, index_path: Path = None):
+        self.repo_root = Path(repo_root).resolve()
+        # Plain strings and os.stat on the hot path: pathlib dominates at thousands of features
+        self._root = str(self.repo_root)
+        digest = hashlib.sha1(self._root.encode("utf-8")).hexdigest()[:16]
+        self.index_path = index_path or get_cache_dir() / "trace" / f"{digest}.json"
+        self.stat_hits = 0
+        self.hash_hits = 0
+        self.parsed = 0
+        self._dirty = False
+        self._seen = set()
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if data.get("version") != INDEX_VERSION:
+                raise ValueError("stale index")
+            self._files, self._features = data["files"], data["features"]
+        except (OSError, ValueError, KeyError):
+            self._files, self._features = {}, {}
+
+    def _digest(self, rel: str) -> Tuple[Optional[str], Optional[bytes]]:
+        """``(sha256, content)`` of a file; content is None when the stat matched the index."""
+        path = os.path.join(self._root, rel)
+        try:
+            st = os.stat(path)
+        except OSError:
+            if self._files.pop(rel, None) is not None:
+                self._dirty = True
+            return None, None
+        key = [st.st_mtime_ns, st.st_size]
+        entry = self._files.get(rel)
+        if entry and entry["stat"] == key:
+            self.stat_hits += 1
+            return entry["sha256"], None
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        if entry and entry["sha256"] == digest:
+            self.hash_hits += 1
+        self._files[rel] = {"stat": key, "sha256": digest}
+        self._dirty = True
+        return digest, data
+
+    def _parse(self, rel: str, data: Optional[bytes], parser):
+        if data is None:
+            with open(os.path.join(self._root, rel), "rb") as f:
+                data = f.read()
+        return parser(data.decode("utf-8", errors="replace"))
+
+    def feature(self, feature_dir: Path) -> Dict:
+        """Coverage report for one feature directory."""
+        rel = os.path.relpath(os.path.abspath(feature_dir), self._root).replace(os.sep, "/")
+        return self._feature(rel, os.path.basename(rel))
+
+    def _feature(self, rel: str, name: str) -> Dict:
+        self._seen.add(rel)
+        spec_rel, tasks_rel = f"{rel}/spec.md", f"{rel}/tasks.md"
+        spec_sha, spec_data = self._digest(spec_rel)
+        tasks_sha, tasks_data = self._digest(tasks_rel)
+        cached = self._features.get(rel)
+        if cached and cached["spec"] == spec_sha and cached["tasks"] == tasks_sha:
+            return cached["report"]
+        self.parsed += 1
+        requirements = self._parse(spec_rel, spec_data, parse_spec) if spec_sha else None
+        tasks = self._parse(tasks_rel, tasks_data, parse_tasks) if tasks_sha else None
+        report = build_report(name, requirements, tasks)
+        self._features[rel] = {"spec": spec_sha, "tasks": tasks_sha, "report": report}
+        self._dirty = True
+        return report
+
+    def features(self, specs_dir: Path = None) -> List[Dict]:
+        """Coverage reports for every feature directory under ``specs/``."""
+        specs_dir = Path(specs_dir or self.repo_root / "specs")
+        try:
+            entries = sorted(e.name for e in os.scandir(specs_dir) if e.is_dir())
+        except OSError:
+            return []
+        base = os.path.relpath(specs_dir, self._root).replace(os.sep, "/")
+        reports = [self._feature(f"{base}/{name}", name) for name in entries]
+        # Forget features that were deleted since the last full scan
+        for rel in [rel for rel in self._features if rel not in self._seen]:
+            del self._features[rel]
+            self._files.pop(f"{rel}/spec.md", None)
+            self._files.pop(f"{rel}/tasks.md", None)
+            self._dirty = True
+        return reports
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"version": INDEX_VERSION, "files": self._files, "features": self._features}), encoding="utf-8")
+            os.replace(tmp, self.index_path)
+            self._dirty = False
+        except OSError:
+            pass  # The index is an optimisation only
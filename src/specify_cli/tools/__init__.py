@@ -11,6 +11,7 @@ from .command import run_command
 from .downloader import (
     download_template_from_github,
     download_and_extract_template,
+    extract_template_from_bundle,
     ensure_executable_scripts
 )
 
@@ -26,5 +27,6 @@ __all__ = [
     # Template downloading
     "download_template_from_github",
     "download_and_extract_template", 
+    "extract_template_from_bundle",
     "ensure_executable_scripts",
 ]
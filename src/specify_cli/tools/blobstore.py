@@ -0,0 +1,184 @@
+"""
+Content-addressed blob store and project materialisation for Specify CLI.
+
+Template files are stored once per machine under ``<cache>/blobs`` keyed by
+their SHA-256 (plus an ``.x`` suffix for executables, since hardlinks share
+permission bits). Projects are then materialised from the store with the
+cheapest operation the filesystem supports:
+
+- ``reflink``: copy-on-write clone (``FICLONE``)
+- ``hardlink``: ``os.link`` for read-only template content only
+- ``copy``: ``copy_file_range`` (in-kernel, extent sharing where the
+  filesystem supports it), else a plain copy
+
+``auto`` tries a reflink first, then hardlinks read-only paths, then copies.
+
+Blobs are read-only (0444/0555): a hardlinked project file shares its inode
+with the blob and with every other project linked to it, so an in-place
+edit must fail rather than change them all. Permission bits do not stop
+root, so nothing is hardlinked when running as root. ``unshare`` swaps a
+hardlinked file for a private copy before its permissions are changed.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+from .bundle import safe_join
+from .cache import get_cache_dir
+
+STRATEGIES = ["auto", "reflink", "hardlink", "copy"]
+
+# Project paths whose contents are never edited in place by the workflow
+READ_ONLY_PREFIXES = (".specify/templates/", ".specify/scripts/")
+
+# Fixed mtime given to blobs; a different mtime means a hardlinked copy was edited
+BLOB_MTIME = 946684800  # 2000-01-01T00:00:00Z
+BLOB_MODE = 0o444
+EXECUTABLE_BLOB_MODE = 0o555
+
+FICLONE = 0x40049409  # _IOW(0x94, 9, int) on Linux
+
+
+class BlobStore:
+    """Write-once store of file contents addressed by SHA-256."""
+
+    def __init__(self, root: Path = None):
+        self.root = Path(root) if root else get_cache_dir() / "blobs"
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, digest: str, executable: bool = False) -> Path:
+        return self.root / digest[:2] / (digest[2:] + (".x" if executable else ""))
+
+    def put(self, data: bytes, executable: bool = False) -> Path:
+        """Store ``data`` (if not already present and intact) and return the blob path."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest, executable)
+        try:
+            st = os.stat(path)
+            if int(st.st_mtime) == BLOB_MTIME and st.st_size == len(data) and not st.st_mode & 0o222:
+                return path
+            # Edited through a hardlink (or writable, from an older store): detach it so other projects keep their copy
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(tmp, EXECUTABLE_BLOB_MODE if executable else BLOB_MODE)
+            os.utime(tmp, (BLOB_MTIME, BLOB_MTIME))
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return path
+
+
+def unshare(path: Path) -> None:
+    """Replace a hardlinked file with a private, writable copy so it can be changed without touching the blob."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    shutil.copyfile(path, tmp)
+    os.chmod(tmp, os.stat(path).st_mode & 0o777 | 0o200)
+    os.replace(tmp, path)
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Clone ``src`` into ``dst`` with FICLONE (btrfs, XFS, ...); False if unsupported."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return True
+        except OSError:
+            pass
+    dst.unlink()
+    return False
+
+
+def _copy_range(src: Path, dst: Path) -> bool:
+    """In-kernel copy via copy_file_range (may share extents on NFS/CIFS/XFS); False if unsupported."""
+    if not hasattr(os, "copy_file_range"):
+        return False
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            remaining = -1
+    if remaining != 0:
+        dst.unlink()
+        return False
+    return True
+
+
+def _is_root() -> bool:
+    return hasattr(os, "geteuid") and os.geteuid() == 0
+
+
+def _hardlink(src: Path, dst: Path) -> bool:
+    try:
+        os.link(src, dst)
+        return True
+    except OSError:
+        return False
+
+
+def materialize_file(blob: Path, dest: Path, rel_path: str, mode: int, strategy: str = "auto") -> str:
+    """Create ``dest`` from a blob; returns the method used (reflink, hardlink or copy)."""
+    # Never write through an existing file: it might be a hardlink into the store
+    if dest.exists() or dest.is_symlink():
+        dest.unlink()
+    read_only = rel_path.startswith(READ_ONLY_PREFIXES) and not _is_root()
+
+    if strategy in ("auto", "reflink") and _reflink(blob, dest):
+        method = "reflink"
+    elif strategy in ("auto", "hardlink") and read_only and _hardlink(blob, dest):
+        return "hardlink"  # permissions and mtime are shared with the blob
+    else:
+        if strategy == "copy" or not _copy_range(blob, dest):
+            shutil.copyfile(blob, dest)
+        method = "copy"
+    if os.name != "nt":
+        os.chmod(dest, mode)
+    return method
+
+
+def materialize_members(
+    members: Iterable[Tuple[str, bytes, int]],
+    dest_root: Path,
+    strategy: str = "auto",
+    store: BlobStore = None,
+) -> Dict[str, int]:
+    """Store template members in the blob store and materialise them under ``dest_root``.
+
+    Returns a count per method used, e.g. ``{"reflink": 3, "hardlink": 40, "copy": 2}``.
+    """
+    store = store or BlobStore()
+    counts: Dict[str, int] = {}
+    for rel_path, data, mode in members:
+        executable = bool(mode & 0o111)
+        blob = store.put(data, executable=executable)
+        target = safe_join(dest_root, rel_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        method = materialize_file(blob, target, rel_path, mode, strategy)
+        counts[method] = counts.get(method, 0) + 1
+    return counts
+
+
+def describe_counts(counts: Dict[str, int]) -> str:
+    """Human readable summary such as ``40 hardlinked, 3 copied``."""
+    labels = {"reflink": "reflinked", "hardlink": "hardlinked", "copy": "copied"}
+    return ", ".join(f"{counts[m]} {labels[m]}" for m in ("reflink", "hardlink", "copy") if counts.get(m))
@@ -0,0 +1,230 @@
+"""
+Offline template bundles for Specify CLI.
+
+A bundle packs every template variant of one release into a single file so
+that air-gapped machines can run ``specify init --bundle FILE``.
+
+Layout::
+
+    b"SPKBNDL1"                      file magic
+    member data ...                  deduplicated, optionally zlib-compressed
+    index (UTF-8 JSON)               variants -> files -> (offset, size, ...)
+    footer: <Q index_offset> <Q index_length> b"SPKBIDX1"
+
+The reader memory-maps the file, parses only the footer and index, and
+slices the selected variant's members straight out of the mapping.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+FILE_MAGIC = b"SPKBNDL1"
+INDEX_MAGIC = b"SPKBIDX1"
+FOOTER = struct.Struct("<QQ8s")
+BUNDLE_VERSION = 1
+
+CODEC_RAW = "raw"
+CODEC_ZLIB = "zlib"
+
+
+def variant_key(ai_assistant: str, script_type: str, language: str) -> str:
+    """Key under which a variant is stored in the bundle index."""
+    return f"{ai_assistant}-{script_type}-{language}"
+
+
+def iter_zip_members(source) -> Iterator[Tuple[str, bytes, int]]:
+    """Yield ``(relative_path, data, mode)`` for files in a template zip.
+
+    ``source`` is a path or an open ``zipfile.ZipFile``. A single top-level
+    directory (GitHub-style archives) is stripped.
+    """
+    if not isinstance(source, zipfile.ZipFile):
+        with zipfile.ZipFile(source) as zf:
+            yield from iter_zip_members(zf)
+        return
+    infos = [i for i in source.infolist() if not i.is_dir()]
+    names = [i.filename for i in infos]
+    prefix = ""
+    roots = {n.split("/", 1)[0] for n in names}
+    if len(roots) == 1 and all("/" in n for n in names):
+        prefix = next(iter(roots)) + "/"
+    for info in infos:
+        mode = (info.external_attr >> 16) & 0o777 or 0o644
+        yield info.filename[len(prefix):], source.read(info), mode
+
+
+class BundleWriter:
+    """Incrementally build a bundle file; identical members are stored once."""
+
+    def __init__(self, path: Path, release: str, compress: bool = True):
+        self.path = Path(path)
+        self.release = release
+        self.compress = compress
+        self._blobs: Dict[str, List] = {}
+        self._variants: Dict[str, Dict] = {}
+        self._f = open(self.path, "wb")
+        self._f.write(FILE_MAGIC)
+        self.raw_bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._f.close()
+            self.path.unlink(missing_ok=True)
+
+    def _add_blob(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        if digest not in self._blobs:
+            codec, stored = CODEC_RAW, data
+            if self.compress:
+                packed = zlib.compress(data, 6)
+                if len(packed) < len(data):
+                    codec, stored = CODEC_ZLIB, packed
+            offset = self._f.tell()
+            self._f.write(stored)
+            self._blobs[digest] = [offset, len(stored), len(data), codec]
+        return digest
+
+    def add_variant(self, key: str, members: Iterator[Tuple[str, bytes, int]], asset: str = None) -> int:
+        """Add one variant's members; returns the number of files."""
+        files = []
+        for rel_path, data, mode in members:
+            self.raw_bytes += len(data)
+            files.append([rel_path, self._add_blob(data), mode])
+        self._variants[key] = {"asset": asset, "files": files}
+        return len(files)
+
+    def close(self) -> None:
+        index = {
+            "version": BUNDLE_VERSION,
+            "release": self.release,
+            "blobs": self._blobs,
+            "variants": self._variants,
+        }
+        raw = json.dumps(index, separators=(",", ":")).encode("utf-8")
+        offset = self._f.tell()
+        self._f.write(raw)
+        self._f.write(FOOTER.pack(offset, len(raw), INDEX_MAGIC))
+        self._f.close()
+
+
+class BundleReader:
+    """Memory-mapped, index-driven access to a bundle file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._f = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._f.close()
+            raise ValueError(f"Not a template bundle (empty file): {self.path}")
+        self._view = memoryview(self._mm)
+        self.index = self._read_index()
+
+    def _read_index(self) -> Dict:
+        size = len(self._mm)
+        if size < len(FILE_MAGIC) + FOOTER.size or self._mm[:len(FILE_MAGIC)] != FILE_MAGIC:
+            self.close()
+            raise ValueError(f"Not a template bundle: {self.path}")
+        offset, length, magic = FOOTER.unpack_from(self._mm, size - FOOTER.size)
+        if magic != INDEX_MAGIC or offset + length > size - FOOTER.size:
+            self.close()
+            raise ValueError(f"Corrupt template bundle index: {self.path}")
+        index = json.loads(bytes(self._view[offset:offset + length]))
+        if index.get("version") != BUNDLE_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported bundle version {index.get('version')} in {self.path}")
+        return index
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        view = getattr(self, "_view", None)
+        if view is not None:
+            view.release()
+            self._view = None
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._f.close()
+
+    @property
+    def release(self) -> str:
+        return self.index["release"]
+
+    def variants(self) -> List[str]:
+        return sorted(self.index["variants"])
+
+    def has_variant(self, key: str) -> bool:
+        return key in self.index["variants"]
+
+    def read_blob(self, digest: str) -> memoryview:
+        """Return blob contents; raw blobs are a zero-copy view into the mapping."""
+        offset, stored, _size, codec = self.index["blobs"][digest]
+        data = self._view[offset:offset + stored]
+        if codec == CODEC_ZLIB:
+            return memoryview(zlib.decompress(data))
+        return data
+
+    def iter_variant(self, key: str) -> Iterator[Tuple[str, memoryview, int]]:
+        """Yield ``(relative_path, data, mode)`` for each member of a variant."""
+        variant = self.index["variants"].get(key)
+        if variant is None:
+            raise KeyError(key)
+        for rel_path, digest, mode in variant["files"]:
+            yield rel_path, self.read_blob(digest), mode
+
+    def extract_variant(self, key: str, dest: Path) -> int:
+        """Write a variant's files under ``dest`` (existing files are overwritten); returns file count."""
+        return write_members(self.iter_variant(key), dest)
+
+    def stats(self) -> Dict[str, int]:
+        blobs = self.index["blobs"].values()
+        return {
+            "variants": len(self.index["variants"]),
+            "files": sum(len(v["files"]) for v in self.index["variants"].values()),
+            "unique_blobs": len(self.index["blobs"]),
+            "stored_bytes": sum(b[1] for b in blobs),
+            "size": len(self._mm) if self._mm is not None else 0,
+        }
+
+
+def write_members(members: Iterator[Tuple[str, bytes, int]], dest: Path) -> int:
+    """Write ``(relative_path, data, mode)`` members under ``dest`` (existing files are overwritten); returns file count."""
+    dest = Path(dest)
+    count = 0
+    for rel_path, data, mode in members:
+        target = safe_join(dest, rel_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(data)
+        if os.name != "nt":
+            os.chmod(target, mode)
+        count += 1
+    return count
+
+
+def safe_join(root: Path, rel_path: str) -> Path:
+    """Join an archive member path under ``root``, rejecting absolute paths and ``..`` escapes."""
+    target = (root / rel_path).resolve()
+    root_resolved = root.resolve()
+    if target != root_resolved and root_resolved not in target.parents:
+        raise ValueError(f"Unsafe member path in archive: {rel_path}")
+    return target
+
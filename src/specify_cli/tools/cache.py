@@ -0,0 +1,117 @@
+"""
+Local cache locations for Specify CLI.
+
+Release assets are cached per tag under ``<cache>/templates/<tag>/<asset>``
+so repeated inits (and ``specify cache warm``) never download the same
+asset twice. An interrupted download is parked as ``.<asset>.partial`` and
+continued with an HTTP ``Range`` request by the next attempt. Set
+``SPECIFY_NO_CACHE=1`` to bypass the asset cache.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from platformdirs import user_cache_dir
+
+
+def get_cache_dir() -> Path:
+    """Root of the per-user cache (``SPECIFY_CACHE_DIR`` overrides the platform default)."""
+    override = os.environ.get("SPECIFY_CACHE_DIR")
+    root = Path(override).expanduser() if override else Path(user_cache_dir("specify-cli"))
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("SPECIFY_NO_CACHE", "").lower() not in ("1", "true", "yes")
+
+
+class TemplateCache:
+    """Release assets keyed by release tag and asset name."""
+
+    def __init__(self, root: Path = None):
+        self.root = Path(root) if root else get_cache_dir() / "templates"
+
+    def asset_path(self, tag: str, name: str) -> Path:
+        return self.root / tag / name
+
+    def lookup(self, tag: str, asset: Dict) -> Optional[Path]:
+        """Cached file for a release asset, if present with the expected size."""
+        path = self.asset_path(tag, asset["name"])
+        try:
+            if path.stat().st_size == asset.get("size", path.stat().st_size):
+                return path
+        except OSError:
+            pass
+        return None
+
+    def temp_path(self, tag: str, name: str) -> Path:
+        """A fresh temporary file next to the final location (same filesystem for ``commit``)."""
+        directory = self.root / tag
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".part")
+        os.close(fd)
+        return Path(tmp)
+
+    def partial_path(self, tag: str, name: str) -> Path:
+        return self.root / tag / f".{name}.partial"
+
+    def claim_partial(self, tag: str, name: str) -> Path:
+        """A temporary file for downloading ``name``, holding an interrupted download's bytes if one was parked.
+
+        The parked file is moved (atomically), so concurrent downloads never share it.
+        """
+        tmp = self.temp_path(tag, name)
+        try:
+            os.replace(self.partial_path(tag, name), tmp)
+        except OSError:
+            pass
+        return tmp
+
+    def park_partial(self, tag: str, name: str, tmp: Path) -> None:
+        """Keep the bytes of a failed download for the next ``claim_partial`` (or drop an empty file)."""
+        try:
+            if tmp.stat().st_size > 0:
+                os.replace(tmp, self.partial_path(tag, name))
+            else:
+                tmp.unlink()
+        except OSError:
+            pass
+
+    def commit(self, tag: str, name: str, tmp: Path) -> Path:
+        """Atomically move a completed download into the cache."""
+        path = self.asset_path(tag, name)
+        os.replace(tmp, path)
+        return path
+
+    def copy_out(self, cached: Path, dest: Path) -> None:
+        """Place a cached asset at ``dest`` (hardlink when possible, else copy)."""
+        if dest.exists():
+            dest.unlink()
+        try:
+            os.link(cached, dest)
+        except OSError:
+            shutil.copyfile(cached, dest)
+
+    def entries(self) -> List[Dict]:
+        """All cached assets as dicts with tag, name, size."""
+        items = []
+        if not self.root.is_dir():
+            return items
+        for tag_dir in sorted(self.root.iterdir()):
+            if not tag_dir.is_dir():
+                continue
+            for path in sorted(tag_dir.iterdir()):
+                if path.is_file() and not path.name.startswith("."):
+                    items.append({"tag": tag_dir.name, "name": path.name, "size": path.stat().st_size})
+        return items
+
+    def clear(self) -> int:
+        """Remove every cached asset; returns the number of files removed."""
+        count = len(self.entries())
+        if self.root.exists():
+            shutil.rmtree(self.root)
+        return count
@@ -3,6 +3,7 @@ Tool availability checking utilities for Specify CLI.
 """
 
 import shutil
+from functools import lru_cache
 
 from ..config import CLAUDE_LOCAL_PATH
 from ..i18n import t
@@ -19,9 +20,9 @@ def check_tool_for_tracker(tool: str, install_hint: str, tracker: StepTracker) -
         return False
 
 
-def check_tool(tool: str, install_hint: str) -> bool:
-    """Check if a tool is installed."""
-    
+@lru_cache(maxsize=None)
+def tool_available(tool: str) -> bool:
+    """Silent, memoized availability probe (safe to warm from a background thread)."""
     # Special handling for Claude CLI after `claude migrate-installer`
     # See: https://github.com/github/spec-kit/issues/123
     # The migrate-installer command REMOVES the original executable from PATH
@@ -30,8 +31,12 @@ def check_tool(tool: str, install_hint: str) -> bool:
     if tool == "claude":
         if CLAUDE_LOCAL_PATH.exists() and CLAUDE_LOCAL_PATH.is_file():
             return True
-    
-    if shutil.which(tool):
+    return shutil.which(tool) is not None
+
+
+def check_tool(tool: str, install_hint: str) -> bool:
+    """Check if a tool is installed."""
+    if tool_available(tool):
         return True
     else:
         console.print(f"[yellow]⚠️  {t('tools.not_found_template', tool=tool)}[/yellow]")
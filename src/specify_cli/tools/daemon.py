@@ -0,0 +1,192 @@
+"""
+Per-repository query daemon for Specify CLI.
+
+``specify serve`` listens on a Unix domain socket derived from the repository
+root and answers newline-delimited JSON-RPC 2.0 requests from a warm
+``RepoState``. ``query`` is the thin client: it talks to the daemon when one
+is listening and otherwise answers the request in-process.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..project.state import RepoState
+
+DEFAULT_IDLE_TIMEOUT = 600  # seconds
+CLIENT_TIMEOUT = 2.0
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+def daemon_supported() -> bool:
+    """Unix domain sockets are required (not available on every Windows Python)."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def socket_path_for(repo_root: Path) -> Path:
+    """Socket path for a repository, kept short to stay under the sun_path limit."""
+    digest = hashlib.sha1(str(Path(repo_root).resolve()).encode("utf-8")).hexdigest()[:16]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return Path(runtime_dir) / f"specify-{uid}-{digest}.sock"
+
+
+def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """One connection; may carry any number of requests, one JSON object per line."""
+
+    def handle(self):
+        server: "DaemonServer" = self.server
+        for raw in self.rfile:
+            server.touch()
+            if not raw.strip():
+                continue
+            response = server.handle_message(raw)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if server.stopping.is_set():
+                break
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server that exits after ``idle_timeout`` seconds without requests."""
+
+    daemon_threads = True
+
+    def __init__(self, repo_root: Path, socket_path: Path = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.state = RepoState(repo_root)
+        self.socket_path = Path(socket_path or socket_path_for(self.state.repo_root))
+        self.idle_timeout = idle_timeout
+        self.stopping = threading.Event()
+        self.last_activity = time.monotonic()
+        self.requests = 0
+        _remove_stale_socket(self.socket_path)
+        super().__init__(str(self.socket_path), _Handler)
+        os.chmod(self.socket_path, 0o600)
+
+    def touch(self) -> None:
+        self.last_activity = time.monotonic()
+
+    def handle_message(self, raw: bytes) -> Dict[str, Any]:
+        try:
+            message = json.loads(raw)
+        except ValueError as e:
+            return _error(None, PARSE_ERROR, f"Parse error: {e}")
+        if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+        request_id = message.get("id")
+        method = message["method"]
+        self.requests += 1
+        if method == "ping":
+            return {"jsonrpc": "2.0", "id": request_id, "result": "pong"}
+        if method == "shutdown":
+            self.stopping.set()
+            return {"jsonrpc": "2.0", "id": request_id, "result": True}
+        try:
+            result = self.state.dispatch(method, message.get("params") or {})
+        except KeyError:
+            return _error(request_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+        except ValueError as e:
+            return _error(request_id, INVALID_PARAMS, str(e))
+        except Exception as e:
+            return _error(request_id, INTERNAL_ERROR, str(e))
+        if method == "stats":
+            result = {**result, "requests": self.requests, "socket": str(self.socket_path)}
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def run(self, poll_interval: float = 0.5) -> None:
+        """Serve until shutdown is requested or the idle timeout elapses."""
+        self.timeout = poll_interval
+        try:
+            while not self.stopping.is_set():
+                self.handle_request()
+                if self.idle_timeout and time.monotonic() - self.last_activity > self.idle_timeout:
+                    break
+        finally:
+            self.server_close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+
+def _remove_stale_socket(path: Path) -> None:
+    """Remove a leftover socket file; refuse to start if another daemon answers on it."""
+    if not path.exists():
+        return
+    sock = _connect(path)
+    if sock is not None:
+        sock.close()
+        raise RuntimeError(f"A daemon is already listening on {path}")
+    path.unlink()
+
+
+def _connect(path: Path, timeout: float = CLIENT_TIMEOUT) -> Optional[socket.socket]:
+    if not daemon_supported() or not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def call_daemon(socket_path: Path, method: str, params: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+    """Send one request to a running daemon; returns the JSON-RPC response or None if unreachable."""
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+    request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+    try:
+        with sock, sock.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode("utf-8") + b"\n")
+            stream.flush()
+            line = stream.readline()
+    except OSError:
+        return None
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def query(repo_root: Path, method: str, params: Dict[str, Any] = None, *, use_daemon: bool = True) -> Dict[str, Any]:
+    """Answer a query through the daemon if it is running, otherwise directly.
+
+    Returns the JSON-RPC response dict with an extra ``source`` key
+    (``daemon`` or ``direct``).
+    """
+    if use_daemon:
+        response = call_daemon(socket_path_for(repo_root), method, params)
+        if response is not None:
+            response["source"] = "daemon"
+            return response
+    state = RepoState(repo_root)
+    try:
+        result = state.dispatch(method, params or {})
+    except KeyError:
+        response = _error(1, METHOD_NOT_FOUND, f"Method not found: {method}")
+    except ValueError as e:
+        response = _error(1, INVALID_PARAMS, str(e))
+    else:
+        response = {"jsonrpc": "2.0", "id": 1, "result": result}
+    response["source"] = "direct"
+    return response
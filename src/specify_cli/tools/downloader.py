@@ -2,27 +2,183 @@
 Template download and extraction utilities for Specify CLI.
 """
 
+import hashlib
 import os
 import shutil
 import tempfile
+import threading
 import zipfile
 from pathlib import Path
-from typing import Tuple, Dict, Optional
+from typing import Tuple, Dict, List, Optional
 
 import httpx
-import ssl
-import truststore
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.panel import Panel
-import typer
 
-from ..config import DEFAULT_REPO_OWNER, DEFAULT_REPO_NAME
+from ..project.manifest import write_manifest
 from ..ui import console, StepTracker
+from .bundle import BundleReader, iter_zip_members, variant_key, write_members
+from .blobstore import describe_counts, materialize_members, unshare
+from .cache import TemplateCache, cache_enabled
+from .render import (
+    SourceTree,
+    find_universal_asset,
+    load_source_dir,
+    load_source_zip,
+    render_enabled,
+    render_variant,
+    source_dir_fingerprint,
+)
+from .http import create_client
+from .journal import InitJournal
+from .sources import (
+    GitHubSource,
+    TemplateSource,
+    configured_sources,
+    download_from_sources,
+    resolve_release,
+)
 
 
-# SSL context setup
-ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-default_client = httpx.Client(verify=ssl_context)
+# Default client (OS trust store, split connect/read timeouts), created on first
+# use so a proxy httpx cannot handle does not break importing the CLI
+_default_client: Optional[httpx.Client] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> httpx.Client:
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = create_client()
+        return _default_client
+
+
+class TemplateSetupError(RuntimeError):
+    """Setting up a project from a template failed; ``step`` is the StepTracker key that failed."""
+
+    def __init__(self, step: str, message: str):
+        super().__init__(message)
+        self.step = step
+
+
+def variant_asset_pattern(ai_assistant: str, script_type: str, language: str) -> str:
+    """Asset name prefix for one agent/script/language template variant."""
+    return f"spec-kit-template-{ai_assistant}-{script_type}-{language}"
+
+
+def find_variant_asset(release_data: Dict, ai_assistant: str, script_type: str, language: str) -> Optional[Dict]:
+    """Return the zip asset for a variant from release JSON, or None."""
+    pattern = variant_asset_pattern(ai_assistant, script_type, language)
+    for asset in release_data.get("assets", []):
+        if pattern in asset["name"] and asset["name"].endswith(".zip"):
+            return asset
+    return None
+
+
+def resolve_template_release(
+    client: httpx.Client,
+    sources: List[TemplateSource] = None,
+    *,
+    debug: bool = False,
+    verbose: bool = True
+) -> Tuple[TemplateSource, Dict]:
+    """Resolve the latest release from the configured sources; raises TemplateSetupError on failure."""
+    try:
+        return resolve_release(client, sources or configured_sources(), debug=debug)
+    except Exception as e:
+        if verbose:
+            console.print(f"[red]Error fetching release information[/red]")
+            console.print(Panel(str(e), title="Fetch Error", border_style="red"))
+        raise TemplateSetupError("fetch", f"Error fetching release information: {e}") from e
+
+
+def download_universal_template(
+    download_dir: Path,
+    asset: Dict,
+    resolved: Tuple[TemplateSource, Dict],
+    *,
+    client: httpx.Client,
+    sources: List[TemplateSource] = None,
+    show_progress: bool = False
+) -> Tuple[Path, Dict]:
+    """Download (or reuse the cached) universal template asset of a release.
+
+    Returns:
+        Tuple of (zip_path, metadata_dict)
+    """
+    source, release_data = resolved
+    tag = release_data["tag_name"]
+    zip_path = download_dir / asset["name"]
+    cache = TemplateCache() if cache_enabled() else None
+    cached = cache.lookup(tag, asset) if cache else None
+    if cached is not None:
+        cache.copy_out(cached, zip_path)
+    else:
+        target = cache.claim_partial(tag, asset["name"]) if cache else zip_path
+        try:
+            source, _ = download_from_sources(
+                client, source, release_data, asset, target, fallbacks=sources, show_progress=show_progress, resume=cache is not None
+            )
+            if cache:
+                cache.copy_out(cache.commit(tag, asset["name"], target), zip_path)
+        except BaseException:
+            _abandon_download(cache, tag, asset["name"], target)
+            raise
+    return zip_path, {
+        "filename": asset["name"],
+        "size": asset["size"],
+        "release": tag,
+        "asset_url": asset["browser_download_url"],
+        "source": source.name,
+        "cache": "off" if cache is None else ("hit" if cached is not None else "miss"),
+    }
+
+
+def _record_download(journal: Optional[InitJournal], meta: Dict) -> None:
+    """Journal the finished download step with where the asset is kept."""
+    if journal is None:
+        return
+    cached = TemplateCache().asset_path(meta["release"], meta["filename"]) if meta["cache"] != "off" else None
+    transferred = 0 if meta["cache"] == "hit" else meta["size"]
+    journal.done("download", asset=meta["filename"], release=meta["release"], size=meta["size"],
+                 source=meta["source"], cache_path=str(cached) if cached else None,
+                 cache=meta["cache"], transferred=transferred)
+
+
+def _abandon_download(cache: Optional[TemplateCache], tag: str, name: str, target: Path) -> None:
+    """After a failed download: park the bytes in the cache for a resumed retry, or remove the file."""
+    if cache is not None:
+        cache.park_partial(tag, name, target)
+    elif target.exists():
+        target.unlink()
+
+
+def render_template(
+    project_path: Path,
+    tree: SourceTree,
+    agents: List[str],
+    script_type: str,
+    language: str,
+    materialize: str = None
+) -> Tuple[Dict[str, int], Dict[str, str], List[str]]:
+    """Render a variant from a universal source tree into ``project_path``.
+
+    Returns ``(counts, file_hashes, warnings)``; counts are per materialise method
+    (or ``{"copy": n}`` when writing files directly).
+    """
+    warnings: List[str] = []
+    hashes: Dict[str, str] = {}
+
+    def members():
+        for rel_path, data, mode in render_variant(tree, agents, script_type, language, warnings):
+            hashes[rel_path] = hashlib.sha256(data).hexdigest()
+            yield rel_path, data, mode
+
+    if materialize:
+        counts = materialize_members(members(), project_path, materialize)
+    else:
+        counts = {"copy": write_members(members(), project_path)}
+    return counts, hashes, warnings
 
 
 def download_template_from_github(
@@ -36,57 +192,40 @@ def download_template_from_github(
     client: httpx.Client = None, 
     debug: bool = False,
     repo_owner: str = None,
-    repo_name: str = None
+    repo_name: str = None,
+    sources: List[TemplateSource] = None,
+    resolved: Tuple[TemplateSource, Dict] = None
 ) -> Tuple[Path, Dict]:
     """
-    Download template from GitHub releases.
+    Download template from the configured template sources (GitHub releases by default).
+    ``resolved`` is a ``(source, release)`` pair from an earlier ``resolve_template_release``.
     
     Returns:
         Tuple of (zip_path, metadata_dict)
     """
-    repo_owner = repo_owner or DEFAULT_REPO_OWNER
-    repo_name = repo_name or DEFAULT_REPO_NAME
-    
     if client is None:
-        client = default_client
-    
-    if verbose:
-        console.print("[cyan]Fetching latest release information...[/cyan]")
+        client = get_default_client()
+    if repo_owner or repo_name:
+        sources = [GitHubSource(repo_owner, repo_name)]
+    sources = sources or configured_sources()
     
-    api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
-    
-    try:
-        response = client.get(api_url, timeout=30, follow_redirects=True)
-        status = response.status_code
-        if status != 200:
-            msg = f"GitHub API returned {status} for {api_url}"
-            if debug:
-                msg += f"\nResponse headers: {response.headers}\nBody (truncated 500): {response.text[:500]}"
-            raise RuntimeError(msg)
-        try:
-            release_data = response.json()
-        except ValueError as je:
-            raise RuntimeError(f"Failed to parse release JSON: {je}\nRaw (truncated 400): {response.text[:400]}")
-    except Exception as e:
-        console.print(f"[red]Error fetching release information[/red]")
-        console.print(Panel(str(e), title="Fetch Error", border_style="red"))
-        raise typer.Exit(1)
+    if resolved is None:
+        if verbose:
+            console.print("[cyan]Fetching latest release information...[/cyan]")
+        resolved = resolve_template_release(client, sources, debug=debug, verbose=verbose)
+    source, release_data = resolved
     
     # Find the template asset for the specified AI assistant
-    pattern = f"spec-kit-template-{ai_assistant}-{script_type}-{language}"
-    matching_assets = [
-        asset for asset in release_data.get("assets", [])
-        if pattern in asset["name"] and asset["name"].endswith(".zip")
-    ]
+    asset = find_variant_asset(release_data, ai_assistant, script_type, language)
     
-    if not matching_assets:
-        console.print(f"[red]No matching release asset found[/red] for pattern: [bold]{pattern}[/bold]")
-        asset_names = [a.get('name','?') for a in release_data.get('assets', [])]
-        console.print(Panel("\n".join(asset_names) or "(no assets)", title="Available Assets", border_style="yellow"))
-        raise typer.Exit(1)
+    if asset is None:
+        pattern = variant_asset_pattern(ai_assistant, script_type, language)
+        if verbose:
+            console.print(f"[red]No matching release asset found[/red] for pattern: [bold]{pattern}[/bold]")
+            asset_names = [a.get('name','?') for a in release_data.get('assets', [])]
+            console.print(Panel("\n".join(asset_names) or "(no assets)", title="Available Assets", border_style="yellow"))
+        raise TemplateSetupError("fetch", f"No matching release asset found for pattern: {pattern}")
     
-    # Use the first matching asset
-    asset = matching_assets[0]
     download_url = asset["browser_download_url"]
     filename = asset["name"]
     file_size = asset["size"]
@@ -96,54 +235,44 @@ def download_template_from_github(
         console.print(f"[cyan]Size:[/cyan] {file_size:,} bytes")
         console.print(f"[cyan]Release:[/cyan] {release_data['tag_name']}")
     
-    # Download the file
+    # Download the file (or reuse the cached copy for this release)
     zip_path = download_dir / filename
-    if verbose:
-        console.print(f"[cyan]Downloading template...[/cyan]")
-    
-    try:
-        with client.stream("GET", download_url, timeout=60, follow_redirects=True) as response:
-            if response.status_code != 200:
-                body_sample = response.text[:400]
-                raise RuntimeError(f"Download failed with {response.status_code}\nHeaders: {response.headers}\nBody (truncated): {body_sample}")
-            total_size = int(response.headers.get('content-length', 0))
-            with open(zip_path, 'wb') as f:
-                if total_size == 0:
-                    for chunk in response.iter_bytes(chunk_size=8192):
-                        f.write(chunk)
-                else:
-                    if show_progress:
-                        with Progress(
-                            SpinnerColumn(),
-                            TextColumn("[progress.description]{task.description}"),
-                            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-                            console=console,
-                        ) as progress:
-                            task = progress.add_task("Downloading...", total=total_size)
-                            downloaded = 0
-                            for chunk in response.iter_bytes(chunk_size=8192):
-                                f.write(chunk)
-                                downloaded += len(chunk)
-                                progress.update(task, completed=downloaded)
-                    else:
-                        for chunk in response.iter_bytes(chunk_size=8192):
-                            f.write(chunk)
-    except Exception as e:
-        console.print(f"[red]Error downloading template[/red]")
-        detail = str(e)
-        if zip_path.exists():
-            zip_path.unlink()
-        console.print(Panel(detail, title="Download Error", border_style="red"))
-        raise typer.Exit(1)
-    
-    if verbose:
-        console.print(f"Downloaded: {filename}")
+    tag = release_data["tag_name"]
+    cache = TemplateCache() if cache_enabled() else None
+    cached = cache.lookup(tag, asset) if cache else None
+    if cached is not None:
+        cache.copy_out(cached, zip_path)
+        if verbose:
+            console.print(f"[cyan]Using cached template:[/cyan] {cached}")
+    else:
+        if verbose:
+            console.print(f"[cyan]Downloading template...[/cyan]")
+        target = cache.claim_partial(tag, filename) if cache else zip_path
+        try:
+            source, _ = download_from_sources(
+                client, source, release_data, asset, target, fallbacks=sources, show_progress=show_progress, resume=cache is not None
+            )
+            if cache:
+                cache.copy_out(cache.commit(tag, filename, target), zip_path)
+        except BaseException as e:
+            _abandon_download(cache, tag, filename, target)
+            if not isinstance(e, Exception):
+                raise
+            if verbose:
+                console.print(f"[red]Error downloading template[/red]")
+                console.print(Panel(str(e), title="Download Error", border_style="red"))
+            raise TemplateSetupError("download", f"Error downloading template: {e}") from e
+        
+        if verbose:
+            console.print(f"Downloaded: {filename}")
     
     metadata = {
         "filename": filename,
         "size": file_size,
         "release": release_data["tag_name"],
-        "asset_url": download_url
+        "asset_url": download_url,
+        "source": source.name,
+        "cache": "off" if cache is None else ("hit" if cached is not None else "miss")
     }
     return zip_path, metadata
 
@@ -156,6 +285,9 @@ def ensure_executable_scripts(project_path: Path, tracker: StepTracker = None) -
     scripts_root = project_path / ".specify" / "scripts"
     if not scripts_root.is_dir():
         return
+    if tracker:
+        tracker.add("chmod", "Set script permissions recursively")
+        tracker.start("chmod")
     
     failures: list[str] = []
     updated = 0
@@ -172,6 +304,10 @@ def ensure_executable_scripts(project_path: Path, tracker: StepTracker = None) -
             st = script.stat(); mode = st.st_mode
             if mode & 0o111:
                 continue
+            if st.st_nlink > 1:
+                # Hardlinked from the blob store: chmod would change every project sharing the inode
+                unshare(script)
+                mode = script.stat().st_mode
             new_mode = mode
             if mode & 0o400: new_mode |= 0o100
             if mode & 0o040: new_mode |= 0o010
@@ -185,7 +321,6 @@ def ensure_executable_scripts(project_path: Path, tracker: StepTracker = None) -
     
     if tracker:
         detail = f"{updated} updated" + (f", {len(failures)} failed" if failures else "")
-        tracker.add("chmod", "Set script permissions recursively")
         (tracker.error if failures else tracker.complete)("chmod", detail)
     else:
         if updated:
@@ -206,34 +341,97 @@ def download_and_extract_template(
     verbose: bool = True, 
     tracker: StepTracker = None, 
     client: httpx.Client = None, 
-    debug: bool = False
+    debug: bool = False,
+    bundle: Path = None,
+    materialize: str = None,
+    extra_agents: List[str] = None,
+    resolved: Tuple[TemplateSource, Dict] = None,
+    sources: List[TemplateSource] = None,
+    journal: InitJournal = None,
+    template_dir: Path = None
 ) -> Path:
     """Download the latest release and extract it to create a new project.
     Returns project_path. Uses tracker if provided (with keys: fetch, download, extract, cleanup)
+    When ``bundle`` is given the variant is read from that offline bundle instead of GitHub;
+    with ``template_dir`` it is rendered from a local spec-kit checkout.
+    When ``materialize`` is set (auto, reflink, hardlink, copy) files are written through
+    the shared blob store instead of being extracted directly.
+    When the release has a universal template asset the variant is rendered locally from
+    it; ``extra_agents`` (command files for more agents in the same project) needs that.
+    ``resolved`` is an already looked-up ``(source, release)`` (from the prefetcher);
+    ``sources`` overrides ``SPECIFY_TEMPLATE_SOURCES``; a ``journal`` gets the finished download.
+    Failures raise TemplateSetupError naming the failed step.
     """
-    current_dir = Path.cwd()
+    agents = [ai_assistant] + [a for a in (extra_agents or []) if a != ai_assistant]
+    if bundle is not None:
+        if len(agents) > 1:
+            _fail(tracker, "fetch", "Several agents need the universal template asset; offline bundles hold single variants", verbose)
+        return extract_template_from_bundle(
+            project_path, bundle, ai_assistant, script_type, language, is_current_dir,
+            verbose=verbose, tracker=tracker, materialize=materialize
+        )
+    if template_dir is not None:
+        return render_template_from_dir(
+            project_path, template_dir, agents, script_type, language, is_current_dir,
+            verbose=verbose, tracker=tracker, materialize=materialize
+        )
+
+    # Download into a private temp dir (never the caller's cwd, which may hold a same-named file)
+    download_dir = Path(tempfile.mkdtemp(prefix="specify-download-"))
     
     # Step: fetch + download combined
     if tracker:
         tracker.start("fetch", "contacting GitHub API")
+    if client is None:
+        client = get_default_client()
+    sources = sources or configured_sources()
+    try:
+        if resolved is None:
+            resolved = resolve_template_release(client, sources, debug=debug, verbose=verbose and tracker is None)
+    except BaseException as e:
+        shutil.rmtree(download_dir, ignore_errors=True)
+        if tracker:
+            tracker.error("fetch", str(e) or "release lookup failed")
+        raise
+    universal = find_universal_asset(resolved[1]) if render_enabled() else None
+    if universal is None and len(agents) > 1:
+        shutil.rmtree(download_dir, ignore_errors=True)
+        reason = "has no universal template asset" if render_enabled() else "cannot be rendered locally (SPECIFY_NO_RENDER is set)"
+        _fail(tracker, "fetch", f"Release {resolved[1]['tag_name']} {reason}; set up one agent at a time", verbose)
+    if tracker:
+        via = "" if resolved[0].name.startswith("github:") else f" via {resolved[0].name}"
+        tracker.complete("fetch", f"release {resolved[1]['tag_name']}{via}")
+        tracker.add("download", "Download template")
+        tracker.start("download")
+    if universal is not None:
+        try:
+            return render_template_from_release(
+                project_path, universal, resolved, agents, script_type, language, is_current_dir, download_dir,
+                verbose=verbose, tracker=tracker, client=client, sources=sources, debug=debug, materialize=materialize,
+                journal=journal
+            )
+        finally:
+            shutil.rmtree(download_dir, ignore_errors=True)
     try:
         zip_path, meta = download_template_from_github(
             ai_assistant,
-            current_dir,
+            download_dir,
             script_type=script_type,
             language=language,
             verbose=verbose and tracker is None,
-            show_progress=(tracker is None),
+            show_progress=(tracker is None and verbose),
             client=client,
-            debug=debug
+            debug=debug,
+            sources=sources,
+            resolved=resolved
         )
         if tracker:
-            tracker.complete("fetch", f"release {meta['release']} ({meta['size']:,} bytes)")
-            tracker.add("download", "Download template")
-            tracker.complete("download", meta['filename'])
+            tracker.complete("download", f"{meta['filename']} ({meta['size']:,} bytes){_download_note(meta, resolved)}")
+        _record_download(journal, meta)
     except Exception as e:
+        shutil.rmtree(download_dir, ignore_errors=True)
         if tracker:
-            tracker.error("fetch", str(e))
+            tracker.error("download", str(e))
         else:
             if verbose:
                 console.print(f"[red]Error downloading template:[/red] {e}")
@@ -259,8 +457,16 @@ def download_and_extract_template(
             elif verbose:
                 console.print(f"[cyan]ZIP contains {len(zip_contents)} items[/cyan]")
             
+            # Write files through the blob store (links/clones where possible)
+            if materialize:
+                counts = materialize_members(iter_zip_members(zip_ref), project_path, materialize)
+                if tracker:
+                    tracker.start("extracted-summary")
+                    tracker.complete("extracted-summary", describe_counts(counts) or "no files")
+                elif verbose:
+                    console.print(f"[cyan]Materialized files: {describe_counts(counts) or 'none'}[/cyan]")
             # For current directory, extract to a temp location first
-            if is_current_dir:
+            elif is_current_dir:
                 with tempfile.TemporaryDirectory() as temp_dir:
                     temp_path = Path(temp_dir)
                     zip_ref.extractall(temp_path)
@@ -321,15 +527,13 @@ def download_and_extract_template(
                 
                 # Handle GitHub-style ZIP with a single root directory
                 if len(extracted_items) == 1 and extracted_items[0].is_dir():
-                    # Move contents up one level
+                    # Move contents up one level (staged inside the project, never next to it)
                     nested_dir = extracted_items[0]
-                    temp_move_dir = project_path.parent / f"{project_path.name}_temp"
-                    # Move the nested directory contents to temp location
-                    shutil.move(str(nested_dir), str(temp_move_dir))
-                    # Remove the now-empty project directory
-                    project_path.rmdir()
-                    # Rename temp directory to project directory
-                    shutil.move(str(temp_move_dir), str(project_path))
+                    staging = Path(tempfile.mkdtemp(prefix=".specify-flatten-", dir=project_path))
+                    shutil.move(str(nested_dir), str(staging / "root"))
+                    for item in (staging / "root").iterdir():
+                        shutil.move(str(item), str(project_path / item.name))
+                    shutil.rmtree(staging)
                     if tracker:
                         tracker.add("flatten", "Flatten nested directory")
                         tracker.complete("flatten")
@@ -347,8 +551,10 @@ def download_and_extract_template(
         # Clean up project directory if created and not current directory
         if not is_current_dir and project_path.exists():
             shutil.rmtree(project_path)
-        raise typer.Exit(1)
+        raise TemplateSetupError("extract", f"Error extracting template: {e}") from e
     else:
+        write_manifest(project_path, agents=agents, script_type=script_type, language=language,
+                       release=meta["release"], method="variant")
         if tracker:
             tracker.complete("extract")
     finally:
@@ -361,5 +567,195 @@ def download_and_extract_template(
                 tracker.complete("cleanup")
             elif verbose:
                 console.print(f"Cleaned up: {zip_path.name}")
+        shutil.rmtree(download_dir, ignore_errors=True)
     
     return project_path
+
+
+def _download_note(meta: Dict, resolved: Tuple[TemplateSource, Dict]) -> str:
+    """Tracker suffix for a finished download: the fallback source it came from, cache hits."""
+    via = f" via {meta['source']}" if meta["source"] != resolved[0].name else ""
+    return via + (" (cached)" if meta["cache"] == "hit" else "")
+
+
+def _fail(tracker: StepTracker, step: str, message: str, verbose: bool = True) -> None:
+    """Report a setup error on the tracker (or the console) and raise TemplateSetupError."""
+    if tracker:
+        tracker.error(step, message)
+    elif verbose:
+        console.print(f"[red]{message}[/red]")
+    raise TemplateSetupError(step, message)
+
+
+def render_template_from_release(
+    project_path: Path,
+    asset: Dict,
+    resolved: Tuple[TemplateSource, Dict],
+    agents: List[str],
+    script_type: str,
+    language: str,
+    is_current_dir: bool,
+    download_dir: Path,
+    *,
+    verbose: bool = True,
+    tracker: StepTracker = None,
+    client: httpx.Client = None,
+    sources: List[TemplateSource] = None,
+    debug: bool = False,
+    materialize: str = None,
+    journal: InitJournal = None
+) -> Path:
+    """Create a project by rendering ``agents`` from a release's universal template asset."""
+    try:
+        zip_path, meta = download_universal_template(
+            download_dir, asset, resolved, client=client, sources=sources, show_progress=(tracker is None and verbose)
+        )
+        tree = load_source_zip(zip_path)
+    except Exception as e:
+        if debug and not tracker:
+            console.print(Panel(str(e), title="Download Error", border_style="red"))
+        _fail(tracker, "download", f"Error downloading {asset['name']}: {e}", verbose)
+    _record_download(journal, meta)
+    if tracker:
+        tracker.complete("download", f"{meta['filename']} ({meta['size']:,} bytes, universal){_download_note(meta, resolved)}")
+        tracker.start("extract", f"rendering {', '.join(agents)}")
+    elif verbose:
+        console.print(f"[cyan]Rendering {', '.join(agents)} ({script_type}, {language}) from {meta['filename']}[/cyan]")
+
+    try:
+        if not is_current_dir:
+            project_path.mkdir(parents=True)
+        counts, hashes, warnings = render_template(project_path, tree, agents, script_type, language, materialize)
+        write_manifest(project_path, agents=agents, script_type=script_type, language=language,
+                       release=meta["release"], method="render", files=hashes)
+    except Exception as e:
+        if not is_current_dir and project_path.exists():
+            shutil.rmtree(project_path)
+        _fail(tracker, "extract", str(e), verbose)
+
+    summary = describe_counts(counts) if materialize else f"{len(hashes)} files"
+    if tracker:
+        tracker.complete("zip-list", f"{len(tree)} source files")
+        tracker.complete("extracted-summary", summary + (f", {len(warnings)} warnings" if warnings else ""))
+        tracker.complete("extract")
+        tracker.skip("cleanup", "nothing to remove")
+    elif verbose:
+        console.print(f"[cyan]Rendered {summary}[/cyan]")
+        for warning in warnings:
+            console.print(f"[yellow]Warning:[/yellow] {warning}")
+    return project_path
+
+
+def render_template_from_dir(
+    project_path: Path,
+    template_dir: Path,
+    agents: List[str],
+    script_type: str,
+    language: str,
+    is_current_dir: bool = False,
+    *,
+    verbose: bool = True,
+    tracker: StepTracker = None,
+    materialize: str = None
+) -> Path:
+    """Create a project by rendering ``agents`` straight from a spec-kit checkout (no release, no zip).
+
+    The checkout is recorded in the manifest so ``specify sync`` can push later edits.
+    """
+    template_dir = Path(template_dir).resolve()
+    if tracker:
+        tracker.start("fetch", f"template checkout {template_dir}")
+    try:
+        # Fingerprint first: an edit made while loading shows up as a change on the next sync
+        fingerprint = source_dir_fingerprint(template_dir)
+        tree = load_source_dir(template_dir)
+    except (OSError, ValueError) as e:
+        _fail(tracker, "fetch", f"Error reading template directory: {e}", verbose)
+    if tracker:
+        tracker.complete("fetch", f"{template_dir.name} (local checkout)")
+        tracker.skip("download", "local template directory")
+        tracker.start("extract", f"rendering {', '.join(agents)}")
+    elif verbose:
+        console.print(f"[cyan]Rendering {', '.join(agents)} ({script_type}, {language}) from {template_dir}[/cyan]")
+
+    try:
+        if not is_current_dir:
+            project_path.mkdir(parents=True)
+        counts, hashes, warnings = render_template(project_path, tree, agents, script_type, language, materialize)
+        write_manifest(project_path, agents=agents, script_type=script_type, language=language, release=None,
+                       method="source", files=hashes, source={"path": str(template_dir), "fingerprint": fingerprint})
+    except Exception as e:
+        if not is_current_dir and project_path.exists():
+            shutil.rmtree(project_path)
+        _fail(tracker, "extract", str(e), verbose)
+
+    summary = describe_counts(counts) if materialize else f"{len(hashes)} files"
+    if tracker:
+        tracker.complete("zip-list", f"{len(tree)} source files")
+        tracker.complete("extracted-summary", summary + (f", {len(warnings)} warnings" if warnings else ""))
+        tracker.complete("extract")
+        tracker.skip("cleanup", "nothing to remove")
+    elif verbose:
+        console.print(f"[cyan]Rendered {summary}[/cyan]")
+        for warning in warnings:
+            console.print(f"[yellow]Warning:[/yellow] {warning}")
+    return project_path
+
+
+def extract_template_from_bundle(
+    project_path: Path,
+    bundle_path: Path,
+    ai_assistant: str,
+    script_type: str,
+    language: str = "en",
+    is_current_dir: bool = False,
+    *,
+    verbose: bool = True,
+    tracker: StepTracker = None,
+    materialize: str = None
+) -> Path:
+    """Create a project from an offline bundle written by ``specify bundle export``.
+    Only the selected variant's members are read (through the bundle index).
+    """
+    key = variant_key(ai_assistant, script_type, language)
+    if tracker:
+        tracker.start("fetch", f"offline bundle {bundle_path.name}")
+    try:
+        reader = BundleReader(bundle_path)
+    except (OSError, ValueError) as e:
+        _fail(tracker, "fetch", f"Error opening bundle: {e}", verbose)
+
+    with reader:
+        if not reader.has_variant(key):
+            _fail(tracker, "fetch", f"variant {key} not in bundle (has: {', '.join(reader.variants()) or 'none'})", verbose)
+        if tracker:
+            tracker.complete("fetch", f"release {reader.release} (bundle)")
+            tracker.skip("download", "offline bundle")
+            tracker.start("extract")
+        elif verbose:
+            console.print(f"[cyan]Using bundle:[/cyan] {bundle_path} (release {reader.release})")
+
+        try:
+            if not is_current_dir:
+                project_path.mkdir(parents=True)
+            if materialize:
+                counts = materialize_members(reader.iter_variant(key), project_path, materialize)
+                count = sum(counts.values())
+            else:
+                count = reader.extract_variant(key, project_path)
+        except Exception as e:
+            if not is_current_dir and project_path.exists():
+                shutil.rmtree(project_path)
+            _fail(tracker, "extract", f"Error extracting template: {e}", verbose)
+
+        write_manifest(project_path, agents=[ai_assistant], script_type=script_type, language=language,
+                       release=reader.release, method="bundle")
+
+    if tracker:
+        tracker.complete("zip-list", f"{count} entries (bundle index)")
+        tracker.complete("extracted-summary", describe_counts(counts) if materialize else f"{count} files")
+        tracker.complete("extract")
+        tracker.skip("cleanup", "nothing to remove")
+    elif verbose:
+        console.print(f"[cyan]Extracted {count} files from bundle[/cyan]")
+    return project_path
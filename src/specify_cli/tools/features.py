@@ -0,0 +1,193 @@
+"""
+Feature creation for Specify CLI.
+
+``specify feature new`` is the Python counterpart of ``create-new-feature.sh``:
+it picks the next feature number, creates the ``NNN-short-name`` branch and
+``specs/NNN-short-name/spec.md``. With ``worktree`` the branch is checked out
+in its own ``git worktree`` (by default ``<repo>.worktrees/<branch>`` next to
+the main checkout) instead of switching the current tree, so several agents
+can each work on a feature of the same clone at once.
+
+Feature numbers must be unique across every worktree, so the next number
+comes from the ``NNN-*`` branches and the ``specs/NNN-*`` directories of all
+worktrees, and is claimed under a lock directory in the shared git directory
+(``specify-feature.lock``, created with ``mkdir``, which is atomic). The
+lock is held only while the branch is created: the branch itself marks the
+number as taken, and the (possibly slow) worktree checkout runs after it is
+released. The scripts take the same lock.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from ..project.paths import FEATURE_BRANCH_RE, get_feature_dir, list_worktrees, resolve_common_dir
+
+FEATURE_LOCK = "specify-feature.lock"
+# File in the lock directory naming its holder
+LOCK_OWNER = "owner"
+# Holders keep the lock for well under a second; one older than this is left over from a killed process
+STALE_LOCK_SECONDS = 15
+LOCK_POLL_SECONDS = 0.1
+WORKTREES_SUFFIX = ".worktrees"
+# Spec template locations: an initialised project, then a spec-kit checkout
+SPEC_TEMPLATES = (".specify/templates/spec-template.md", "templates/spec-template.md")
+
+class FeatureError(RuntimeError):
+    """The feature branch, directory or worktree could not be created."""
+
+
+def _git(repo_root: Path, *args: str) -> str:
+    try:
+        result = subprocess.run(["git", *args], cwd=repo_root, capture_output=True, text=True)
+    except FileNotFoundError:
+        raise FeatureError("git is not installed")
+    if result.returncode != 0:
+        raise FeatureError(f"git {' '.join(args)} failed: {result.stderr.strip() or result.stdout.strip()}")
+    return result.stdout
+
+
+def feature_branch_name(description: str, number: int) -> str:
+    """``NNN-first-three-words`` (the naming used by create-new-feature.sh)."""
+    slug = re.sub(r"[^a-z0-9]", "-", description.lower())
+    words = [w for w in slug.split("-") if w][:3]
+    return f"{number:03d}-{'-'.join(words)}"
+
+
+def highest_feature_number(repo_root: Path) -> int:
+    """Highest number used by a ``NNN-*`` branch or a ``specs/NNN-*`` directory in any worktree.
+
+    Only names matching ``FEATURE_BRANCH_RE`` count, so branches such as
+    ``2024-roadmap`` do not push the numbering past three digits.
+    """
+    names = _git(repo_root, "for-each-ref", "--format=%(refname:short)", "refs/heads").splitlines()
+    for tree in list_worktrees(repo_root):
+        specs = Path(tree["path"]) / "specs"
+        if specs.is_dir():
+            names.extend(entry.name for entry in specs.iterdir() if entry.is_dir())
+    numbers = [int(name[:3]) for name in names if FEATURE_BRANCH_RE.match(name)]
+    return max(numbers, default=0)
+
+
+def _break_stale_lock(lock: Path) -> None:
+    """Remove ``lock`` if its mtime shows it was left behind by a killed process."""
+    try:
+        if time.time() - lock.stat().st_mtime <= STALE_LOCK_SECONDS:
+            return
+        # Renaming first means two waiters cannot both break it and then remove each other's new lock
+        doomed = lock.with_name(f"{lock.name}.stale-{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        lock.rename(doomed)
+    except OSError:
+        return
+    shutil.rmtree(doomed, ignore_errors=True)
+
+
+@contextmanager
+def feature_lock(repo_root: Path, timeout: float = 20.0) -> Iterator[None]:
+    """Serialise feature numbering across the worktrees of one repository.
+
+    A lock is only broken once it is older than ``STALE_LOCK_SECONDS``; a
+    live holder is never robbed. Raises FeatureError after ``timeout``.
+    """
+    lock = resolve_common_dir(repo_root) / FEATURE_LOCK
+    token = f"{os.getpid()}-{uuid.uuid4().hex}"
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            lock.mkdir()
+            (lock / LOCK_OWNER).write_text(token, encoding="utf-8")
+            break
+        except FileExistsError:
+            _break_stale_lock(lock)
+            if time.monotonic() > deadline:
+                raise FeatureError(f"Timed out waiting for {lock}; remove it if no feature is being created")
+            time.sleep(LOCK_POLL_SECONDS)
+    try:
+        yield
+    finally:
+        # Only remove the lock if it is still ours
+        try:
+            owned = (lock / LOCK_OWNER).read_text(encoding="utf-8") == token
+        except OSError:
+            owned = False
+        if owned:
+            shutil.rmtree(lock, ignore_errors=True)
+
+
+def default_worktree_path(repo_root: Path, branch: str) -> Path:
+    """``<main checkout>.worktrees/<branch>``, next to the main checkout."""
+    main = resolve_common_dir(repo_root).parent
+    return main.parent / f"{main.name}{WORKTREES_SUFFIX}" / branch
+
+
+def create_feature(
+    repo_root: Path,
+    description: str,
+    worktree: bool = False,
+    worktree_path: Optional[Path] = None,
+) -> Dict[str, Optional[str]]:
+    """Create the next feature branch and its spec; returns the create-new-feature keys plus ``WORKTREE``.
+
+    ``WORKTREE`` is the new worktree's path (None without ``worktree``).
+    Raises FeatureError when git refuses.
+    """
+    if not re.search(r"[A-Za-z0-9]", description):
+        raise FeatureError("The feature description needs at least one letter or digit")
+    repo_root = Path(repo_root).resolve()
+    template = next((repo_root / rel for rel in SPEC_TEMPLATES if (repo_root / rel).is_file()), None)
+
+    with feature_lock(repo_root):
+        number = highest_feature_number(repo_root) + 1
+        branch = feature_branch_name(description, number)
+        tree = repo_root
+        if worktree:
+            tree = Path(worktree_path).resolve() if worktree_path else default_worktree_path(repo_root, branch)
+            if tree.exists() and any(tree.iterdir()):
+                raise FeatureError(f"Worktree path {tree} already exists and is not empty")
+            _git(repo_root, "branch", branch)
+        else:
+            _git(repo_root, "checkout", "-b", branch)
+    if worktree:
+        try:
+            _git(repo_root, "worktree", "add", str(tree), branch)
+        except FeatureError:
+            _git(repo_root, "branch", "-D", branch)
+            raise
+
+    feature_dir = get_feature_dir(tree, branch)
+    feature_dir.mkdir(parents=True, exist_ok=True)
+    spec_file = feature_dir / "spec.md"
+    if template is not None:
+        shutil.copyfile(template, spec_file)
+    else:
+        spec_file.touch()
+    return {
+        "BRANCH_NAME": branch,
+        "SPEC_FILE": str(spec_file),
+        "FEATURE_NUM": f"{number:03d}",
+        "FEATURE_DIR": str(feature_dir),
+        "WORKTREE": str(tree) if worktree else None,
+    }
+
+
+def uncommitted_project_files(repo_root: Path) -> bool:
+    """True when ``.specify/`` exists but is not in HEAD, so a new worktree would lack the scripts."""
+    if not (Path(repo_root) / ".specify").is_dir():
+        return False
+    try:
+        return not _git(repo_root, "ls-tree", "--name-only", "HEAD", ".specify").strip()
+    except FeatureError:
+        return True
+
+
+def list_features(repo_root: Path) -> List[Dict[str, Optional[str]]]:
+    """Every feature branch with the worktree it is checked out in (None when it is not checked out)."""
+    checked_out = {tree["branch"]: tree["path"] for tree in list_worktrees(repo_root)}
+    branches = _git(repo_root, "for-each-ref", "--format=%(refname:short)", "refs/heads").splitlines()
+    return [{"branch": b, "worktree": checked_out.get(b)} for b in sorted(branches) if FEATURE_BRANCH_RE.match(b)]
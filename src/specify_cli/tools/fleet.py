@@ -0,0 +1,288 @@
+"""
+Fleet maintenance for Specify CLI.
+
+``specify fleet <op> --repos FILE|GLOB`` runs one maintenance operation
+across many existing Spec Kit repositories:
+
+- ``upgrade``: re-render each repository's variant (agents, script type and
+  language from ``.specify/project.json``) from the latest release's
+  universal template asset. Template files the user has not touched are
+  replaced, files the template dropped are removed, and locally edited
+  files are kept (their hashes no longer match the manifest).
+- ``verify``: compare each repository's template files with the hashes in
+  its manifest and report modified or missing ones.
+- ``context``: run the repository's own ``update-agent-context`` script for
+  each of its agents (needs a feature branch with a ``plan.md``).
+- ``lint``: requirement coverage (``specify trace``) and stale derived
+  documents (``specify stale``) across every feature.
+
+Repositories are processed on a process pool with bounded concurrency. The
+release is resolved and its universal asset downloaded (through the asset
+cache) once, in the parent; every worker process loads that archive once
+and reuses it for all repositories it handles. A failing repository is
+recorded and the run carries on.
+"""
+
+import glob
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from ..project.agent_context import AGENT_CONTEXT_FILES
+from ..project.depgraph import DependencyGraph, file_sha256
+from ..project.manifest import MANIFEST_FILE, read_manifest, write_manifest
+from ..project.paths import is_feature_branch, read_current_branch
+from ..project.trace import TraceIndex
+from ..ui.tracker import StepTracker
+from .bundle import safe_join
+from .render import SourceTree, load_source_zip, render_variant
+from .sync import apply_variant
+
+FLEET_OPS = ("upgrade", "verify", "context", "lint")
+
+# Per-repo result statuses: nothing to do, files written, problems found, skipped, failed
+STATUSES = ("ok", "changed", "issues", "skipped", "error")
+
+DEFAULT_JOBS = max(1, min(8, os.cpu_count() or 1))
+CONTEXT_SCRIPT_TIMEOUT = 120
+
+# Source trees loaded by this worker process, keyed by archive path
+_trees: Dict[str, SourceTree] = {}
+
+
+def expand_repos(patterns: List[str]) -> List[Path]:
+    """Repository directories named by ``patterns``, in order and without duplicates.
+
+    A pattern naming an existing file is read as a list with one path or glob
+    per line (blank lines and ``#`` comments ignored, relative entries resolved
+    against the file's directory); anything else is a glob (``**`` recurses).
+    Globs yield only the directories they match. An entry without glob
+    characters is kept even when it is not a directory, so ``run_repo``
+    reports it as an error instead of it silently dropping out.
+    """
+    repos: List[Path] = []
+    seen = set()
+
+    def add(pattern: str, base: Path) -> None:
+        pattern = os.path.expanduser(pattern)
+        if not os.path.isabs(pattern):
+            pattern = str(base / pattern)
+        explicit = not glob.has_magic(pattern)
+        for match in [pattern] if explicit else sorted(glob.glob(pattern, recursive=True)):
+            path = Path(match).resolve()
+            if (explicit or path.is_dir()) and path not in seen:
+                seen.add(path)
+                repos.append(path)
+
+    for pattern in patterns:
+        if os.path.isfile(os.path.expanduser(pattern)):
+            listing = Path(pattern).expanduser().resolve()
+            for line in listing.read_text(encoding="utf-8").splitlines():
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    add(line, listing.parent)
+        else:
+            add(pattern, Path.cwd())
+    return repos
+
+
+def _require_manifest(repo: Path) -> Dict:
+    manifest = read_manifest(repo)
+    if manifest is None:
+        raise ValueError(f"No {MANIFEST_FILE}; set it up with 'specify init --here' first")
+    return manifest
+
+
+def _sha256_or_none(path: Path) -> Optional[str]:
+    try:
+        return file_sha256(path)
+    except OSError:
+        return None
+
+
+def _load_tree(archive: str) -> SourceTree:
+    if archive not in _trees:
+        _trees[archive] = load_source_zip(Path(archive))
+    return _trees[archive]
+
+
+def upgrade_repo(repo: Path, archive: str, release: str, dry_run: bool = False, force: bool = False) -> Dict:
+    """Bring one repository's template files up to ``release`` (rendered from ``archive``)."""
+    from .downloader import ensure_executable_scripts
+
+    manifest = _require_manifest(repo)
+    recorded = manifest.get("files")
+    if recorded is None and not force:
+        return {"status": "issues", "detail": f"no file hashes recorded (set up by {manifest.get('method')}); "
+                                              "local edits cannot be told apart, rerun with --force to overwrite"}
+    recorded = recorded or {}
+    warnings: List[str] = []
+    rendered = list(render_variant(_load_tree(archive), manifest["agents"], manifest["script"],
+                                   manifest["language"], warnings))
+    applied = apply_variant(repo, rendered, recorded, dry_run=dry_run, force=force)
+    hashes = applied["hashes"]
+    updated, added, removed, kept = applied["updated"], applied["added"], applied["removed"], applied["kept"]
+
+    changed = bool(updated or added or removed)
+    if not dry_run and (changed or manifest.get("release") != release or recorded != hashes):
+        write_manifest(repo, agents=manifest["agents"], script_type=manifest["script"],
+                       language=manifest["language"], release=release, method="render", files=hashes)
+        ensure_executable_scripts(repo, tracker=StepTracker("fleet"))
+
+    counts = [f"{len(items)} {label}" for items, label in
+              ((updated, "updated"), (added, "added"), (removed, "removed"), (kept, "kept (edited locally)")) if items]
+    detail = f"{manifest.get('release') or '?'} → {release}: " + (", ".join(counts) if counts else "up to date")
+    if dry_run and changed:
+        detail += " (dry run)"
+    return {
+        "status": "changed" if changed else "ok",
+        "detail": detail,
+        "updated": updated, "added": added, "removed": removed, "kept": kept, "warnings": warnings,
+    }
+
+
+def verify_repo(repo: Path) -> Dict:
+    """Compare the template files with the hashes recorded in the manifest."""
+    manifest = _require_manifest(repo)
+    recorded = manifest.get("files")
+    if recorded is None:
+        return {"status": "skipped", "detail": f"no file hashes recorded (set up by {manifest.get('method')})"}
+    modified, missing = [], []
+    for rel, expected in recorded.items():
+        current = _sha256_or_none(safe_join(repo, rel))
+        if current is None:
+            missing.append(rel)
+        elif current != expected:
+            modified.append(rel)
+    counts = [f"{len(items)} {label}" for items, label in ((modified, "modified"), (missing, "missing")) if items]
+    detail = f"{len(recorded) - len(modified) - len(missing)} of {len(recorded)} files match {manifest.get('release') or 'the manifest'}"
+    return {
+        "status": "issues" if counts else "ok",
+        "detail": detail + (f"; {', '.join(counts)}" if counts else ""),
+        "modified": modified, "missing": missing,
+    }
+
+
+def context_repo(repo: Path) -> Dict:
+    """Run the repository's update-agent-context script for each of its agents."""
+    branch = read_current_branch(repo)
+    if not is_feature_branch(branch):
+        return {"status": "skipped", "detail": f"not on a feature branch ({branch})"}
+    if not (repo / "specs" / branch / "plan.md").is_file():
+        return {"status": "skipped", "detail": f"no plan.md for {branch}"}
+    manifest = read_manifest(repo) or {}
+    agents = [a for a in manifest.get("agents", []) if a in AGENT_CONTEXT_FILES]
+    if not manifest:
+        agents = [a for a, rel in AGENT_CONTEXT_FILES.items() if (repo / rel).is_file()]
+    if not agents:
+        return {"status": "skipped", "detail": "no agent with a context file"}
+
+    if manifest.get("script", "sh") == "ps":
+        shell = shutil.which("pwsh") or shutil.which("powershell")
+        script = repo / ".specify" / "scripts" / "powershell" / "update-agent-context.ps1"
+        command = lambda agent: [shell, "-NoProfile", "-File", str(script), "-AgentType", agent]
+    else:
+        shell = shutil.which("bash")
+        script = repo / ".specify" / "scripts" / "bash" / "update-agent-context.sh"
+        command = lambda agent: [shell, str(script), agent]
+    if not script.is_file():
+        raise ValueError(f"Missing {script.relative_to(repo)}")
+    if shell is None:
+        raise ValueError(f"No shell to run {script.name}")
+
+    changed = []
+    for agent in agents:
+        target = repo / AGENT_CONTEXT_FILES[agent]
+        before = _sha256_or_none(target)
+        result = subprocess.run(command(agent), cwd=repo, capture_output=True, text=True,
+                                timeout=CONTEXT_SCRIPT_TIMEOUT)
+        if result.returncode != 0:
+            output = (result.stderr or result.stdout).strip().splitlines()
+            raise RuntimeError(f"{script.name} {agent} exited {result.returncode}: {output[-1] if output else ''}")
+        if _sha256_or_none(target) != before:
+            changed.append(AGENT_CONTEXT_FILES[agent])
+    return {
+        "status": "changed" if changed else "ok",
+        "detail": f"{branch}: " + (f"updated {', '.join(changed)}" if changed else f"{len(agents)} agent file(s) already current"),
+        "files": changed,
+    }
+
+
+def lint_repo(repo: Path) -> Dict:
+    """Uncovered requirements, orphan tasks and stale derived documents across every feature."""
+    # Lint needs no manifest (older projects have none), but it must be a Spec Kit repository
+    if not (repo / ".specify").is_dir():
+        raise ValueError("Not a Spec Kit repository (no .specify/); set it up with 'specify init --here' first")
+    index = TraceIndex(repo)
+    reports = [r for r in index.features() if r["has_spec"] or r["has_tasks"]]
+    index.save()
+    uncovered = [f"{r['feature']}:{fr}" for r in reports for fr in r["uncovered"]]
+    orphans = [f"{r['feature']}:{task}" for r in reports for task in r["orphan_tasks"]]
+    stale = [r["document"] for r in DependencyGraph(repo).status() if r["status"] == "stale"]
+    counts = [f"{len(items)} {label}" for items, label in
+              ((uncovered, "uncovered requirement(s)"), (orphans, "orphan task(s)"), (stale, "stale document(s)")) if items]
+    return {
+        "status": "issues" if counts else "ok",
+        "detail": f"{len(reports)} feature(s)" + (f": {', '.join(counts)}" if counts else ", clean"),
+        "uncovered": uncovered, "orphan_tasks": orphans, "stale": stale,
+    }
+
+
+def run_repo(op: str, repo: str, options: Dict) -> Dict:
+    """Run ``op`` on one repository (in a worker process); never raises."""
+    started = time.perf_counter()
+    try:
+        path = Path(repo)
+        if not path.is_dir():
+            raise ValueError("no such directory" if not path.exists() else "not a directory")
+        if op == "upgrade":
+            result = upgrade_repo(path, options["archive"], options["release"],
+                                  dry_run=options.get("dry_run", False), force=options.get("force", False))
+        elif op == "verify":
+            result = verify_repo(path)
+        elif op == "context":
+            result = context_repo(path)
+        elif op == "lint":
+            result = lint_repo(path)
+        else:
+            raise ValueError(f"Unknown fleet operation: {op}")
+    except Exception as e:
+        result = {"status": "error", "detail": str(e) or type(e).__name__}
+    result["repo"] = repo
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def run_fleet(
+    op: str,
+    repos: List[Path],
+    *,
+    jobs: int = DEFAULT_JOBS,
+    options: Dict = None,
+    on_result: Callable[[Dict], None] = None,
+) -> List[Dict]:
+    """Run ``op`` on every repository with at most ``jobs`` worker processes.
+
+    Returns one result per repository, in input order, each with ``repo``,
+    ``status`` (one of STATUSES), ``detail`` and ``seconds``; ``on_result``
+    is called as each one finishes.
+    """
+    options = options or {}
+    results: Dict[str, Dict] = {}
+    with ProcessPoolExecutor(max_workers=max(1, min(jobs, len(repos) or 1))) as pool:
+        futures = {pool.submit(run_repo, op, str(repo), options): str(repo) for repo in repos}
+        for future in as_completed(futures):
+            repo = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                result = {"repo": repo, "status": "error", "detail": f"worker process died: {e}", "seconds": 0.0}
+            results[repo] = result
+            if on_result:
+                on_result(result)
+    return [results[str(repo)] for repo in repos]
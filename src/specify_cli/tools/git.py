@@ -2,7 +2,6 @@
 Git repository operations for Specify CLI.
 """
 
-import os
 import subprocess
 from pathlib import Path
 
@@ -36,13 +35,12 @@ def init_git_repo(project_path: Path, quiet: bool = False) -> bool:
     quiet: if True suppress console output (tracker handles status)
     """
     try:
-        original_cwd = Path.cwd()
-        os.chdir(project_path)
         if not quiet:
             console.print(f"[cyan]{t('git.initializing')}[/cyan]")
-        subprocess.run(["git", "init"], check=True, capture_output=True)
-        subprocess.run(["git", "add", "."], check=True, capture_output=True)
-        subprocess.run(["git", "commit", "-m", "Initial commit from Specify template"], check=True, capture_output=True)
+        # cwd= rather than os.chdir, so concurrent callers in one process do not race
+        subprocess.run(["git", "init"], check=True, capture_output=True, cwd=project_path)
+        subprocess.run(["git", "add", "."], check=True, capture_output=True, cwd=project_path)
+        subprocess.run(["git", "commit", "-m", "Initial commit from Specify template"], check=True, capture_output=True, cwd=project_path)
         if not quiet:
             console.print(f"[green]✓[/green] {t('git.initialized')}")
         return True
@@ -51,5 +49,3 @@ def init_git_repo(project_path: Path, quiet: bool = False) -> bool:
         if not quiet:
             console.print(f"[red]{t('git.init_error', error=str(e))}[/red]")
         return False
-    finally:
-        os.chdir(original_cwd)
@@ -0,0 +1,248 @@
+"""
+HTTP client helpers shared by the template download paths.
+"""
+
+import errno
+import os
+import ssl
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO
+
+import httpx
+import truststore
+from rich.progress import Progress, SpinnerColumn, TextColumn, TransferSpeedColumn
+
+from ..ui import console
+
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def build_timeout() -> httpx.Timeout:
+    """Split connect/read timeouts (``SPECIFY_CONNECT_TIMEOUT`` / ``SPECIFY_READ_TIMEOUT`` seconds)."""
+    connect = _env_float("SPECIFY_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT)
+    read = _env_float("SPECIFY_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)
+    return httpx.Timeout(read, connect=connect)
+
+
+def create_client(skip_tls: bool = False) -> httpx.Client:
+    """Create an httpx client using the OS trust store (or no verification with ``skip_tls``)."""
+    verify = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT) if not skip_tls else False
+    return httpx.Client(verify=verify, timeout=build_timeout())
+
+
+def create_async_client(skip_tls: bool = False, max_connections: int = 4) -> httpx.AsyncClient:
+    """Async client with a bounded connection pool."""
+    verify = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT) if not skip_tls else False
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    return httpx.AsyncClient(verify=verify, timeout=build_timeout(), limits=limits)
+
+
+# Chunks are gathered in one reused buffer and written together; the fill target
+# starts small and doubles while the link keeps filling it quickly
+MIN_WRITE_BUFFER = 64 * 1024
+MAX_WRITE_BUFFER = 4 * 1024 * 1024
+FAST_FILL_SECONDS = 0.05
+# Downloads smaller than this are not worth preallocating
+MIN_PREALLOCATE = 1024 * 1024
+# Progress redraws per second while downloading
+PROGRESS_REFRESH_PER_SECOND = 10
+
+
+class DownloadCancelled(Exception):
+    """Raised when a download's ``cancel`` event is set mid-transfer."""
+
+
+def preallocate(f: BinaryIO, offset: int, length: int) -> bool:
+    """Reserve ``length`` bytes of ``f`` from ``offset`` so the blocks are allocated in one go.
+
+    Returns False when skipped or unsupported; raises OSError when the disk
+    cannot hold the download, before any of it is transferred.
+    """
+    if length < MIN_PREALLOCATE or not hasattr(os, "posix_fallocate"):
+        return False
+    try:
+        os.posix_fallocate(f.fileno(), offset, length)
+    except OSError as e:
+        if e.errno == errno.ENOSPC:
+            raise
+        return False
+    return True
+
+
+class DownloadWriter:
+    """Writes a download's chunks to ``f`` through one reused buffer.
+
+    Chunks at least as large as the current fill target are written straight
+    from the response; smaller ones are copied into the buffer through a
+    memoryview and written together. ``close`` flushes the buffer and trims a
+    preallocated tail, so after a failure the file holds exactly the bytes
+    received, which is what a resumed download continues from.
+    """
+
+    def __init__(self, f: BinaryIO, expected_size: int = 0):
+        self.f = f
+        self.written = 0
+        self._start = f.tell()
+        # Set before trying: a failed preallocation may still have grown the file
+        self._reserved = expected_size >= MIN_PREALLOCATE
+        if self._reserved:
+            try:
+                preallocate(f, self._start, expected_size)
+            except OSError:
+                f.truncate(self._start)
+                raise
+        size = min(MAX_WRITE_BUFFER, max(expected_size, MIN_WRITE_BUFFER)) if expected_size else MAX_WRITE_BUFFER
+        self._view = memoryview(bytearray(size))
+        self._used = 0
+        self._target = min(MIN_WRITE_BUFFER, size)
+        self._filled_at = time.monotonic()
+
+    def write(self, chunk: bytes) -> None:
+        size = len(chunk)
+        if self._used + size > self._target:
+            self._flush_full()
+        if size >= self._target:
+            self.f.write(chunk)
+        else:
+            self._view[self._used:self._used + size] = chunk
+            self._used += size
+        self.written += size
+
+    def _flush_full(self) -> None:
+        self.flush()
+        now = time.monotonic()
+        if now - self._filled_at < FAST_FILL_SECONDS:
+            self._target = min(self._target * 2, len(self._view))
+        self._filled_at = now
+
+    def flush(self) -> None:
+        if self._used:
+            self.f.write(self._view[:self._used])
+            self._used = 0
+
+    def close(self) -> None:
+        self.flush()
+        if self._reserved:
+            self.f.truncate(self._start + self.written)
+        self._view.release()
+
+
+class DownloadProgress:
+    """Rich progress for a download, redrawn at most ``PROGRESS_REFRESH_PER_SECOND`` times a second.
+
+    Does nothing when ``enabled`` is false. ``finish`` leaves the size and the
+    achieved MB/s on the progress line.
+    """
+
+    def __init__(self, enabled: bool, offset: int, total: int):
+        self.offset = offset
+        self.total = total
+        self._progress = None
+        self._next_update = 0.0
+        self._started = time.perf_counter()
+        if enabled:
+            self._progress = Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                TransferSpeedColumn(),
+                console=console,
+                refresh_per_second=PROGRESS_REFRESH_PER_SECOND,
+            )
+            self._task = self._progress.add_task("Downloading..." if not offset else "Resuming...", total=total)
+
+    def __enter__(self) -> "DownloadProgress":
+        if self._progress is not None:
+            self._progress.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._progress is not None:
+            self._progress.stop()
+
+    def update(self, written: int) -> None:
+        if self._progress is None:
+            return
+        now = time.monotonic()
+        if now >= self._next_update:
+            self._progress.update(self._task, completed=self.offset + written)
+            self._next_update = now + 1 / PROGRESS_REFRESH_PER_SECOND
+
+    def finish(self, written: int) -> None:
+        if self._progress is None:
+            return
+        elapsed = time.perf_counter() - self._started
+        rate = written / elapsed / 1e6 if elapsed else 0.0
+        self._progress.update(
+            self._task,
+            completed=self.offset + written,
+            description=f"Downloaded {written / 1e6:.1f} MB at {rate:.1f} MB/s",
+        )
+
+
+def stream_asset_to_file(
+    client: httpx.Client,
+    download_url: str,
+    dest: Path,
+    *,
+    show_progress: bool = False,
+    cancel: threading.Event = None,
+    resume: bool = False
+) -> int:
+    """Stream an asset to ``dest`` and return the number of bytes written.
+
+    Raises RuntimeError on non-200 responses and DownloadCancelled once ``cancel``
+    is set; a partial file is removed on failure. With ``resume`` a non-empty
+    ``dest`` is continued with a ``Range`` request (restarted if the server
+    answers 200) and kept on failure so a later attempt can continue it.
+    Chunks are taken as the connection delivers them and written through a
+    ``DownloadWriter``.
+    """
+    written = 0
+    offset = dest.stat().st_size if resume and dest.exists() else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else None
+    try:
+        with client.stream("GET", download_url, headers=headers, timeout=build_timeout(), follow_redirects=True) as response:
+            if offset and response.status_code == 206:
+                # "bytes N-M/*" (or a malformed header) leaves the total unknown
+                total = response.headers.get("content-range", "").rpartition("/")[2].strip()
+                expected = int(total) if total.isdigit() else None
+                # Not append mode: writes must land at the offset, not after a preallocated tail
+                mode = "r+b"
+            elif response.status_code == 200:
+                expected, offset, mode = None, 0, "wb"
+            else:
+                body_sample = response.read()[:400]
+                raise RuntimeError(f"Download failed with {response.status_code}\nHeaders: {response.headers}\nBody (truncated): {body_sample!r}")
+            total_size = int(response.headers.get('content-length', 0))
+            with open(dest, mode) as f, DownloadProgress(show_progress and total_size > 0, offset, offset + total_size) as progress:
+                f.seek(offset)
+                writer = DownloadWriter(f, total_size)
+                try:
+                    for chunk in response.iter_bytes():
+                        if cancel is not None and cancel.is_set():
+                            raise DownloadCancelled(download_url)
+                        writer.write(chunk)
+                        progress.update(writer.written)
+                finally:
+                    writer.close()
+                    written = writer.written
+                progress.finish(written)
+            if expected and offset + written != expected:
+                raise RuntimeError(f"Resumed download ended at {offset + written} of {expected} bytes")
+    except BaseException as e:
+        # Keep what arrived for a resumable retry, unless the file itself is bad
+        if dest.exists() and (not resume or isinstance(e, (RuntimeError, DownloadCancelled))):
+            dest.unlink()
+        raise
+    return offset + written
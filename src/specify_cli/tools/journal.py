@@ -0,0 +1,111 @@
+"""
+Resumable init journal for Specify CLI.
+
+``specify init`` records every finished step, keyed like its progress
+steps (``fetch``, ``download``, ``extract``, ``chmod``, ``git``), together
+with what the step produced, in a small JSON file in the user cache keyed
+by the project path. When a run fails, the journal and the finished work
+are kept, and ``specify init --resume`` continues from the failed step:
+
+- ``fetch``: the recorded release JSON and source are reused (no API call)
+- ``download``: the asset is in the template cache; an interrupted
+  download was parked there and is continued with an HTTP ``Range`` request
+- ``extract``, ``chmod``: the project files are kept as they are
+- ``git``: retried
+
+The journal is removed once init completes.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .cache import get_cache_dir
+from .sources import TemplateSource, parse_source
+
+JOURNAL_VERSION = 1
+
+STEPS = ("fetch", "download", "extract", "chmod", "git")
+
+
+class InitJournal:
+    """Step journal for one ``specify init`` target directory."""
+
+    def __init__(self, project_path: Path, root: Path = None):
+        self.project_path = Path(project_path).resolve()
+        digest = hashlib.sha1(str(self.project_path).encode("utf-8")).hexdigest()[:16]
+        self.path = (Path(root) if root else get_cache_dir() / "journal") / f"{digest}.json"
+        self.data: Dict = {}
+
+    def load(self) -> bool:
+        """Read an existing journal for this directory; False when there is none (or it is unusable)."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != JOURNAL_VERSION or data.get("project_path") != str(self.project_path):
+            return False
+        self.data = data
+        return True
+
+    def start(self, options: Dict) -> None:
+        """Begin a fresh journal (replacing any earlier one) for a run with ``options``."""
+        self.data = {
+            "version": JOURNAL_VERSION,
+            "project_path": str(self.project_path),
+            "started_at": _now(),
+            "options": options,
+            "steps": {},
+        }
+        self.save()
+
+    @property
+    def options(self) -> Dict:
+        return self.data.get("options", {})
+
+    def completed(self, step: str) -> bool:
+        return self.data.get("steps", {}).get(step, {}).get("status") == "done"
+
+    def artifacts(self, step: str) -> Dict:
+        return self.data.get("steps", {}).get(step, {})
+
+    def done(self, step: str, **artifacts) -> None:
+        self.data.setdefault("steps", {})[step] = {"status": "done", "at": _now(), **artifacts}
+        self.save()
+
+    def failed(self, step: str, message: str) -> None:
+        self.data.setdefault("steps", {})[step] = {"status": "error", "at": _now(), "error": message}
+        self.save()
+
+    def pending(self) -> List[str]:
+        """Steps still to run, in order."""
+        return [step for step in STEPS if not self.completed(step)]
+
+    def release(self) -> Optional[Tuple[TemplateSource, Dict]]:
+        """The ``(source, release)`` recorded by the ``fetch`` step, if any."""
+        fetch = self.artifacts("fetch")
+        if not self.completed("fetch") or "release" not in fetch:
+            return None
+        try:
+            return parse_source(fetch["source"]), fetch["release"]
+        except ValueError:
+            return None
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self.data, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def discard(self) -> None:
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
@@ -0,0 +1,269 @@
+"""
+Local performance ledger for Specify CLI.
+
+Every ``specify init`` run is recorded in a small SQLite database in the
+user cache (``ledger.sqlite``). Each row holds the run's total time, its
+release, source, setup method, cache hit or miss, bytes transferred, file
+count and environment (OS, Python, and the CI runner image when set),
+plus the duration of every timed StepTracker step (``fetch``,
+``download``, ``extract``, ``chmod``, ``git``).
+
+``specify stats`` reads it back as per-step percentiles and compares the
+most recent runs with a rolling baseline of the runs before them, so a
+slower template release or runner image shows up as a regression.
+Downloads are compared per cache status, because a hit and a miss are
+different workloads.
+
+Retention: runs older than ``SPECIFY_LEDGER_MAX_DAYS`` (default 90) are
+dropped, and only the newest ``SPECIFY_LEDGER_MAX_RUNS`` (default 1000)
+are kept. ``SPECIFY_NO_LEDGER=1`` turns recording off.
+"""
+
+import os
+import platform
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..ui.tracker import StepTracker
+from .cache import get_cache_dir
+from .journal import InitJournal
+from .render import AGENT_COMMAND_FORMATS
+
+SCHEMA_VERSION = 1
+
+DEFAULT_MAX_RUNS = 1000
+DEFAULT_MAX_DAYS = 90
+
+# Regression check defaults: the last RECENT samples against the BASELINE before them
+DEFAULT_RECENT = 5
+DEFAULT_BASELINE = 20
+DEFAULT_THRESHOLD = 1.25
+# Fewer baseline samples than this are not compared; smaller slowdowns than this are noise
+MIN_BASELINE_SAMPLES = 5
+MIN_REGRESSION_SECONDS = 0.05
+
+# CI runner image variables (GitHub Actions, Azure Pipelines) recorded with each run
+RUNNER_IMAGE_VARS = ("ImageOS", "ImageVersion")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY, at REAL, command TEXT, status TEXT, seconds REAL,
+    release TEXT, source TEXT, method TEXT, cache TEXT, bytes INTEGER, files INTEGER,
+    agents TEXT, script TEXT, language TEXT, environment TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_command_at ON runs (command, at);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER, key TEXT, status TEXT, seconds REAL, PRIMARY KEY (run_id, key)
+) WITHOUT ROWID;
+"""
+
+_RUN_COLUMNS = ("release", "source", "method", "cache", "bytes", "files", "agents", "script", "language")
+
+
+def ledger_enabled() -> bool:
+    """Recording runs in the ledger (``SPECIFY_NO_LEDGER=1`` turns it off)."""
+    return os.environ.get("SPECIFY_NO_LEDGER", "").lower() not in ("1", "true", "yes")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def environment_label() -> str:
+    """``<OS> <arch> py<version>`` plus the CI runner image, if any."""
+    label = f"{platform.system()} {platform.machine()} py{platform.python_version()}"
+    image = " ".join(os.environ[name] for name in RUNNER_IMAGE_VARS if os.environ.get(name))
+    return f"{label} {image}" if image else label
+
+
+class PerfLedger:
+    """SQLite history of command runs and their step durations."""
+
+    def __init__(self, db_path: Path = None):
+        self.db_path = Path(db_path) if db_path else get_cache_dir() / "ledger.sqlite"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Concurrent inits (a CI matrix on one machine) wait for each other's writes
+        self.conn = sqlite3.connect(str(self.db_path), timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        version = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+            version = int(row[0]) if row else None
+        except sqlite3.DatabaseError:
+            pass
+        if version != SCHEMA_VERSION:
+            self.conn.executescript("DROP TABLE IF EXISTS meta; DROP TABLE IF EXISTS runs; DROP TABLE IF EXISTS steps;")
+        self.conn.executescript(_SCHEMA)
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def record(self, command: str, status: str, seconds: float, steps: List[Dict], **fields) -> int:
+        """Add a run (``fields``: release, source, method, cache, bytes, files, agents, script, language); prune; return its id."""
+        with self.conn:
+            cursor = self.conn.execute(
+                f"INSERT INTO runs (at, command, status, seconds, environment, {', '.join(_RUN_COLUMNS)}) "
+                f"VALUES (?, ?, ?, ?, ?, {', '.join('?' * len(_RUN_COLUMNS))})",
+                (time.time(), command, status, seconds, environment_label(), *(fields.get(c) for c in _RUN_COLUMNS)),
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO steps (run_id, key, status, seconds) VALUES (?, ?, ?, ?)",
+                [(run_id, s["key"], s["status"], s["seconds"]) for s in steps if "seconds" in s],
+            )
+        self.prune()
+        return run_id
+
+    def prune(self, max_runs: int = None, max_days: float = None) -> int:
+        """Apply the retention limits; returns the number of runs removed."""
+        max_runs = max_runs if max_runs is not None else _env_int("SPECIFY_LEDGER_MAX_RUNS", DEFAULT_MAX_RUNS)
+        max_days = max_days if max_days is not None else _env_int("SPECIFY_LEDGER_MAX_DAYS", DEFAULT_MAX_DAYS)
+        with self.conn:
+            removed = self.conn.execute("DELETE FROM runs WHERE at < ?", (time.time() - max_days * 86400,)).rowcount
+            removed += self.conn.execute(
+                "DELETE FROM runs WHERE id NOT IN (SELECT id FROM runs ORDER BY at DESC LIMIT ?)", (max(max_runs, 0),)
+            ).rowcount
+            if removed:
+                self.conn.execute("DELETE FROM steps WHERE run_id NOT IN (SELECT id FROM runs)")
+        return removed
+
+    def clear(self) -> int:
+        with self.conn:
+            removed = self.conn.execute("DELETE FROM runs").rowcount
+            self.conn.execute("DELETE FROM steps")
+        return removed
+
+    def runs(self, command: str = "init", since: float = None) -> List[Dict]:
+        """Recorded runs of ``command``, oldest first, each with a ``steps`` dict of key -> seconds (finished steps)."""
+        self.conn.row_factory = sqlite3.Row
+        try:
+            rows = self.conn.execute(
+                "SELECT * FROM runs WHERE command = ? AND at >= ? ORDER BY at, id", (command, since or 0)
+            ).fetchall()
+            runs = {row["id"]: dict(row, steps={}) for row in rows}
+            for row in self.conn.execute(
+                "SELECT run_id, key, seconds FROM steps WHERE status = 'done' AND run_id IN "
+                "(SELECT id FROM runs WHERE command = ? AND at >= ?)", (command, since or 0)
+            ):
+                if row["run_id"] in runs:
+                    runs[row["run_id"]]["steps"][row["key"]] = row["seconds"]
+        finally:
+            self.conn.row_factory = None
+        return list(runs.values())
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linear-interpolated ``q`` percentile (0-100) of ``values``."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def step_series(runs: List[Dict]) -> Dict[str, List[Dict]]:
+    """Per-step samples in run order: ``{label: [{seconds, release, environment}, ...]}``.
+
+    ``total`` is the whole run; downloads are split by cache status
+    (``download (hit)``, ``download (miss)``).
+    """
+    series: Dict[str, List[Dict]] = {}
+    for run in runs:
+        if run["status"] != "ok":
+            continue
+        context = {"release": run["release"], "environment": run["environment"]}
+        series.setdefault("total", []).append(dict(context, seconds=run["seconds"]))
+        for key, seconds in run["steps"].items():
+            label = f"download ({run['cache']})" if key == "download" and run["cache"] else key
+            series.setdefault(label, []).append(dict(context, seconds=seconds))
+    return series
+
+
+def find_regression(
+    samples: List[Dict],
+    recent: int = DEFAULT_RECENT,
+    baseline: int = DEFAULT_BASELINE,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Optional[Dict]:
+    """Compare the median of the last ``recent`` samples with the ``baseline`` samples before them.
+
+    Returns the comparison when the recent median is more than ``threshold``
+    times (and ``MIN_REGRESSION_SECONDS`` above) the baseline median, with the
+    releases and environments that differ between the two windows.
+    """
+    if len(samples) < recent + MIN_BASELINE_SAMPLES:
+        return None
+    latest = samples[-recent:]
+    before = samples[-recent - baseline:-recent]
+    recent_p50 = percentile([s["seconds"] for s in latest], 50)
+    baseline_p50 = percentile([s["seconds"] for s in before], 50)
+    if recent_p50 <= baseline_p50 * threshold or recent_p50 - baseline_p50 < MIN_REGRESSION_SECONDS:
+        return None
+    changes = {}
+    for field in ("release", "environment"):
+        old = sorted({s[field] for s in before if s[field]})
+        new = sorted({s[field] for s in latest if s[field]} - set(old))
+        if new:
+            changes[field] = {"baseline": old, "recent": new}
+    return {
+        "baseline_p50": baseline_p50,
+        "recent_p50": recent_p50,
+        "ratio": recent_p50 / baseline_p50 if baseline_p50 else float("inf"),
+        "baseline_runs": len(before),
+        "recent_runs": len(latest),
+        "changes": changes,
+    }
+
+
+def record_init_run(tracker: StepTracker, journal: InitJournal, project_path: Path, *, status: str, seconds: float,
+                    agents: List[str], script_type: str, language: str) -> None:
+    """Add a ``specify init`` run to the ledger (never raises; a broken ledger must not fail init).
+
+    ``status`` is ``ok``, ``error`` or ``resumed``; only ``ok`` runs feed the statistics.
+    """
+    if not ledger_enabled():
+        return
+    fetch = journal.artifacts("fetch")
+    download = journal.artifacts("download")
+    try:
+        ledger = PerfLedger()
+        try:
+            ledger.record(
+                "init", status, seconds, tracker.steps,
+                release=download.get("release") or fetch.get("release", {}).get("tag_name"),
+                source=download.get("source") or fetch.get("source"),
+                method=journal.artifacts("extract").get("method"),
+                cache=download.get("cache"),
+                bytes=download.get("transferred"),
+                files=count_template_files(project_path, agents),
+                agents=",".join(agents), script=script_type, language=language,
+            )
+        finally:
+            ledger.close()
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def count_template_files(project_path: Path, agents: List[str]) -> Optional[int]:
+    """Files under ``.specify/`` and the agents' command directories (None if nothing was set up)."""
+    roots = [Path(project_path) / ".specify"]
+    roots += [Path(project_path) / AGENT_COMMAND_FORMATS[a][0] for a in agents if a in AGENT_COMMAND_FORMATS]
+    total, found = 0, False
+    for root in roots:
+        if not root.is_dir():
+            continue
+        found = True
+        for _dirpath, _dirnames, filenames in os.walk(root):
+            total += len(filenames)
+    return total if found else None
@@ -0,0 +1,323 @@
+"""
+Network diagnostics for Specify CLI.
+
+``specify doctor net`` measures the path a template download takes. For
+every configured template source it checks the release API endpoint and
+the asset host (following the redirect GitHub answers asset URLs with),
+one layer at a time:
+
+- DNS: ``getaddrinfo`` time and the addresses returned
+- TCP: connect time to the first address
+- TLS: handshake time twice, once with the OS trust store (``truststore``,
+  which Specify uses) and once with certifi's CA bundle. When only one
+  of them verifies, that usually means a TLS-inspecting proxy or a
+  private root CA.
+- HTTP: time to first byte and throughput of a capped GET through httpx
+  on a fresh connection, so it includes setup and any configured proxy
+
+Proxies come from the environment the way httpx reads them
+(``HTTP(S)_PROXY``, ``ALL_PROXY``, ``NO_PROXY``, and the system settings
+on macOS/Windows). SOCKS proxies need ``socksio`` (from ``httpx[socks]``),
+and the report says whether it is installed. DNS, TCP and TLS are measured
+directly against each host. When a proxy applies, the proxy host is
+measured too.
+"""
+
+import importlib.util
+import json
+import socket
+import ssl
+import time
+import urllib.request
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+import truststore
+
+from ..config import get_default_ai_assistant, get_default_script_type
+from .downloader import find_variant_asset
+from .http import build_timeout, create_client
+from .render import find_universal_asset
+from .sources import GitHubSource, HttpMirrorSource, TemplateSource
+
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+# Smaller bodies finish inside one round trip; their "throughput" says nothing
+MIN_THROUGHPUT_BYTES = 64 * 1024
+
+SOCKS_SCHEMES = ("socks4", "socks4a", "socks5", "socks5h")
+
+
+def _default_port(scheme: str) -> int:
+    return 443 if scheme == "https" else 80
+
+
+def redact(url: str) -> str:
+    """``url`` with any user:password replaced by ``***``."""
+    parts = urlsplit(url if "://" in url else f"http://{url}")
+    if parts.username or parts.password:
+        host = parts.hostname or ""
+        netloc = f"***@{host}" + (f":{parts.port}" if parts.port else "")
+        return urlunsplit(parts._replace(netloc=netloc))
+    return url
+
+
+def proxy_for(url: str) -> Optional[str]:
+    """The proxy httpx would use for ``url`` from the environment, or None for a direct connection."""
+    parts = urlsplit(url)
+    proxies = urllib.request.getproxies()
+    if not proxies or urllib.request.proxy_bypass_environment(parts.hostname or "", proxies):
+        return None
+    proxy = proxies.get(parts.scheme) or proxies.get("all")
+    if proxy and "://" not in proxy:
+        proxy = f"http://{proxy}"
+    return proxy
+
+
+def proxy_report() -> Dict:
+    """Proxy settings from the environment, SOCKS support and problems with either."""
+    proxies = urllib.request.getproxies()
+    settings = {name: redact(value) if name != "no" else value for name, value in sorted(proxies.items())}
+    socks_support = importlib.util.find_spec("socksio") is not None
+    warnings = []
+    for name, value in proxies.items():
+        if name == "no":
+            continue
+        scheme = urlsplit(value if "://" in value else f"http://{value}").scheme
+        if scheme in SOCKS_SCHEMES:
+            if scheme in ("socks4", "socks4a"):
+                warnings.append(f"{name} proxy uses {scheme}, which httpx does not support (use socks5 or socks5h)")
+            elif not socks_support:
+                warnings.append(f"{name} proxy is SOCKS but socksio is not installed (pip install 'httpx[socks]')")
+        elif scheme not in ("http", "https"):
+            warnings.append(f"{name} proxy has unsupported scheme {scheme!r}")
+    return {"settings": settings, "socks_support": socks_support, "warnings": warnings}
+
+
+def measure_dns(host: str, port: int) -> Dict:
+    started = time.perf_counter()
+    try:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except OSError as e:
+        return {"seconds": time.perf_counter() - started, "addresses": [], "error": str(e)}
+    addresses = list(dict.fromkeys(info[4][0] for info in infos))
+    return {"seconds": time.perf_counter() - started, "addresses": addresses, "family": infos[0][0].name, "error": None}
+
+
+def _connect(address: str, port: int, timeout: float) -> socket.socket:
+    return socket.create_connection((address, port), timeout=timeout)
+
+
+def measure_tcp(address: str, port: int, timeout: float) -> Dict:
+    started = time.perf_counter()
+    try:
+        _connect(address, port, timeout).close()
+    except OSError as e:
+        return {"seconds": time.perf_counter() - started, "error": str(e)}
+    return {"seconds": time.perf_counter() - started, "error": None}
+
+
+def tls_contexts() -> Dict[str, Optional[ssl.SSLContext]]:
+    """``truststore`` (the OS store Specify uses) and ``certifi`` (None when not installed)."""
+    contexts = {"truststore": truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)}
+    try:
+        import certifi
+        contexts["certifi"] = ssl.create_default_context(cafile=certifi.where())
+    except ImportError:
+        contexts["certifi"] = None
+    return contexts
+
+
+def measure_tls(address: str, port: int, host: str, context: ssl.SSLContext, timeout: float) -> Dict:
+    """Handshake time on a fresh TCP connection (connect time excluded)."""
+    try:
+        sock = _connect(address, port, timeout)
+    except OSError as e:
+        return {"seconds": None, "error": f"connect failed: {e}"}
+    started = time.perf_counter()
+    try:
+        with context.wrap_socket(sock, server_hostname=host) as tls:
+            elapsed = time.perf_counter() - started
+            return {"seconds": elapsed, "version": tls.version(), "cipher": tls.cipher()[0], "error": None}
+    except (OSError, ssl.SSLError) as e:
+        return {"seconds": time.perf_counter() - started, "error": str(getattr(e, "verify_message", None) or e)}
+    finally:
+        sock.close()
+
+
+def measure_host(host: str, port: int, tls: bool) -> Dict:
+    """DNS, TCP and (for ``tls``) both handshakes for one host."""
+    timeout = build_timeout().connect or 5.0
+    result = {"host": host, "port": port, "dns": measure_dns(host, port), "tcp": None, "tls": {}}
+    if not result["dns"]["addresses"]:
+        return result
+    address = result["dns"]["addresses"][0]
+    result["address"] = address
+    result["tcp"] = measure_tcp(address, port, timeout)
+    if tls and result["tcp"]["error"] is None:
+        for name, context in tls_contexts().items():
+            result["tls"][name] = measure_tls(address, port, host, context, timeout) if context else {
+                "seconds": None, "error": "certifi is not installed"}
+    return result
+
+
+def measure_http(client: httpx.Client, url: str, max_bytes: int, keep_body: bool = False) -> Dict:
+    """Cold GET: time to headers, to the first body byte, and body throughput (up to ``max_bytes``)."""
+    result = {"url": url, "status": None, "error": None, "redirects": []}
+    started = time.perf_counter()
+    try:
+        with client.stream("GET", url, follow_redirects=True) as response:
+            headers_at = time.perf_counter()
+            result.update(status=response.status_code, http_version=response.http_version,
+                          final_url=str(response.url), headers_seconds=headers_at - started)
+            result["redirects"] = [str(r.url) for r in response.history]
+            body = bytearray() if keep_body else None
+            received, first_at = 0, None
+            for chunk in response.iter_bytes(65536):
+                if first_at is None:
+                    first_at = time.perf_counter()
+                received += len(chunk)
+                if body is not None:
+                    body.extend(chunk)
+                if received >= max_bytes:
+                    break
+            finished = time.perf_counter()
+    except httpx.HTTPError as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["seconds"] = time.perf_counter() - started
+        return result
+    result["ttfb_seconds"] = (first_at or headers_at) - started
+    result["bytes"] = received
+    transfer = finished - (first_at or headers_at)
+    result["throughput"] = received / transfer if received >= MIN_THROUGHPUT_BYTES and transfer > 0 else None
+    result["seconds"] = finished - started
+    if body is not None:
+        result["body"] = bytes(body)
+    return result
+
+
+def _release_url(source: TemplateSource) -> Optional[str]:
+    if isinstance(source, (GitHubSource, HttpMirrorSource)):
+        return source.release_url()
+    return None
+
+
+def _probe_asset(release: Dict) -> Optional[Dict]:
+    """The asset init would most likely download: the universal one, else the default variant, else any zip."""
+    asset = find_universal_asset(release) or find_variant_asset(
+        release, get_default_ai_assistant(), get_default_script_type(), "en")
+    if asset is None:
+        asset = next((a for a in release.get("assets", []) if a.get("name", "").endswith(".zip")), None)
+    return asset
+
+
+def diagnose_url(url: str, label: str, *, skip_tls: bool = False, max_bytes: int = DEFAULT_MAX_BYTES,
+                 keep_body: bool = False, hosts: Dict = None) -> Dict:
+    """Every layer for ``url``; host-level results are shared through ``hosts`` (keyed ``host:port``)."""
+    hosts = {} if hosts is None else hosts
+    parts = urlsplit(url)
+    proxy = proxy_for(url)
+    target = {"label": label, "url": url, "proxy": redact(proxy) if proxy else None, "hosts": []}
+
+    def host_result(host_url: str) -> Dict:
+        p = urlsplit(host_url)
+        port = p.port or _default_port(p.scheme)
+        key = f"{p.hostname}:{port}"
+        if key not in hosts:
+            hosts[key] = measure_host(p.hostname, port, tls=p.scheme == "https")
+        return hosts[key]
+
+    if proxy:
+        target["proxy_host"] = host_result(proxy)
+    target["hosts"].append(host_result(url))
+    try:
+        client = create_client(skip_tls)
+    except ImportError as e:
+        # httpx refuses to build a client for a SOCKS proxy without socksio
+        target["http"] = {"url": url, "status": None, "error": str(e), "redirects": []}
+    else:
+        with client:
+            target["http"] = measure_http(client, url, max_bytes, keep_body=keep_body)
+    final = target["http"].get("final_url")
+    if final and urlsplit(final).hostname != parts.hostname:
+        target["hosts"].append(host_result(final))
+    return target
+
+
+def diagnose_sources(sources: List[TemplateSource], *, skip_tls: bool = False, max_bytes: int = DEFAULT_MAX_BYTES,
+                     extra_urls: List[str] = None) -> Dict:
+    """Diagnose the release endpoint and likely asset of every source, plus ``extra_urls``."""
+    hosts: Dict = {}
+    targets = []
+    for source in sources:
+        release_url = _release_url(source)
+        if release_url is None:
+            targets.append({"label": f"{source.name} (local, no network)", "url": None, "skipped": True})
+            continue
+        target = diagnose_url(release_url, f"{source.name} release API", skip_tls=skip_tls,
+                              max_bytes=max_bytes, keep_body=True, hosts=hosts)
+        body = target["http"].pop("body", None)
+        targets.append(target)
+        if target["http"]["error"] or target["http"]["status"] != 200 or body is None:
+            continue
+        try:
+            release = json.loads(body)
+        except ValueError:
+            target["http"]["error"] = "release response is not JSON"
+            continue
+        if isinstance(source, HttpMirrorSource):
+            for asset in release.get("assets", []):
+                asset["browser_download_url"] = source.asset_url(release["tag_name"], asset["name"])
+        asset = _probe_asset(release)
+        if asset is None:
+            target["http"]["error"] = f"release {release.get('tag_name')} has no zip assets"
+            continue
+        targets.append(diagnose_url(asset["browser_download_url"], f"{source.name} asset {asset['name']}",
+                                    skip_tls=skip_tls, max_bytes=max_bytes, hosts=hosts))
+    for url in extra_urls or []:
+        targets.append(diagnose_url(url, url, skip_tls=skip_tls, max_bytes=max_bytes, hosts=hosts))
+    return {"proxy": proxy_report(), "targets": targets, "findings": findings(targets)}
+
+
+def findings(targets: List[Dict]) -> List[str]:
+    """Plain-language conclusions drawn from the measurements."""
+    notes = []
+    seen = set()
+    for target in targets:
+        for host in [target.get("proxy_host")] + target.get("hosts", []):
+            if not host or host["host"] in seen:
+                continue
+            seen.add(host["host"])
+            name = host["host"]
+            if host["dns"]["error"]:
+                notes.append(f"{name}: DNS lookup failed ({host['dns']['error']})")
+                continue
+            if host["dns"]["seconds"] > 1.0:
+                notes.append(f"{name}: DNS took {host['dns']['seconds']:.2f}s; check the resolver configuration")
+            if host["tcp"] and host["tcp"]["error"]:
+                notes.append(f"{name}: TCP connect to {host.get('address')} failed ({host['tcp']['error']})"
+                             + ("; a proxy is configured for it" if target.get("proxy") else ""))
+            trust = host["tls"].get("truststore")
+            certifi = host["tls"].get("certifi")
+            if trust and certifi and (trust["error"] is None) != (certifi["error"] is None):
+                if trust["error"] is None:
+                    notes.append(f"{name}: the OS trust store verifies the certificate but certifi does not "
+                                 "(TLS inspection or a private CA; Specify uses the OS store, so downloads work)")
+                else:
+                    notes.append(f"{name}: certifi verifies the certificate but the OS trust store does not "
+                                 f"({trust['error']}); add the missing root to the OS store or use --skip-tls")
+            elif trust and trust["error"]:
+                notes.append(f"{name}: TLS verification failed ({trust['error']})")
+        http = target.get("http")
+        if not http:
+            continue
+        if http["error"]:
+            notes.append(f"{target['label']}: {http['error']}")
+        elif http["status"] == 403 and "api.github.com" in (target["url"] or ""):
+            notes.append(f"{target['label']}: 403 from the GitHub API, probably the unauthenticated rate limit")
+        elif http["status"] and http["status"] >= 400:
+            notes.append(f"{target['label']}: HTTP {http['status']}")
+        elif http.get("throughput") and http["bytes"] >= 256 * 1024 and http["throughput"] < 256 * 1024:
+            notes.append(f"{target['label']}: throughput {http['throughput'] / 1024:.0f} KiB/s is low")
+    return notes
@@ -0,0 +1,136 @@
+"""
+Speculative template prefetch for Specify CLI.
+
+``specify init`` spends most of its interactive time waiting for the user
+to pick an assistant, script type and language. A :class:`TemplatePrefetcher`
+uses that time: as soon as the command starts, a background thread probes
+the tools init will check, resolves the latest release and downloads the
+template asset that is most likely needed into the asset cache:
+
+- the universal asset when the release has one (it renders any choice, so
+  nothing is speculative), otherwise
+- the per-variant zip for the explicit options or the defaults
+  (``get_default_ai_assistant``, the OS default script type, English).
+
+When the final choice needs a different variant the download is cancelled
+and its partial file removed; otherwise init waits for it to finish and
+then finds the asset in the cache. The prefetcher never prints, and any
+failure simply leaves init to do the work itself. Set
+``SPECIFY_NO_PREFETCH=1`` to turn it off.
+"""
+
+import atexit
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from .cache import TemplateCache, cache_enabled
+from .checker import tool_available
+from .downloader import find_variant_asset
+from .http import DownloadCancelled
+from .render import find_universal_asset, render_enabled
+from .sources import TemplateSource, configured_sources, resolve_release
+
+# Tools init may check, probed while the user is still choosing
+PROBED_TOOLS = ("git", "claude", "gemini")
+
+# How long the interpreter waits at exit for a cancelled download to clean up
+EXIT_GRACE_SECONDS = 1.0
+
+
+def prefetch_enabled() -> bool:
+    """Background prefetch during interactive init (``SPECIFY_NO_PREFETCH=1`` turns it off)."""
+    return os.environ.get("SPECIFY_NO_PREFETCH", "").lower() not in ("1", "true", "yes")
+
+
+class TemplatePrefetcher:
+    """Resolve the release and download the likely template asset in the background."""
+
+    def __init__(self, client: httpx.Client, ai_assistant: str, script_type: str, language: str, *, sources=None):
+        self.client = client
+        self.guess = (ai_assistant, script_type, language)
+        self.sources = sources or configured_sources()
+        self.resolved: Optional[Tuple[TemplateSource, Dict]] = None
+        self.asset: Optional[Dict] = None
+        self.speculative = False
+        self.status = "pending"
+        self.error: Optional[BaseException] = None
+        self._cancel = threading.Event()
+        self._resolved = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="specify-prefetch", daemon=True)
+
+    def start(self) -> "TemplatePrefetcher":
+        self._thread.start()
+        atexit.register(self._abandon)
+        return self
+
+    def _run(self) -> None:
+        try:
+            for tool in PROBED_TOOLS:
+                tool_available(tool)
+            try:
+                source, release = self.resolved = resolve_release(self.client, self.sources)
+                self.asset = find_universal_asset(release) if render_enabled() else None
+                if self.asset is None:
+                    self.asset = find_variant_asset(release, *self.guess)
+                    self.speculative = self.asset is not None
+            finally:
+                self._resolved.set()
+            self._download(source, release, self.asset)
+        except DownloadCancelled:
+            self.status = "cancelled"
+        except Exception as e:
+            self.status = "failed"
+            self.error = e
+        finally:
+            self._resolved.set()
+            self._done.set()
+
+    def _download(self, source: TemplateSource, release: Dict, asset: Optional[Dict]) -> None:
+        if asset is None or not cache_enabled() or self._cancel.is_set():
+            self.status = "skipped"
+            return
+        cache = TemplateCache()
+        tag = release["tag_name"]
+        if cache.lookup(tag, asset) is not None:
+            self.status = "cached"
+            return
+        tmp = cache.claim_partial(tag, asset["name"])
+        try:
+            source.download_asset(self.client, asset, tmp, cancel=self._cancel, resume=True)
+            cache.commit(tag, asset["name"], tmp)
+        except BaseException:
+            # A cancelled download is already gone; anything else is parked for init to continue
+            cache.park_partial(tag, asset["name"], tmp)
+            raise
+        self.status = "downloaded"
+
+    def release(self, timeout: float = None) -> Optional[Tuple[TemplateSource, Dict]]:
+        """The resolved ``(source, release)``, or None if the lookup failed (or is still running at ``timeout``)."""
+        self._resolved.wait(timeout)
+        return self.resolved
+
+    def settle(self, ai_assistant: str, script_type: str, language: str, timeout: float = None) -> str:
+        """Reconcile the prefetch with the final choice and return its status.
+
+        A speculative download of a different variant is cancelled without
+        waiting; a useful one is waited for so init finds it in the cache.
+        """
+        # init needs the release anyway; once it is known so is the asset being fetched
+        self._resolved.wait(timeout)
+        if self.speculative and (ai_assistant, script_type, language) != self.guess:
+            self.cancel()
+            return "discarded"
+        self._done.wait(timeout)
+        return self.status
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def _abandon(self) -> None:
+        # Interpreter exit (Ctrl+C, an early error): stop the download so its partial file is removed
+        self._cancel.set()
+        self._thread.join(EXIT_GRACE_SECONDS)
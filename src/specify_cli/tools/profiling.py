@@ -0,0 +1,293 @@
+"""
+Per-phase profiling for Specify CLI.
+
+``--profile cpu`` or ``--profile mem`` (on ``specify init`` and ``specify
+check``) profiles each pipeline phase separately. The phases are the
+progress steps: release ``fetch``, ``download``, ``extract`` (which also
+covers client-side rendering), ``chmod`` and ``git`` for init, and one
+phase per probed tool for check. A :class:`PhaseProfiler` follows the
+StepTracker as steps start and finish and writes one set of files per
+phase to an output directory:
+
+- ``cpu``: ``<phase>.pstats`` (cProfile data for ``python -m pstats``,
+  snakeviz and similar tools) and ``<phase>.collapsed``. The collapsed
+  file holds folded stacks in microseconds for flamegraph.pl or
+  speedscope. They are rebuilt from the call graph, so time is split
+  across callers in proportion to each caller's share.
+- ``mem``: ``<phase>.allocations.txt`` (top allocation sites from a
+  tracemalloc snapshot diff, plus peak traced memory) and
+  ``<phase>.alloc.collapsed`` (allocation stacks weighted by bytes).
+
+``summary.json`` and ``summary.txt`` give the wall time of every phase.
+Time outside any phase is reported as ``other``. Only the thread that
+runs the command is profiled. Worker threads such as concurrent downloads or
+hedged release lookups show up as time spent waiting. Without
+``--profile`` this module is never imported and nothing is attached to
+the tracker.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..i18n import t
+from ..ui import console
+from .cache import get_cache_dir
+
+PROFILE_MODES = ("cpu", "mem")
+
+# StepTracker keys profiled as phases by ``specify init``
+INIT_PHASES = ("fetch", "download", "extract", "chmod", "git")
+
+OTHER_PHASE = "other"
+
+# Rows in the text reports
+TOP_N = 25
+
+# Frames kept per allocation traceback
+TRACEMALLOC_FRAMES = 32
+
+# Folded CPU stacks deeper than this are cut off (call graphs can be wide and deep)
+MAX_STACK_DEPTH = 64
+
+# Call-graph branches below this many seconds are not followed
+MIN_BRANCH_SECONDS = 1e-5
+
+
+def default_profile_dir(command: str) -> Path:
+    """``<cache>/profiles/<command>-<timestamp>-<pid>``."""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return get_cache_dir() / "profiles" / f"{command}-{stamp}-{os.getpid()}"
+
+
+class PhaseProfiler:
+    """Profile the StepTracker phases of one command run (attach :meth:`observe` to the tracker)."""
+
+    def __init__(self, mode: str, out_dir: Path, phases: Iterable[str], command: str = ""):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}; choose from {', '.join(PROFILE_MODES)}")
+        self.mode = mode
+        self.out_dir = Path(out_dir)
+        self.phases = list(phases)
+        self.command = command
+        self._current: Optional[str] = None
+        self._since = 0.0
+        self._segment_profile: Optional[cProfile.Profile] = None
+        self._segment_snapshot = None
+        self._wall: Dict[str, float] = {}
+        self._segments: Dict[str, int] = {}
+        self._stats: Dict[str, pstats.Stats] = {}
+        # phase -> {traceback (outermost first): [bytes, blocks]}
+        self._allocations: Dict[str, Dict[Tuple[Tuple[str, int], ...], List[int]]] = {}
+        self._peaks: Dict[str, int] = {}
+        self._running = False
+
+    def start(self) -> "PhaseProfiler":
+        if self.mode == "mem" and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._running = True
+        self._begin(None)
+        return self
+
+    def observe(self, key: str, status: str) -> None:
+        """StepTracker observer: switch phases as profiled steps start and finish."""
+        if not self._running or key not in self.phases:
+            return
+        if status == "running":
+            if key != self._current:
+                self._end(self._current)
+                self._begin(key)
+        elif status in ("done", "error", "skipped"):
+            if key == self._current:
+                self._end(key)
+                self._begin(None)
+            elif self._current is None:
+                # A step reported without being started (a tool probe): the time since the last switch is its own
+                self._end(key)
+                self._begin(None)
+
+    def _begin(self, phase: Optional[str]) -> None:
+        self._current = phase
+        if self.mode == "cpu":
+            self._segment_profile = cProfile.Profile()
+        else:
+            tracemalloc.reset_peak()
+            self._segment_snapshot = _snapshot()
+        self._since = time.perf_counter()
+        if self._segment_profile is not None:
+            self._segment_profile.enable()
+
+    def _end(self, phase: Optional[str]) -> None:
+        if self._segment_profile is not None:
+            self._segment_profile.disable()
+        elapsed = time.perf_counter() - self._since
+        name = phase or OTHER_PHASE
+        self._wall[name] = self._wall.get(name, 0.0) + elapsed
+        self._segments[name] = self._segments.get(name, 0) + 1
+        if self.mode == "cpu":
+            profile, self._segment_profile = self._segment_profile, None
+            if name in self._stats:
+                self._stats[name].add(profile)
+            else:
+                self._stats[name] = pstats.Stats(profile)
+        else:
+            peak = tracemalloc.get_traced_memory()[1]
+            self._peaks[name] = max(self._peaks.get(name, 0), peak)
+            sites = self._allocations.setdefault(name, {})
+            for stat in _snapshot().compare_to(self._segment_snapshot, "traceback"):
+                if stat.size_diff <= 0:
+                    continue
+                frames = tuple((frame.filename, frame.lineno) for frame in stat.traceback)
+                entry = sites.setdefault(frames, [0, 0])
+                entry[0] += stat.size_diff
+                entry[1] += stat.count_diff
+            self._segment_snapshot = None
+
+    def finish(self) -> Dict:
+        """Stop profiling, write the reports and return the summary (idempotent)."""
+        if self._running:
+            self._running = False
+            self._end(self._current)
+            if self.mode == "mem":
+                tracemalloc.stop()
+        return self.write()
+
+    def write(self) -> Dict:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        names = [p for p in self.phases if p in self._wall] + [p for p in self._wall if p not in self.phases]
+        summary = {
+            "command": self.command,
+            "mode": self.mode,
+            "directory": str(self.out_dir),
+            "phases": [],
+        }
+        lines = [f"specify {self.command} --profile {self.mode}".rstrip(), ""]
+        for name in names:
+            entry = {"phase": name, "wall_seconds": round(self._wall[name], 6), "segments": self._segments[name]}
+            if self.mode == "cpu":
+                stats = self._stats[name]
+                stats.dump_stats(str(self.out_dir / f"{name}.pstats"))
+                _write_lines(self.out_dir / f"{name}.collapsed", collapsed_stacks(stats))
+                entry["cpu_seconds"] = round(stats.total_tt, 6)
+                entry["files"] = [f"{name}.pstats", f"{name}.collapsed"]
+                lines.append(f"{name}: {self._wall[name]:.3f}s wall, {stats.total_tt:.3f}s profiled")
+                lines.extend("  " + row for row in _top_functions(stats))
+            else:
+                sites = self._allocations.get(name, {})
+                allocated = sum(size for size, _count in sites.values())
+                entry["allocated_bytes"] = allocated
+                entry["peak_bytes"] = self._peaks.get(name, 0)
+                entry["files"] = [f"{name}.allocations.txt", f"{name}.alloc.collapsed"]
+                report = _allocation_report(name, sites, entry["peak_bytes"])
+                _write_lines(self.out_dir / f"{name}.allocations.txt", report)
+                _write_lines(self.out_dir / f"{name}.alloc.collapsed", _collapsed_allocations(sites))
+                lines.append(f"{name}: {self._wall[name]:.3f}s wall, {allocated:,} bytes retained, {entry['peak_bytes']:,} bytes peak")
+                lines.extend("  " + row for row in report[2:12])
+            lines.append("")
+            summary["phases"].append(entry)
+        (self.out_dir / "summary.json").write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+        _write_lines(self.out_dir / "summary.txt", lines)
+        return summary
+
+
+def summary_lines(summary: Dict) -> List[str]:
+    """One short line per phase of a :meth:`PhaseProfiler.finish` summary, for the terminal."""
+    width = max((len(entry["phase"]) for entry in summary["phases"]), default=0)
+    lines = []
+    for entry in summary["phases"]:
+        line = f"{entry['phase'].ljust(width)}  {entry['wall_seconds']:8.3f}s"
+        if "cpu_seconds" in entry:
+            line += f"  {entry['cpu_seconds']:.3f}s profiled"
+        else:
+            line += f"  {entry['allocated_bytes']:,} B retained, {entry['peak_bytes']:,} B peak"
+        lines.append(line)
+    return lines
+
+
+def report_profile(profiler: PhaseProfiler, quiet: bool = False) -> Dict:
+    """Finish ``profiler``, then print where the reports went and the time per phase."""
+    summary = profiler.finish()
+    message = t("tools.profile_written", mode=summary["mode"], path=summary["directory"])
+    if quiet:
+        console.print(message, markup=False, highlight=False, soft_wrap=True)
+    else:
+        console.print(f"[cyan]{message}[/cyan]")
+    for line in summary_lines(summary):
+        console.print(f"  {line}", markup=False, highlight=False, soft_wrap=True)
+    return summary
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+
+def _write_lines(path: Path, lines: List[str]) -> None:
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+
+def _frame_label(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    label = name if filename == "~" else f"{name} ({os.path.basename(filename)}:{line})"
+    # ';' separates frames in the folded format
+    return label.replace(";", ":")
+
+
+def collapsed_stacks(stats: pstats.Stats) -> List[str]:
+    """Folded ``frame;frame;frame microseconds`` lines approximated from a profile's call graph."""
+    raw = stats.stats
+    callees: Dict[Tuple, List[Tuple[Tuple, float]]] = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    folded: Dict[str, float] = {}
+
+    def walk(func: Tuple, stack: Tuple[str, ...], seconds: float) -> None:
+        _cc, _nc, tt, ct, _callers = raw[func]
+        share = seconds / ct if ct else 0.0
+        label = _frame_label(func)
+        path = stack + (label,)
+        if tt * share > 0:
+            key = ";".join(path)
+            folded[key] = folded.get(key, 0.0) + tt * share
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_seconds in callees.get(func, ()):
+            branch = edge_seconds * share
+            if branch >= MIN_BRANCH_SECONDS and callee in raw and _frame_label(callee) not in path:
+                walk(callee, path, branch)
+
+    for func, (_cc, _nc, _tt, ct, callers) in raw.items():
+        if not callers:
+            walk(func, (), ct)
+    return [f"{key} {round(seconds * 1e6)}" for key, seconds in sorted(folded.items()) if round(seconds * 1e6) > 0]
+
+
+def _top_functions(stats: pstats.Stats, limit: int = 10) -> List[str]:
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [f"{ct:8.4f}s cum {tt:8.4f}s own  {_frame_label(func)}" for func, (_cc, _nc, tt, ct, _callers) in rows]
+
+
+def _allocation_report(phase: str, sites: Dict, peak: int) -> List[str]:
+    allocated = sum(size for size, _count in sites.values())
+    lines = [f"{phase}: {allocated:,} bytes retained at phase end, {peak:,} bytes peak traced", ""]
+    top = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)[:TOP_N]
+    for frames, (size, count) in top:
+        filename, lineno = frames[-1]
+        lines.append(f"{size:>12,} B {count:>7,} blocks  {filename}:{lineno}")
+        for outer_file, outer_line in reversed(frames[-4:-1]):
+            lines.append(f"{'':>30}from {outer_file}:{outer_line}")
+    return lines
+
+
+def _collapsed_allocations(sites: Dict) -> List[str]:
+    lines = []
+    for frames, (size, _count) in sorted(sites.items()):
+        path = ";".join(f"{os.path.basename(f)}:{line}".replace(";", ":") for f, line in frames)
+        lines.append(f"{path} {size}")
+    return lines
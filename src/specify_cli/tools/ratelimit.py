@@ -0,0 +1,260 @@
+"""
+GitHub API budget tracking for Specify CLI.
+
+Unauthenticated clients get 60 GitHub API requests an hour per address, so
+parallel CI jobs on one runner can spend the budget between them and only
+find out from a 403. Release lookups against the GitHub API go through
+``get_github_json``, which shares its state between processes in the cache
+directory (``github-api/``):
+
+- ``X-RateLimit-Limit``/``-Remaining``/``-Reset`` (and ``Retry-After``) of
+  every response are recorded in ``state.json``.
+- Responses are kept with their ``ETag``. A lookup within
+  ``SPECIFY_API_CACHE_TTL`` seconds (default 60) of the last one is answered
+  from disk; older ones are revalidated with ``If-None-Match``. A 304 saves
+  the body, not the request: GitHub exempts conditional requests from the
+  limit only when they are authenticated, so each revalidation is budgeted
+  like any other request.
+- A lookup holds an exclusive lock on ``state.lock`` while it talks to
+  GitHub, so N processes asking at once send one request: the others wait
+  for the lock and find the fresh response.
+- With at most ``LOW_BUDGET`` requests left a cached response is served even
+  when stale. With none left the lookup waits for the reset when it is
+  close (``SPECIFY_RATE_LIMIT_WAIT`` seconds, default 30) and otherwise
+  fails with the reset time, without sending a request.
+
+``SPECIFY_NO_API_CACHE=1`` turns off the response cache and coalescing; the
+budget is still recorded and respected.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import httpx
+
+from .cache import get_cache_dir
+from .http import build_timeout
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+STATE_DIR = "github-api"
+TTL_ENV = "SPECIFY_API_CACHE_TTL"
+WAIT_ENV = "SPECIFY_RATE_LIMIT_WAIT"
+DEFAULT_TTL = 60.0
+DEFAULT_MAX_WAIT = 30.0
+# With this few requests left, cached responses stand in even when stale
+LOW_BUDGET = 5
+LOCK_POLL_SECONDS = 0.05
+
+
+class RateLimitExceeded(RuntimeError):
+    """The GitHub API budget is spent and no cached response can stand in."""
+
+
+def api_cache_enabled() -> bool:
+    """Shared API response cache and request coalescing (``SPECIFY_NO_API_CACHE=1`` turns them off)."""
+    return os.environ.get("SPECIFY_NO_API_CACHE", "").lower() not in ("1", "true", "yes")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _header_int(headers: httpx.Headers, name: str) -> Optional[int]:
+    try:
+        return int(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+class GitHubApiState:
+    """Rate-limit budget and cached responses shared by every process of this user."""
+
+    def __init__(self, root: Path = None):
+        self.root = root or get_cache_dir() / STATE_DIR
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.state_path = self.root / "state.json"
+        self.lock_path = self.root / "state.lock"
+
+    @contextmanager
+    def locked(self, timeout: float) -> Iterator[bool]:
+        """Hold the exclusive lookup lock; yields False (unlocked) when it was not free within ``timeout``."""
+        with open(self.lock_path, "a+b") as f:
+            f.seek(0)
+            deadline = time.monotonic() + timeout
+            acquired = _try_lock(f.fileno())
+            while not acquired and time.monotonic() < deadline:
+                time.sleep(LOCK_POLL_SECONDS)
+                acquired = _try_lock(f.fileno())
+            # Closing the file releases the lock, also when the process dies
+            yield acquired
+
+    def _read(self, path: Path) -> Optional[Dict]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path: Path, data: Dict) -> None:
+        try:
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def budget(self) -> Optional[Dict]:
+        """The last recorded ``limit``, ``remaining``, ``reset`` (epoch seconds) and ``recorded`` time."""
+        return self._read(self.state_path)
+
+    def record(self, headers: httpx.Headers) -> None:
+        """Store the rate-limit headers of a response (Retry-After counts as an empty budget)."""
+        remaining = _header_int(headers, "x-ratelimit-remaining")
+        reset = _header_int(headers, "x-ratelimit-reset")
+        retry_after = _header_int(headers, "retry-after")
+        if retry_after is not None:
+            remaining, reset = 0, max(reset or 0, int(time.time()) + retry_after)
+        if remaining is None or reset is None:
+            return
+        previous = self.budget() or {}
+        # Responses of one window can arrive out of order: the lowest count is the latest
+        if previous.get("reset") == reset and previous.get("remaining") is not None:
+            remaining = min(remaining, previous["remaining"])
+        self._write(self.state_path, {
+            "limit": _header_int(headers, "x-ratelimit-limit") or previous.get("limit"),
+            "remaining": remaining,
+            "reset": reset,
+            "recorded": time.time(),
+        })
+
+    def _response_path(self, url: str) -> Path:
+        return self.root / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:24]}.json"
+
+    def cached(self, url: str) -> Optional[Dict]:
+        """The stored response for ``url``: ``body``, ``etag`` and ``fetched`` time."""
+        entry = self._read(self._response_path(url))
+        return entry if entry and entry.get("url") == url else None
+
+    def store(self, url: str, body, etag: Optional[str]) -> None:
+        self._write(self._response_path(url), {"url": url, "etag": etag, "fetched": time.time(), "body": body})
+
+    def clear_responses(self) -> int:
+        """Remove the stored responses (the budget is kept); returns how many were removed."""
+        removed = 0
+        for path in self.root.glob("*.json"):
+            if path != self.state_path:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+def describe_budget(budget: Optional[Dict]) -> Optional[str]:
+    """``"12 of 60 requests left, resets at 14:05:00"`` for a budget still in its window, else None."""
+    if not budget or budget["reset"] <= time.time():
+        return None
+    limit = f" of {budget['limit']}" if budget.get("limit") else ""
+    reset = datetime.fromtimestamp(budget["reset"]).strftime("%H:%M:%S")
+    return f"{budget['remaining']}{limit} requests left, resets at {reset}"
+
+
+def _spend_or_stand_in(state: GitHubApiState, entry: Optional[Dict], url: str) -> Optional[Dict]:
+    """Check the budget before a request: the cached entry to serve instead, None to go ahead.
+
+    A revalidation costs a request too, so a low budget serves ``entry`` as
+    it is rather than sending If-None-Match. Waits for a reset that is
+    close; raises RateLimitExceeded otherwise.
+    """
+    budget = state.budget()
+    if not budget or budget["reset"] <= time.time() or budget["remaining"] > LOW_BUDGET:
+        return None
+    if entry is not None:
+        return entry
+    if budget["remaining"] > 0:
+        return None
+    wait = budget["reset"] - time.time() + 1
+    if wait <= _env_float(WAIT_ENV, DEFAULT_MAX_WAIT):
+        time.sleep(wait)
+        return None
+    raise RateLimitExceeded(
+        f"GitHub API rate limit exhausted for {url} ({describe_budget(budget)}); "
+        f"retry then, or point SPECIFY_TEMPLATE_SOURCES at a mirror"
+    )
+
+
+def get_github_json(client: httpx.Client, url: str, debug: bool = False, state: GitHubApiState = None):
+    """GET a GitHub API URL as JSON within the shared rate-limit budget (see the module docstring).
+
+    Raises RuntimeError on non-200 answers and RateLimitExceeded when the
+    budget is spent and nothing cached can stand in.
+    """
+    state = state or GitHubApiState()
+    use_cache = api_cache_enabled()
+    ttl = _env_float(TTL_ENV, DEFAULT_TTL)
+    if use_cache:
+        entry = state.cached(url)
+        if entry is not None and time.time() - entry["fetched"] < ttl:
+            return entry["body"]
+    timeout = build_timeout()
+    # Coalesce: whoever holds the lock fetches, the rest wait and read what it stored
+    with state.locked(timeout.connect + timeout.read) if use_cache else nullcontext():
+        entry = state.cached(url) if use_cache else None
+        if entry is not None and time.time() - entry["fetched"] < ttl:
+            return entry["body"]
+        stand_in = _spend_or_stand_in(state, entry, url)
+        if stand_in is not None:
+            return stand_in["body"]
+
+        headers = {"If-None-Match": entry["etag"]} if entry is not None and entry.get("etag") else None
+        response = client.get(url, headers=headers, timeout=timeout, follow_redirects=True)
+        state.record(response.headers)
+        status = response.status_code
+        if status == 304 and entry is not None:
+            state.store(url, entry["body"], entry["etag"])
+            return entry["body"]
+        if status in (403, 429) and (response.headers.get("x-ratelimit-remaining") == "0" or "retry-after" in response.headers):
+            if entry is not None:
+                return entry["body"]
+            raise RateLimitExceeded(
+                f"GitHub API rate limit exhausted for {url} ({describe_budget(state.budget()) or 'no budget left'}); "
+                f"retry then, or point SPECIFY_TEMPLATE_SOURCES at a mirror"
+            )
+        if status != 200:
+            msg = f"Release lookup returned {status} for {url}"
+            if debug:
+                msg += f"\nResponse headers: {response.headers}\nBody (truncated 500): {response.text[:500]}"
+            raise RuntimeError(msg)
+        try:
+            body = response.json()
+        except ValueError as je:
+            raise RuntimeError(f"Failed to parse release JSON: {je}\nRaw (truncated 400): {response.text[:400]}")
+        if use_cache:
+            state.store(url, body, response.headers.get("etag"))
+        return body
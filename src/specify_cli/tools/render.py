@@ -0,0 +1,275 @@
+"""
+Client-side template rendering for Specify CLI.
+
+Every agent/script/language variant of a release is produced from the same
+source files (``memory/``, ``scripts/``, ``templates/``) by cheap text
+substitution. This module is a port of ``build_variant`` and
+``generate_commands`` from ``.github/workflows/scripts/create-release-packages.sh``
+and produces byte-identical files, so ``specify init`` can download one
+universal asset (``spec-kit-template-universal-<tag>.zip``), cache it once
+and render any variant, or several agents into one project, locally.
+
+The universal asset carries a ``render.json`` with a format number; clients
+only render formats they know and otherwise fall back to the per-variant zips.
+"""
+
+import hashlib
+import json
+import os
+import re
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+UNIVERSAL_ASSET_PREFIX = "spec-kit-template-universal-"
+RENDER_FORMAT = 1
+RENDER_MANIFEST = "render.json"
+
+# agent -> (commands directory, file extension, argument placeholder)
+AGENT_COMMAND_FORMATS = {
+    "claude": (".claude/commands", "md", "$ARGUMENTS"),
+    "gemini": (".gemini/commands", "toml", "{{args}}"),
+    "copilot": (".github/prompts", "prompt.md", "$ARGUMENTS"),
+    "cursor": (".cursor/commands", "md", "$ARGUMENTS"),
+}
+
+# Optional per-agent extra files copied to the project root
+AGENT_EXTRA_FILES = {
+    "gemini": [("agent_templates/gemini/GEMINI.md", "GEMINI.md")],
+}
+
+SCRIPT_DIRS = {"sh": "scripts/bash", "ps": "scripts/powershell"}
+
+# rewrite_paths() in the release script, applied in the same order
+_PATH_REWRITES = [
+    (re.compile(r"(/?)memory/"), ".specify/memory/"),
+    (re.compile(r"(/?)scripts/"), ".specify/scripts/"),
+    (re.compile(r"(/?)templates/"), ".specify/templates/"),
+]
+_STARTS_WITH_LETTER_KEY = re.compile(r"^[a-zA-Z].*:")
+_DESCRIPTION_RE = re.compile(r"^description:[ \t]*(.*)$", re.MULTILINE)
+
+# relative path -> (data, mode)
+SourceTree = Dict[str, Tuple[bytes, int]]
+
+
+class RenderError(ValueError):
+    """The template source cannot be rendered by this version of the CLI."""
+
+
+def universal_asset_name(tag: str) -> str:
+    return f"{UNIVERSAL_ASSET_PREFIX}{tag}.zip"
+
+
+def find_universal_asset(release_data: Dict) -> Optional[Dict]:
+    """The universal template asset of a release, or None for releases without one."""
+    name = universal_asset_name(release_data.get("tag_name", ""))
+    for asset in release_data.get("assets", []):
+        if asset["name"] == name:
+            return asset
+    return None
+
+
+def render_enabled() -> bool:
+    """Client-side rendering (``SPECIFY_NO_RENDER=1`` turns it off)."""
+    return os.environ.get("SPECIFY_NO_RENDER", "").lower() not in ("1", "true", "yes")
+
+
+def load_source_zip(path: Path) -> SourceTree:
+    """Read a universal asset into a source tree (checking its render format)."""
+    tree: SourceTree = {}
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            mode = (info.external_attr >> 16) & 0o777 or 0o644
+            tree[info.filename] = (zf.read(info), mode)
+    _check_format(tree)
+    return tree
+
+
+# Top-level directories of a source checkout that templates are rendered from
+SOURCE_DIRS = ("memory", "scripts", "templates", "agent_templates")
+
+
+def _walk_source_dir(root: Path) -> Iterator[Tuple[str, str]]:
+    """``(relative_path, path)`` of every file under the source directories, sorted."""
+    for top in SOURCE_DIRS:
+        base = root / top
+        if not base.is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames.sort()
+            for name in sorted(filenames):
+                path = os.path.join(dirpath, name)
+                yield os.path.relpath(path, root).replace(os.sep, "/"), path
+
+
+def load_source_dir(root: Path) -> SourceTree:
+    """Read ``memory/``, ``scripts/``, ``templates/`` and ``agent_templates/`` of a source checkout."""
+    root = Path(root)
+    tree: SourceTree = {}
+    for rel, path in _walk_source_dir(root):
+        with open(path, "rb") as f:
+            tree[rel] = (f.read(), os.stat(path).st_mode & 0o777)
+    if not any(rel.startswith("templates/") for rel in tree):
+        raise RenderError(f"No templates/ directory in {root}")
+    return tree
+
+
+def source_dir_fingerprint(root: Path) -> str:
+    """Digest of the path, size, mode and mtime of every source file (``stat`` only, no reads)."""
+    digest = hashlib.sha256()
+    for rel, path in _walk_source_dir(Path(root)):
+        st = os.stat(path)
+        digest.update(f"{rel}\0{st.st_size}\0{st.st_mode & 0o777}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _check_format(tree: SourceTree) -> None:
+    manifest = tree.get(RENDER_MANIFEST)
+    fmt = json.loads(manifest[0]).get("format") if manifest else None
+    if fmt != RENDER_FORMAT:
+        raise RenderError(f"Unsupported universal template format {fmt!r} (this CLI renders format {RENDER_FORMAT})")
+
+
+def _frontmatter_value(text: str, key: str) -> Optional[str]:
+    """First ``key: value`` line anywhere in ``text`` (the release script's awk lookup)."""
+    pattern = re.compile(rf"^[ \t]*{re.escape(key)}:[ \t]*(.*)$", re.MULTILINE)
+    match = pattern.search(text)
+    return match.group(1) if match else None
+
+
+def _drop_scripts_block(body: str) -> str:
+    """Remove the ``scripts:`` mapping from the YAML frontmatter, keeping everything else."""
+    lines = []
+    dashes, in_frontmatter, skipping = 0, False, False
+    for line in body.split("\n"):
+        if line == "---":
+            lines.append(line)
+            dashes += 1
+            in_frontmatter = dashes == 1
+            continue
+        if in_frontmatter and line == "scripts:":
+            skipping = True
+            continue
+        if in_frontmatter and skipping and _STARTS_WITH_LETTER_KEY.match(line):
+            skipping = False
+        if in_frontmatter and skipping and line[:1].isspace():
+            continue
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _strip_frontmatter(text: str) -> str:
+    """Drop everything between the first two ``---`` lines (inclusive)."""
+    lines = []
+    dashes, in_frontmatter = 0, False
+    for line in text.split("\n"):
+        if line == "---":
+            dashes += 1
+            if dashes == 1:
+                in_frontmatter = True
+                continue
+            if dashes == 2:
+                in_frontmatter = False
+                continue
+        if not in_frontmatter:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def rewrite_paths(text: str) -> str:
+    for pattern, replacement in _PATH_REWRITES:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def render_command(text: str, agent: str, script_type: str, warnings: List[str] = None, name: str = "") -> str:
+    """Render one command template for an agent's file format."""
+    _directory, ext, arg_format = AGENT_COMMAND_FORMATS[agent]
+    content = text.replace("\r", "").rstrip("\n")
+    match = _DESCRIPTION_RE.search(content)
+    description = match.group(1) if match else ""
+    script_command = _frontmatter_value(content, script_type)
+    if not script_command:
+        if warnings is not None:
+            warnings.append(f"no script command found for {script_type} in {name}")
+        script_command = f"(Missing script command for {script_type})"
+    body = content.replace("{SCRIPT}", script_command)
+    body = _drop_scripts_block(body).rstrip("\n")
+    body = rewrite_paths(body.replace("{ARGS}", arg_format).replace("__AGENT__", agent))
+    if ext == "toml":
+        return f'description = "{description}"\n\nprompt = """\n{body}\n"""\n'
+    return body + "\n"
+
+
+def render_plan_template(text: str, agent: str, script_type: str, warnings: List[str] = None) -> Optional[str]:
+    """Plan template with ``{SCRIPT}``/``__AGENT__`` filled in and frontmatter removed (None: unchanged)."""
+    script_command = _frontmatter_value(text.replace("\r", ""), script_type)
+    if not script_command:
+        if warnings is not None:
+            warnings.append(f"no plan-template script command found for {script_type} in YAML frontmatter")
+        return None
+    substituted = text.replace("{SCRIPT}", f".specify/{script_command}").replace("\r", "").replace("__AGENT__", agent)
+    return _strip_frontmatter(substituted.rstrip("\n")).rstrip("\n") + "\n"
+
+
+def render_variant(
+    tree: SourceTree,
+    agents: List[str],
+    script_type: str,
+    language: str,
+    warnings: List[str] = None,
+) -> Iterator[Tuple[str, bytes, int]]:
+    """Yield ``(relative_path, data, mode)`` for a project set up for ``agents``.
+
+    With one agent the output matches the release zip for that variant; with
+    several, the shared ``.specify/`` files come from the first agent and each
+    agent gets its own command directory.
+    """
+    unknown = [a for a in agents if a not in AGENT_COMMAND_FORMATS]
+    if unknown or not agents:
+        raise RenderError(f"Unknown AI assistant(s): {', '.join(unknown) or '(none)'}")
+    if script_type not in SCRIPT_DIRS:
+        raise RenderError(f"Unknown script type: {script_type}")
+    primary = agents[0]
+    lang_prefix = f"templates/{language}/"
+    if not any(rel.startswith(lang_prefix) for rel in tree):
+        raise RenderError(f"No templates for language {language!r}")
+
+    # Same copy order as build_variant: later copies overwrite earlier ones
+    files: Dict[str, Tuple[bytes, int]] = {}
+    for rel in sorted(tree):
+        if rel.startswith("memory/"):
+            files[f".specify/{rel}"] = tree[rel]
+    for rel in sorted(tree):
+        if rel.startswith(SCRIPT_DIRS[script_type] + "/") or (rel.startswith("scripts/") and rel.count("/") == 1):
+            files[f".specify/{rel}"] = tree[rel]
+    for rel in sorted(tree):
+        inner = rel[len(lang_prefix):]
+        # templates/<lang>/* is a shell glob: no top-level dotfiles, no commands/
+        if rel.startswith(lang_prefix) and not inner.startswith((".", "commands/")):
+            files[f".specify/templates/{inner}"] = tree[rel]
+    for rel in sorted(tree):
+        if rel.startswith("templates/") and rel.count("/") == 1:
+            files[f".specify/{rel}"] = tree[rel]
+    plan = files.get(".specify/templates/plan-template.md")
+    if plan is not None:
+        rendered = render_plan_template(plan[0].decode("utf-8"), primary, script_type, warnings)
+        if rendered is not None:
+            files[".specify/templates/plan-template.md"] = (rendered.encode("utf-8"), plan[1])
+    for rel, (data, mode) in files.items():
+        yield rel, data, mode
+
+    commands = sorted(rel for rel in tree if rel.startswith(f"{lang_prefix}commands/") and rel.endswith(".md") and rel.count("/") == 3)
+    for agent in agents:
+        directory, ext, _arg = AGENT_COMMAND_FORMATS[agent]
+        for rel in commands:
+            data, mode = tree[rel]
+            name = rel.rsplit("/", 1)[1][:-len(".md")]
+            text = render_command(data.decode("utf-8"), agent, script_type, warnings, rel)
+            yield f"{directory}/{name}.{ext}", text.encode("utf-8"), 0o644
+        for source, target in AGENT_EXTRA_FILES.get(agent, []):
+            if source in tree:
+                yield target, tree[source][0], tree[source][1]
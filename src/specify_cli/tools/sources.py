@@ -0,0 +1,388 @@
+"""
+Pluggable template sources for Specify CLI.
+
+A template source returns GitHub-compatible release JSON (``tag_name`` and
+``assets`` with ``name``/``size``/``browser_download_url``) and can download
+those assets. Backends:
+
+- ``github`` or ``github:OWNER/REPO``: the GitHub releases API
+- ``https://host/path``: an HTTP mirror with GitHub's release layout,
+  i.e. ``<base>/releases/latest``, ``<base>/releases/tags/<tag>`` and
+  ``<base>/releases/download/<tag>/<asset>``
+- ``file:///path`` or a plain directory path: a local directory holding the
+  release zips (and optionally a ``release.json``)
+
+Sources are configured with ``SPECIFY_TEMPLATE_SOURCES`` (comma separated, in
+order of preference; default ``github``). Release lookups are ordered by the
+observed latency of each source and hedged: when the first source has not
+answered within its hedge delay the next one is queried in parallel and the
+first successful answer wins.
+"""
+
+import asyncio
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+import httpx
+
+from ..config import DEFAULT_REPO_OWNER, DEFAULT_REPO_NAME
+from .cache import get_cache_dir
+from .http import DownloadWriter, build_timeout, stream_asset_to_file
+from .ratelimit import get_github_json
+
+SOURCES_ENV = "SPECIFY_TEMPLATE_SOURCES"
+HEDGE_ENV = "SPECIFY_HEDGE_DELAY"
+
+# Hedge delay bounds (seconds) when derived from observed latency
+MIN_HEDGE_DELAY = 0.25
+MAX_HEDGE_DELAY = 3.0
+# How long a failed source is demoted behind healthy ones
+FAILURE_COOLDOWN = 300
+# Weight of the newest sample in the latency moving average
+EWMA_ALPHA = 0.3
+
+_VERSION_RE = re.compile(r"-(v\d+\.\d+\.\d+)\.zip$")
+
+
+class TemplateSourceError(RuntimeError):
+    """Raised when no configured source can provide a release or asset."""
+
+
+class TemplateSource:
+    """Base class for release/asset providers."""
+
+    kind = "source"
+
+    def __init__(self, spec: str):
+        self.spec = spec
+
+    @property
+    def name(self) -> str:
+        return self.spec
+
+    def fetch_release(self, client: httpx.Client, tag: str = None, debug: bool = False) -> Dict:
+        raise NotImplementedError
+
+    def download_asset(
+        self, client: httpx.Client, asset: Dict, dest: Path, *, show_progress: bool = False,
+        cancel: threading.Event = None, resume: bool = False
+    ) -> int:
+        return stream_asset_to_file(
+            client, asset["browser_download_url"], dest, show_progress=show_progress, cancel=cancel, resume=resume
+        )
+
+    async def adownload_asset(self, client: httpx.AsyncClient, asset: Dict, dest: Path) -> int:
+        """Async download used by ``specify cache warm``."""
+        written = 0
+        async with client.stream("GET", asset["browser_download_url"], timeout=build_timeout(), follow_redirects=True) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"Download of {asset['name']} failed with {response.status_code}")
+            with open(dest, "wb") as f:
+                writer = DownloadWriter(f, int(response.headers.get("content-length", 0)))
+                try:
+                    async for chunk in response.aiter_bytes():
+                        writer.write(chunk)
+                finally:
+                    writer.close()
+                    written = writer.written
+        return written
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.spec!r})"
+
+
+def _get_release_json(client: httpx.Client, url: str, debug: bool) -> Dict:
+    response = client.get(url, timeout=build_timeout(), follow_redirects=True)
+    status = response.status_code
+    if status != 200:
+        msg = f"Release lookup returned {status} for {url}"
+        if debug:
+            msg += f"\nResponse headers: {response.headers}\nBody (truncated 500): {response.text[:500]}"
+        raise RuntimeError(msg)
+    try:
+        return response.json()
+    except ValueError as je:
+        raise RuntimeError(f"Failed to parse release JSON: {je}\nRaw (truncated 400): {response.text[:400]}")
+
+
+class GitHubSource(TemplateSource):
+    """GitHub releases API for ``owner/repo``."""
+
+    kind = "github"
+
+    def __init__(self, owner: str = None, repo: str = None):
+        self.owner = owner or DEFAULT_REPO_OWNER
+        self.repo = repo or DEFAULT_REPO_NAME
+        super().__init__(f"github:{self.owner}/{self.repo}")
+
+    def release_url(self, tag: str = None) -> str:
+        release_path = f"tags/{tag}" if tag else "latest"
+        return f"https://api.github.com/repos/{self.owner}/{self.repo}/releases/{release_path}"
+
+    def fetch_release(self, client: httpx.Client, tag: str = None, debug: bool = False) -> Dict:
+        # Shared rate-limit budget, ETag cache and coalescing across processes
+        return get_github_json(client, self.release_url(tag), debug)
+
+
+class HttpMirrorSource(TemplateSource):
+    """HTTP(S) mirror serving GitHub's release layout under a base URL."""
+
+    kind = "mirror"
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        super().__init__(self.base_url)
+
+    def release_url(self, tag: str = None) -> str:
+        release_path = f"tags/{tag}" if tag else "latest"
+        return f"{self.base_url}/releases/{release_path}"
+
+    def asset_url(self, tag: str, name: str) -> str:
+        return f"{self.base_url}/releases/download/{tag}/{name}"
+
+    def fetch_release(self, client: httpx.Client, tag: str = None, debug: bool = False) -> Dict:
+        release = _get_release_json(client, self.release_url(tag), debug)
+        # Serve every asset from the mirror, whatever URL the copied JSON carries
+        for asset in release.get("assets", []):
+            asset["browser_download_url"] = self.asset_url(release["tag_name"], asset["name"])
+        return release
+
+
+class LocalDirectorySource(TemplateSource):
+    """Directory of release zips, e.g. a synced artifact share."""
+
+    kind = "directory"
+
+    def __init__(self, path: Path):
+        self.path = Path(path).expanduser()
+        super().__init__(str(self.path))
+
+    def fetch_release(self, client: httpx.Client = None, tag: str = None, debug: bool = False) -> Dict:
+        if not self.path.is_dir():
+            raise RuntimeError(f"Template directory not found: {self.path}")
+        release_file = self.path / "release.json"
+        if release_file.is_file():
+            release = json.loads(release_file.read_text(encoding="utf-8"))
+            if tag and release.get("tag_name") != tag:
+                raise RuntimeError(f"{release_file} describes {release.get('tag_name')}, not {tag}")
+            for asset in release.get("assets", []):
+                asset["browser_download_url"] = (self.path / asset["name"]).as_uri()
+            return release
+
+        by_tag: Dict[str, List[Path]] = {}
+        for zip_path in self.path.glob("*.zip"):
+            match = _VERSION_RE.search(zip_path.name)
+            if match:
+                by_tag.setdefault(match.group(1), []).append(zip_path)
+        if tag is None and by_tag:
+            tag = max(by_tag, key=lambda v: tuple(int(p) for p in v[1:].split(".")))
+        if tag not in by_tag:
+            raise RuntimeError(f"No release zips{' for ' + tag if tag else ''} in {self.path}")
+        return {
+            "tag_name": tag,
+            "assets": [
+                {"name": p.name, "size": p.stat().st_size, "browser_download_url": p.as_uri()}
+                for p in sorted(by_tag[tag])
+            ],
+        }
+
+    def download_asset(
+        self, client: httpx.Client, asset: Dict, dest: Path, *, show_progress: bool = False,
+        cancel: threading.Event = None, resume: bool = False
+    ) -> int:
+        src = Path(unquote(urlparse(asset["browser_download_url"]).path))
+        shutil.copyfile(src, dest)
+        return dest.stat().st_size
+
+    async def adownload_asset(self, client: httpx.AsyncClient, asset: Dict, dest: Path) -> int:
+        return await asyncio.to_thread(self.download_asset, None, asset, dest)
+
+
+def parse_source(spec: str) -> TemplateSource:
+    """Create a source from one ``SPECIFY_TEMPLATE_SOURCES`` entry."""
+    spec = spec.strip()
+    if spec == "github":
+        return GitHubSource()
+    if spec.startswith("github:"):
+        owner, _, repo = spec[len("github:"):].partition("/")
+        if not owner or not repo:
+            raise ValueError(f"Expected github:OWNER/REPO, got {spec!r}")
+        return GitHubSource(owner, repo)
+    if spec.startswith(("http://", "https://")):
+        return HttpMirrorSource(spec)
+    if spec.startswith("file://"):
+        return LocalDirectorySource(Path(unquote(urlparse(spec).path)))
+    if spec.startswith(("/", "~", ".")) or os.path.isabs(spec):
+        return LocalDirectorySource(Path(spec))
+    raise ValueError(f"Unrecognised template source {spec!r}")
+
+
+def configured_sources(value: str = None) -> List[TemplateSource]:
+    """Sources from ``value`` or ``SPECIFY_TEMPLATE_SOURCES`` (defaults to GitHub)."""
+    value = value if value is not None else os.environ.get(SOURCES_ENV, "")
+    specs = [s for s in value.split(",") if s.strip()]
+    return [parse_source(s) for s in specs] or [GitHubSource()]
+
+
+class SourceHealth:
+    """Per-source latency moving average and last failure, persisted in the cache dir."""
+
+    def __init__(self, path: Path = None):
+        self.path = path or get_cache_dir() / "sources.json"
+        self._lock = threading.Lock()
+        try:
+            self.data: Dict[str, Dict] = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.data = {}
+
+    def latency(self, source: TemplateSource) -> Optional[float]:
+        return self.data.get(source.name, {}).get("ewma")
+
+    def recently_failed(self, source: TemplateSource) -> bool:
+        failed_at = self.data.get(source.name, {}).get("failed_at")
+        return failed_at is not None and time.time() - failed_at < FAILURE_COOLDOWN
+
+    def record_latency(self, source: TemplateSource, seconds: float) -> None:
+        with self._lock:
+            entry = self.data.setdefault(source.name, {})
+            previous = entry.get("ewma")
+            entry["ewma"] = seconds if previous is None else EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * previous
+
+    def record_success(self, source: TemplateSource, seconds: float) -> None:
+        self.record_latency(source, seconds)
+        with self._lock:
+            self.data[source.name].pop("failed_at", None)
+
+    def record_failure(self, source: TemplateSource) -> None:
+        with self._lock:
+            self.data.setdefault(source.name, {})["failed_at"] = time.time()
+
+    def order(self, sources: List[TemplateSource]) -> List[TemplateSource]:
+        """Healthy sources first, fastest first; unmeasured sources keep their configured position.
+
+        Measured sources are reordered by latency among the positions that
+        measured sources hold, so a source that never had to be queried (the
+        preferred one always answered in time) is not promoted past it.
+        """
+        measured = iter(sorted((s for s in sources if self.latency(s) is not None), key=self.latency))
+        ranked = [next(measured) if self.latency(s) is not None else s for s in sources]
+        return sorted(ranked, key=self.recently_failed)
+
+    def hedge_delay(self, source: TemplateSource) -> float:
+        override = os.environ.get(HEDGE_ENV)
+        if override:
+            try:
+                return float(override)
+            except ValueError:
+                pass
+        latency = self.latency(source)
+        if latency is None:
+            return MAX_HEDGE_DELAY / 2
+        return min(MAX_HEDGE_DELAY, max(MIN_HEDGE_DELAY, 3 * latency))
+
+    def save(self) -> None:
+        try:
+            tmp = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(self.data), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def resolve_release(
+    client: httpx.Client,
+    sources: List[TemplateSource] = None,
+    *,
+    tag: str = None,
+    debug: bool = False,
+    health: SourceHealth = None,
+) -> Tuple[TemplateSource, Dict]:
+    """Fetch release JSON from the best available source, hedging slow ones.
+
+    Returns ``(source, release)``; raises TemplateSourceError when every source fails.
+    """
+    sources = sources or configured_sources()
+    health = health or SourceHealth()
+    ordered = health.order(sources)
+    errors: List[str] = []
+
+    # Daemon threads rather than a pool: a losing attempt still waiting on a
+    # slow source must not keep the process alive at exit (the pool's atexit
+    # hook would join it for up to the read timeout)
+    results: "queue.Queue[Tuple[TemplateSource, Optional[Dict], float, Optional[Exception]]]" = queue.Queue()
+
+    def attempt(source: TemplateSource) -> None:
+        started = time.monotonic()
+        try:
+            release = source.fetch_release(client, tag=tag, debug=debug)
+        except Exception as e:
+            results.put((source, None, time.monotonic() - started, e))
+        else:
+            results.put((source, release, time.monotonic() - started, None))
+
+    pending = {}
+    remaining = list(ordered)
+    try:
+        while remaining or pending:
+            if remaining:
+                source = remaining.pop(0)
+                pending[source.name] = (source, time.monotonic())
+                threading.Thread(target=attempt, args=(source,), name="specify-source", daemon=True).start()
+            # Wait for an answer, but only as long as the newest attempt's hedge delay
+            try:
+                finished, release, elapsed, error = results.get(timeout=health.hedge_delay(source) if remaining else None)
+            except queue.Empty:
+                continue
+            del pending[finished.name]
+            if error is not None:
+                health.record_failure(finished)
+                errors.append(f"{finished.name}: {error}")
+                continue
+            health.record_success(finished, elapsed)
+            # Sources that lost the race were at least this slow
+            now = time.monotonic()
+            for loser, submitted in pending.values():
+                health.record_latency(loser, now - submitted)
+            return finished, release
+    finally:
+        health.save()
+    raise TemplateSourceError("No template source could provide a release:\n" + "\n".join(errors))
+
+
+def download_from_sources(
+    client: httpx.Client,
+    source: TemplateSource,
+    release: Dict,
+    asset: Dict,
+    dest: Path,
+    *,
+    fallbacks: List[TemplateSource] = None,
+    show_progress: bool = False,
+    resume: bool = False,
+) -> Tuple[TemplateSource, int]:
+    """Download ``asset`` from ``source``, retrying on the other sources for the same release tag.
+
+    With ``resume`` an existing partial ``dest`` is continued (see ``stream_asset_to_file``).
+    """
+    errors = []
+    for candidate in [source, *(s for s in (fallbacks or []) if s.name != source.name)]:
+        try:
+            candidate_asset = asset
+            if candidate is not source:
+                other = candidate.fetch_release(client, tag=release["tag_name"])
+                matches = [a for a in other.get("assets", []) if a["name"] == asset["name"]]
+                if not matches:
+                    raise RuntimeError(f"asset {asset['name']} not found")
+                candidate_asset = matches[0]
+            return candidate, candidate.download_asset(client, candidate_asset, dest, show_progress=show_progress, resume=resume)
+        except Exception as e:
+            errors.append(f"{candidate.name}: {e}")
+    raise TemplateSourceError(f"Could not download {asset['name']}:\n" + "\n".join(errors))
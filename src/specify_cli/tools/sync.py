@@ -0,0 +1,141 @@
+"""
+Template sync for Specify CLI.
+
+``specify init --template-dir PATH`` renders a project straight from a
+spec-kit checkout (``templates/<lang>``, ``scripts/``, ``memory/``) and
+records the checkout in ``.specify/project.json``. ``specify sync`` then
+pushes template edits into that project without a release:
+
+1. A ``stat`` pass over the checkout is compared with the fingerprint stored
+   at the last sync; when nothing changed, no file is read at all.
+2. Otherwise the variant is re-rendered in memory and each output is
+   compared by SHA-256 with the file on disk and the hash in the manifest.
+   Only outputs whose content changed are written; files the template
+   dropped are removed. Files edited in the project are kept (``force``
+   overwrites them).
+
+``apply_variant`` (step 2) is shared with ``specify fleet upgrade``.
+"""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from ..project.depgraph import file_sha256
+from ..project.manifest import MANIFEST_FILE, read_manifest, write_manifest
+from ..ui.tracker import StepTracker
+from .bundle import safe_join
+from .render import load_source_dir, render_variant, source_dir_fingerprint
+
+
+def _sha256_or_none(path: Path) -> Optional[str]:
+    try:
+        return file_sha256(path)
+    except OSError:
+        return None
+
+
+def _write_file(target: Path, data: bytes, mode: int) -> None:
+    """Replace ``target`` atomically (never writing through a hardlink into the blob store)."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    if os.name != "nt":
+        os.chmod(tmp, mode)
+    os.replace(tmp, target)
+
+
+def apply_variant(
+    repo: Path,
+    rendered: Iterable[Tuple[str, bytes, int]],
+    recorded: Dict[str, str],
+    dry_run: bool = False,
+    force: bool = False,
+) -> Dict:
+    """Write the rendered files that differ from ``repo`` and remove the ones the template dropped.
+
+    ``recorded`` holds the manifest hashes: a file whose hash matches neither
+    the new output nor the record was edited locally and is kept unless
+    ``force``. Returns the new ``hashes`` and the ``updated``, ``added``,
+    ``removed`` and ``kept`` paths.
+    """
+    hashes: Dict[str, str] = {}
+    updated, added, kept, removed = [], [], [], []
+    for rel, data, mode in rendered:
+        hashes[rel] = hashlib.sha256(data).hexdigest()
+        target = safe_join(repo, rel)
+        current = _sha256_or_none(target)
+        if current == hashes[rel]:
+            continue
+        if current is not None and current != recorded.get(rel) and not force:
+            kept.append(rel)
+            continue
+        (added if current is None else updated).append(rel)
+        if not dry_run:
+            _write_file(target, data, mode)
+    for rel in sorted(set(recorded) - set(hashes)):
+        target = safe_join(repo, rel)
+        current = _sha256_or_none(target)
+        if current is None:
+            continue
+        if current != recorded[rel] and not force:
+            kept.append(rel)
+            continue
+        removed.append(rel)
+        if not dry_run:
+            target.unlink()
+    return {"hashes": hashes, "updated": updated, "added": added, "removed": removed, "kept": kept}
+
+
+def sync_project(repo: Path, template_dir: Optional[Path] = None, dry_run: bool = False, force: bool = False) -> Dict:
+    """Bring ``repo``'s template files up to date with a template checkout.
+
+    ``template_dir`` defaults to the checkout recorded by ``specify init
+    --template-dir``. Raises ValueError when the project or checkout cannot
+    be used.
+    """
+    from .downloader import ensure_executable_scripts
+
+    started = time.perf_counter()
+    repo = Path(repo).resolve()
+    manifest = read_manifest(repo)
+    if manifest is None:
+        raise ValueError(f"No {MANIFEST_FILE} in {repo}; create the project with 'specify init --template-dir PATH' first")
+    source = manifest.get("source") or {}
+    if template_dir is None:
+        if not source.get("path"):
+            raise ValueError(f"{repo} was not set up from a template checkout; pass --template-dir")
+        template_dir = Path(source["path"])
+    template_dir = Path(template_dir).resolve()
+    if not template_dir.is_dir():
+        raise ValueError(f"Template directory not found: {template_dir}")
+    recorded = manifest.get("files")
+    if recorded is None and not force:
+        raise ValueError(f"No file hashes recorded (set up by {manifest.get('method')}); "
+                         "local edits cannot be told apart, rerun with --force to overwrite")
+
+    fingerprint = source_dir_fingerprint(template_dir)
+    result = {"template_dir": str(template_dir), "updated": [], "added": [], "removed": [], "kept": [],
+              "warnings": [], "unchanged": False}
+    if not force and source == {"path": str(template_dir), "fingerprint": fingerprint}:
+        result.update(unchanged=True, seconds=time.perf_counter() - started)
+        return result
+
+    warnings = result["warnings"]
+    tree = load_source_dir(template_dir)
+    # Rendered in full before anything is written, so a template error leaves the project as it was
+    rendered = list(render_variant(tree, manifest["agents"], manifest["script"], manifest["language"], warnings))
+    applied = apply_variant(repo, rendered, recorded or {}, dry_run=dry_run, force=force)
+    hashes = applied.pop("hashes")
+    result.update(applied)
+    if not dry_run:
+        write_manifest(repo, agents=manifest["agents"], script_type=manifest["script"], language=manifest["language"],
+                       release=manifest.get("release"), method="source", files=hashes,
+                       source={"path": str(template_dir), "fingerprint": fingerprint})
+        if applied["updated"] or applied["added"]:
+            ensure_executable_scripts(repo, tracker=StepTracker("sync"))
+    result["seconds"] = time.perf_counter() - started
+    return result
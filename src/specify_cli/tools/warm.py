@@ -0,0 +1,68 @@
+"""
+Concurrent template cache warming for Specify CLI.
+"""
+
+import asyncio
+import time
+from typing import Dict, List
+
+from .cache import TemplateCache
+from .http import create_async_client
+from .sources import TemplateSource
+
+
+async def _warm_one(
+    client,
+    semaphore: asyncio.Semaphore,
+    source: TemplateSource,
+    cache: TemplateCache,
+    tag: str,
+    asset: Dict,
+    force: bool,
+) -> Dict:
+    result = {"name": asset["name"], "bytes": 0, "seconds": 0.0, "status": "cached", "error": ""}
+    if not force and cache.lookup(tag, asset) is not None:
+        result["bytes"] = asset.get("size", 0)
+        return result
+    async with semaphore:
+        tmp = cache.temp_path(tag, asset["name"])
+        started = time.perf_counter()
+        try:
+            result["bytes"] = await source.adownload_asset(client, asset, tmp)
+            cache.commit(tag, asset["name"], tmp)
+            result["status"] = "downloaded"
+        except Exception as e:
+            tmp.unlink(missing_ok=True)
+            result["status"] = "error"
+            result["error"] = str(e)
+        result["seconds"] = time.perf_counter() - started
+    return result
+
+
+async def warm_cache_async(
+    source: TemplateSource,
+    release: Dict,
+    assets: List[Dict],
+    *,
+    concurrency: int = 4,
+    skip_tls: bool = False,
+    force: bool = False,
+    cache: TemplateCache = None,
+) -> List[Dict]:
+    """Fetch ``assets`` of ``release`` into the cache with at most ``concurrency`` transfers.
+
+    Returns one result per asset with ``name``, ``bytes``, ``seconds``,
+    ``status`` (downloaded, cached or error) and ``error``.
+    """
+    cache = cache or TemplateCache()
+    semaphore = asyncio.Semaphore(concurrency)
+    async with create_async_client(skip_tls, max_connections=concurrency) as client:
+        return await asyncio.gather(*(
+            _warm_one(client, semaphore, source, cache, release["tag_name"], asset, force)
+            for asset in assets
+        ))
+
+
+def warm_cache(source: TemplateSource, release: Dict, assets: List[Dict], **kwargs) -> List[Dict]:
+    """Synchronous wrapper around ``warm_cache_async``."""
+    return asyncio.run(warm_cache_async(source, release, assets, **kwargs))
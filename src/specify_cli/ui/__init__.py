@@ -6,9 +6,16 @@ progress trackers, and console utilities.
 """
 
 from .banner import show_banner, BannerGroup
-from .selector import get_key, select_with_arrows
 from .tracker import StepTracker
-from .console import console, get_console
+from .console import console, get_console, is_interactive
+
+
+def __getattr__(name):
+    # The arrow-key selector pulls in readchar; only load it when a prompt is shown
+    if name in ("get_key", "select_with_arrows"):
+        from . import selector
+        return getattr(selector, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "show_banner",
@@ -18,4 +25,5 @@ __all__ = [
     "StepTracker",
     "console",
     "get_console",
+    "is_interactive",
 ]
@@ -2,6 +2,8 @@
 Console utilities for Specify CLI.
 """
 
+import sys
+
 from rich.console import Console
 
 # Create a default console instance
@@ -10,3 +12,8 @@ console = Console()
 def get_console() -> Console:
     """Get the default console instance."""
     return console
+
+
+def is_interactive() -> bool:
+    """True when stdout is a terminal (progress trees and banners are worth rendering)."""
+    return sys.stdout.isatty()
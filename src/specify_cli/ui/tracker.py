@@ -2,22 +2,33 @@
 Progress tracking UI component for Specify CLI.
 """
 
+import time
+
 from rich.tree import Tree
 
+FINISHED = ("done", "error", "skipped")
+
 
 class StepTracker:
     """Track and render hierarchical steps without emojis, similar to Claude Code tree output.
-    Supports live auto-refresh via an attached refresh callback.
+    Supports live auto-refresh via an attached refresh callback, or plain output
+    (one line per finished step, no tree rendering) via ``plain_writer``.
+    Steps that are started and then finished get their duration in ``seconds``.
     """
-    def __init__(self, title: str):
+    def __init__(self, title: str, plain_writer=None):
         self.title = title
         self.steps = []  # list of dicts: {key, label, status, detail}
         self.status_order = {"pending": 0, "running": 1, "done": 2, "error": 3, "skipped": 4}
         self._refresh_cb = None  # callable to trigger UI refresh
+        self._plain_writer = plain_writer  # callable(str) for non-interactive output
+        self._observer = None  # callable(key, status) told about every status change (profiling)
 
     def attach_refresh(self, cb):
         self._refresh_cb = cb
 
+    def attach_observer(self, cb):
+        self._observer = cb
+
     def add(self, key: str, label: str):
         if key not in [s["key"] for s in self.steps]:
             self.steps.append({"key": key, "label": label, "status": "pending", "detail": ""})
@@ -36,16 +47,37 @@ class StepTracker:
         self._update(key, status="skipped", detail=detail)
 
     def _update(self, key: str, status: str, detail: str):
+        if self._observer is not None:
+            self._observer(key, status)
         for s in self.steps:
             if s["key"] == key:
+                self._time(s, status)
                 s["status"] = status
                 if detail:
                     s["detail"] = detail
                 self._maybe_refresh()
+                self._maybe_emit(s)
                 return
         # If not present, add it
-        self.steps.append({"key": key, "label": key, "status": status, "detail": detail})
+        self.steps.append({"key": key, "label": key, "status": "pending", "detail": detail})
+        self._time(self.steps[-1], status)
+        self.steps[-1]["status"] = status
         self._maybe_refresh()
+        self._maybe_emit(self.steps[-1])
+
+    def _time(self, step, status):
+        # A repeated start (a step handed on with a new detail) keeps the first start time
+        if status == "running" and step["status"] != "running":
+            step["started"] = time.perf_counter()
+        elif status in FINISHED and step["status"] == "running" and "started" in step:
+            step["seconds"] = time.perf_counter() - step["started"]
+
+    def _maybe_emit(self, step):
+        if self._plain_writer and step["status"] in FINISHED:
+            line = f"[{step['status']}] {step['label']}"
+            if step["detail"]:
+                line += f": {step['detail'].strip()}"
+            self._plain_writer(line)
 
     def _maybe_refresh(self):
         if self._refresh_cb: